@@ -10,11 +10,29 @@ Year: 2026
 Web interface for the OpenAI GPT Chatbot with conversation management.
 """
 
-from flask import Flask, render_template, request, jsonify, session, Response, send_file
+from flask import Flask, render_template, request, jsonify, session, Response, send_file, g
+from batch import get_batch_manager, job_from_request
 from chatbot import GPTChatbot
+from client_pool import get_openai_client
+from exceptions import ChatbotError
+from metrics import get_metrics
+from profiler import get_profiler, token_valid
 from config import Config
 from personas import get_all_personas, get_persona, get_all_templates
+from pricing import get_cost_ledger
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache
+from search_index import get_archive_index
+from semantic_cache import get_semantic_cache
+from singleflight import get_single_flight
+from sse import sse_stream
+from stream_relay import get_stream_stats
+from session_backend import get_session_backend
+from session_lock import get_session_locks
+from session_store import MemorySessionStore, make_persist_hook, restore_conversation
+from tracing import NOOP_SPAN, MemoryExporter, TracedStream, end_server_span, get_tracer, start_server_span
 import os
+import math
 import uuid
 import json as json_lib
 from datetime import datetime
@@ -24,32 +42,199 @@ from io import BytesIO
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "rskworld-2026-secret-key-change-in-production")
 
-# Store chatbot instances per session
+# Store chatbot instances per session (bounded LRU with idle TTL and memory budget)
 # Author: RSK World (https://rskworld.in) - Year: 2026
-chatbots = {}
+chatbots = MemorySessionStore(
+    max_sessions=Config.SESSION_MAX_SESSIONS,
+    idle_ttl=Config.SESSION_IDLE_TTL,
+    memory_budget=Config.SESSION_MEMORY_BUDGET
+)
+
+# Save conversations to disk before their session is evicted
+if Config.SAVE_CONVERSATIONS:
+    chatbots.add_eviction_hook(make_persist_hook(Config.CONVERSATION_DIR))
+
+
+def _create_chatbot(session_id):
+    """
+    Create a chatbot for a session, restoring a persisted conversation if any
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        GPTChatbot instance
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    chatbot = GPTChatbot(
+        api_key=Config.OPENAI_API_KEY,
+        model=Config.DEFAULT_MODEL,
+        base_url=Config.OPENAI_BASE_URL
+    )
+    chatbot.set_system_prompt(Config.DEFAULT_SYSTEM_PROMPT)
+    
+    if Config.SAVE_CONVERSATIONS:
+        restore_conversation(chatbot, Config.CONVERSATION_DIR, session_id)
+    
+    return chatbot
 
 
 def get_chatbot():
     """
     Get or create chatbot instance for current session
     
+    The request first takes the session's lease (see session_lock.py), so
+    requests from the same session use the chatbot one at a time; the lease
+    is released when the request ends.
+    
     Returns:
         GPTChatbot instance
+        
+    Raises:
+        SessionBusy: If too many requests are queued for the session
     """
     # Author: RSK World (https://rskworld.in) - Year: 2026
     if 'session_id' not in session:
         session['session_id'] = str(uuid.uuid4())
     
     session_id = session['session_id']
+    locks = get_session_locks()
+    if locks is not None and 'session_lease' not in g:
+        g.session_lease = locks.acquire(session_id)
+    chatbot = chatbots.get_or_create(session_id, lambda: _create_chatbot(session_id))
+    # Pick up turns other workers added to a shared session (SESSION_BACKEND)
+    chatbot.sync_log()
+    return chatbot
+
+
+def error_response(error):
+    """
+    Build a JSON error response for a typed chatbot error
     
-    if session_id not in chatbots:
-        chatbots[session_id] = GPTChatbot(
-            api_key=Config.OPENAI_API_KEY,
-            model=Config.DEFAULT_MODEL
-        )
-        chatbots[session_id].set_system_prompt(Config.DEFAULT_SYSTEM_PROMPT)
+    Args:
+        error: ChatbotError raised by the chatbot
+        
+    Returns:
+        JSON response with the error's HTTP status and Retry-After header
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    response = jsonify({'error': str(error)})
+    response.status_code = error.http_status
+    if error.retry_after:
+        response.headers['Retry-After'] = str(math.ceil(error.retry_after))
+    return response
+
+
+def hold_session_lease(response):
+    """
+    Keep the request's session lease until a streamed response is closed
+    
+    Args:
+        response: Streaming response
+        
+    Returns:
+        The same response
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    lease = g.pop('session_lease', None)
+    if lease is not None:
+        response.call_on_close(lease.release)
+    return response
+
+
+@app.teardown_request
+def release_session_lease(error=None):
+    """
+    Release the session lease taken by get_chatbot(), if any
+    
+    Args:
+        error: Unhandled exception, if the request failed
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    lease = g.pop('session_lease', None)
+    if lease is not None:
+        lease.release()
+
+
+def trace_stream(frames):
+    """
+    Keep the request's span open, and current for the chatbot's stages, while a response streams
+    
+    Args:
+        frames: Iterator of response chunks
+        
+    Returns:
+        Iterator to use as the response body
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.get('request_span')
+    if request_span is None:
+        return frames
+    g.request_span_held = True
+    return TracedStream(frames, request_span)
+
+
+@app.before_request
+def start_request_span():
+    """
+    Start the request's root span when tracing is enabled (see tracing.py)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    route = request.url_rule.rule if request.url_rule is not None else None
+    request_span = start_server_span(request.method, route, request.path, request.headers.get('traceparent'))
+    if request_span.recording:
+        g.request_span = request_span
+
+
+@app.teardown_request
+def end_request_span(error=None):
+    """
+    End the request's root span, unless a streamed body still holds it
+    
+    Args:
+        error: Unhandled exception, if the request failed
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.pop('request_span', None)
+    if request_span is not None:
+        end_server_span(request_span, error, held=g.pop('request_span_held', False))
+
+
+@app.after_request
+def tag_request_span(response):
+    """
+    Record the response status on the request's span and return its trace id
     
-    return chatbots[session_id]
+    Args:
+        response: Outgoing response
+        
+    Returns:
+        The response with an X-Trace-Id header when the request is traced
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.get('request_span')
+    if request_span is not None:
+        request_span.set_attribute('http.response.status_code', response.status_code)
+        response.headers['X-Trace-Id'] = request_span.trace_id
+    return response
+
+
+@app.after_request
+def refresh_session_size(response):
+    """
+    Re-measure the session's chatbot after the request has mutated it
+    
+    Args:
+        response: Outgoing response
+        
+    Returns:
+        The unchanged response
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    session_id = session.get('session_id')
+    if session_id:
+        chatbots.refresh(session_id)
+    return response
 
 
 @app.route('/')
@@ -98,6 +283,8 @@ def chat():
             'timestamp': datetime.now().isoformat()
         })
         
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -115,6 +302,8 @@ def clear_history():
         chatbot = get_chatbot()
         chatbot.clear_history()
         return jsonify({'message': 'Conversation history cleared'})
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -132,6 +321,8 @@ def get_history():
         chatbot = get_chatbot()
         history = chatbot.get_conversation_history()
         return jsonify({'history': history})
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -170,16 +361,13 @@ def chat_stream():
         chatbot = get_chatbot()
         chatbot.model = model
         
-        def generate():
-            try:
-                for chunk in chatbot.get_streaming_response(user_message, temperature, max_tokens):
-                    yield f"data: {json_lib.dumps({'chunk': chunk})}\n\n"
-                yield f"data: {json_lib.dumps({'done': True})}\n\n"
-            except Exception as e:
-                yield f"data: {json_lib.dumps({'error': str(e)})}\n\n"
-        
-        return Response(generate(), mimetype='text/event-stream')
+        # Small deltas are coalesced into fewer frames; errors end the stream with an error frame
+        stream = chatbot.get_streaming_response(user_message, temperature, max_tokens)
+        frames = sse_stream(stream, span=g.get('request_span', NOOP_SPAN))
+        return hold_session_lease(Response(trace_stream(frames), mimetype='text/event-stream'))
         
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -197,6 +385,8 @@ def get_stats():
         chatbot = get_chatbot()
         stats = chatbot.get_conversation_stats()
         return jsonify(stats)
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -230,6 +420,8 @@ def export_json():
             mimetype='application/json',
             headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -261,6 +453,8 @@ def export_txt():
             as_attachment=True,
             download_name=filename
         )
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -270,29 +464,125 @@ def search_conversation():
     """
     Search conversation history
     
+    Accepts ``page``, ``page_size`` and ``scope`` ("session", the default, or
+    "archive" for every saved conversation when SEARCH_ARCHIVE_ENABLED is set).
+    
     Returns:
-        JSON response with matching messages
+        JSON response with ranked, highlighted matches
     """
     # Author: RSK World (https://rskworld.in) - Year: 2026
     try:
         data = request.get_json()
         query = data.get('query', '').strip()
+        scope = data.get('scope', 'session')
         
         if not query:
             return jsonify({'error': 'Search query is required'}), 400
+        try:
+            page = int(data.get('page') or 1)
+            page_size = int(data.get('page_size') or Config.SEARCH_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'page and page_size must be integers'}), 400
         
-        chatbot = get_chatbot()
-        results = chatbot.search_conversation(query)
+        if scope == 'archive':
+            if not Config.SEARCH_ARCHIVE_ENABLED:
+                return jsonify({'error': 'Archive search is disabled'}), 403
+            found = get_archive_index().search(query, page, page_size)
+        elif scope == 'session':
+            chatbot = get_chatbot()
+            found = chatbot.search(query, page, page_size)
+        else:
+            return jsonify({'error': 'scope must be "session" or "archive"'}), 400
         
         return jsonify({
             'query': query,
-            'results': results,
-            'count': len(results)
+            'scope': scope,
+            'results': found['results'],
+            'count': found['total'],
+            'total': found['total'],
+            'page': found['page'],
+            'page_size': found['page_size']
         })
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/batch', methods=['POST'])
+def start_batch():
+    """
+    Start a background batch of independent, stateless completions
+    
+    Accepts ``prompts`` (strings or {prompt, id, system_prompt, temperature,
+    max_tokens}) and optional ``concurrency``, ``temperature``, ``max_tokens``,
+    ``system_prompt`` and ``job_id`` (resume a previous job from its checkpoint).
+    
+    Returns:
+        202 JSON response with the job id to poll
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    data = request.get_json(silent=True) or {}
+    try:
+        job = job_from_request(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    manager = get_batch_manager()
+    existing = manager.get(job.job_id)
+    if existing is not None and not existing.finished:
+        return jsonify({'error': f"Batch job '{job.job_id}' is already running"}), 409
+    try:
+        manager.submit(job, get_openai_client(Config.OPENAI_API_KEY, Config.OPENAI_BASE_URL))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job.job_id, 'status': job.status, 'total': len(job.items)}), 202
+
+
+@app.route('/api/batch/<job_id>', methods=['GET'])
+def get_batch(job_id):
+    """
+    Poll a batch job's progress
+    
+    ``?results=1`` adds results in input order; ``offset`` and ``limit``
+    page through them.
+    
+    Returns:
+        JSON response with progress and optionally results
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    job = get_batch_manager().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Batch job not found'}), 404
+    
+    body = job.progress()
+    if request.args.get('results') in ('1', 'true'):
+        try:
+            offset = int(request.args.get('offset', 0))
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError:
+            return jsonify({'error': 'offset and limit must be integers'}), 400
+        body['offset'] = offset
+        body['results'] = job.results_page(offset, limit)
+    return jsonify(body)
+
+
+@app.route('/api/batch/<job_id>', methods=['DELETE'])
+def cancel_batch(job_id):
+    """
+    Cancel a batch job; items already in flight still finish
+    
+    Returns:
+        JSON response with the job's progress
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    job = get_batch_manager().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Batch job not found'}), 404
+    job.cancel()
+    return jsonify(job.progress())
+
+
 @app.route('/api/summary', methods=['GET'])
 def get_summary():
     """
@@ -306,6 +596,8 @@ def get_summary():
         chatbot = get_chatbot()
         summary = chatbot.get_conversation_summary()
         return jsonify({'summary': summary})
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -323,10 +615,167 @@ def reset_stats():
         chatbot = get_chatbot()
         chatbot.reset_stats()
         return jsonify({'message': 'Statistics reset successfully'})
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/session-stats', methods=['GET'])
+def get_session_stats():
+    """
+    Get session store statistics for this worker
+    
+    Returns:
+        JSON response with live sessions, evictions and bytes held, and the
+        shared session backend's write conflicts, and per-session lock waits
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    backend = get_session_backend()
+    locks = get_session_locks()
+    return jsonify({
+        **chatbots.stats(),
+        "shared": backend.stats() if backend else None,
+        "locks": locks.stats() if locks else None
+    })
+
+
+@app.route('/api/rate-limit-stats', methods=['GET'])
+def get_rate_limit_stats():
+    """
+    Get client-side rate limiter statistics
+    
+    Returns:
+        JSON response with admitted, queued and shed requests and wait times per model
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    limiter = get_rate_limiter()
+    return jsonify({"enabled": limiter is not None, "models": limiter.stats() if limiter else {}})
+
+
+@app.route('/api/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Get response cache statistics for this worker
+    
+    Returns:
+        JSON response with hits, misses and tier sizes for the exact and semantic caches,
+        and the single-flight collapse ratio
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    cache = get_response_cache()
+    semantic = get_semantic_cache()
+    flights = get_single_flight()
+    return jsonify({
+        "enabled": cache is not None,
+        **(cache.stats() if cache else {}),
+        "semantic": {"enabled": semantic is not None, **(semantic.stats() if semantic else {})},
+        "singleflight": {"enabled": flights is not None, **(flights.stats() if flights else {})}
+    })
+
+
+@app.route('/api/cost-stats', methods=['GET'])
+def get_cost_stats():
+    """
+    Get spend for this worker
+    
+    Returns:
+        JSON response with requests, tokens and cost for the worker, per API key
+        (hashed) and per model, and the configured budgets
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify({
+        **get_cost_ledger().stats(),
+        "budgets": {
+            "session_soft": Config.BUDGET_SESSION_SOFT or None,
+            "session_hard": Config.BUDGET_SESSION_HARD or None,
+            "key_soft": Config.BUDGET_KEY_SOFT or None,
+            "key_hard": Config.BUDGET_KEY_HARD or None,
+            "downgrade_model": Config.BUDGET_DOWNGRADE_MODEL or None
+        }
+    })
+
+
+@app.route('/api/stream-stats', methods=['GET'])
+def get_stream_stats_route():
+    """
+    Get streaming statistics for this worker
+    
+    Returns:
+        JSON response with streams cancelled by client disconnects and tokens saved
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify(get_stream_stats())
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics_route():
+    """
+    Export process-wide metrics in the Prometheus text format
+    
+    Totals of every worker are merged when METRICS_MULTIPROC_DIR is set.
+    
+    Returns:
+        text/plain response for a Prometheus scrape
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    metrics = get_metrics()
+    if metrics is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/traces', methods=['GET'])
+def get_traces():
+    """
+    Get recently finished spans of this worker as an OTLP/JSON trace export
+    
+    Query parameters: trace_id (only that trace) and limit (most recent spans, default 100).
+    
+    Returns:
+        JSON response in the OTLP ExportTraceServiceRequest format
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tracer = get_tracer()
+    if tracer is None or not isinstance(tracer.exporter, MemoryExporter):
+        return jsonify({'error': 'Tracing is disabled or not kept in memory (TRACING_EXPORTER=memory)'}), 404
+    limit = request.args.get('limit', default=100, type=int)
+    spans = tracer.exporter.spans(request.args.get('trace_id'), max(1, limit))
+    return jsonify(tracer.payload(spans))
+
+
+@app.route('/api/debug/profile', methods=['GET'])
+def get_profile():
+    """
+    Sample this worker's stacks for a while and return them as folded stacks
+    
+    Query parameters: seconds (default 10, capped at PROFILER_MAX_SECONDS),
+    interval (seconds between samples) and idle (1 keeps waiting threads).
+    The output feeds flamegraph.pl or speedscope directly.
+    
+    Returns:
+        text/plain response with one "frame;frame;frame count" line per stack
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    if not token_valid(request.headers.get('X-Profiler-Token')):
+        return jsonify({'error': 'Invalid profiler token'}), 403
+    try:
+        result = profiler.profile(
+            request.args.get('seconds', default=10.0, type=float),
+            request.args.get('interval', type=float),
+            request.args.get('idle', '').lower() in ('1', 'true')
+        )
+    except ChatbotError as e:
+        return error_response(e)
+    response = Response(result['folded'], content_type='text/plain; charset=utf-8')
+    response.headers['X-Profile-Samples'] = str(result['samples'])
+    response.headers['X-Profile-Seconds'] = str(result['seconds'])
+    return response
+
+
 @app.route('/api/personas', methods=['GET'])
 def get_personas():
     """
@@ -355,10 +804,14 @@ def set_persona(persona_key):
         persona = get_persona(persona_key)
         chatbot = get_chatbot()
         chatbot.set_system_prompt(persona['system_prompt'])
+        # Unknown keys fall back to the default persona; keeps metric labels bounded
+        chatbot.persona = persona_key if persona_key in get_all_personas() else "default"
         return jsonify({
             'message': f"Persona '{persona['name']}' set successfully",
             'persona': persona
         })
+    except ChatbotError as e:
+        return error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -381,5 +834,6 @@ if __name__ == '__main__':
         print("Warning: OPENAI_API_KEY not set. Please set it in .env file.")
         print("For more information, visit: https://rskworld.in")
     
+    print("Development server; run `chatbot-serve` (serve.py) in production.")
     app.run(debug=True, host='0.0.0.0', port=5000)
 
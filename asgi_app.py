@@ -0,0 +1,853 @@
+"""
+ASGI Web Application for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Async variant of app.py served by an ASGI server. Routes, request formats
+and responses are identical to the Flask app, but every handler runs on the
+event loop with AsyncGPTChatbot, so a single process can hold thousands of
+concurrent streams without a thread per request.
+
+Requires the optional async dependencies:
+    pip install quart uvicorn
+
+Run with:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+from quart import Quart, render_template, request, jsonify, session, Response, g
+from async_chatbot import AsyncGPTChatbot
+from batch import get_batch_manager, job_from_request
+from client_pool import close_all_async_clients, get_async_openai_client
+from config import Config
+from exceptions import ChatbotError
+from metrics import get_metrics
+from profiler import get_profiler, token_valid
+from personas import get_all_personas, get_persona, get_all_templates
+from pricing import get_cost_ledger
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache
+from search_index import get_archive_index
+from semantic_cache import get_semantic_cache
+from singleflight import get_single_flight
+from sse import sse_stream_async
+from stream_relay import get_stream_stats
+from session_backend import get_session_backend
+from session_lock import LeasedStream, get_session_locks
+from session_store import MemorySessionStore, make_persist_hook, restore_conversation
+from tracing import NOOP_SPAN, MemoryExporter, TracedStream, end_server_span, get_tracer, start_server_span
+import os
+import asyncio
+import math
+import uuid
+import json as json_lib
+from datetime import datetime
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+app = Quart(__name__)
+app.secret_key = os.getenv("SECRET_KEY", "rskworld-2026-secret-key-change-in-production")
+
+# Store chatbot instances per session (bounded LRU with idle TTL and memory budget)
+# Author: RSK World (https://rskworld.in) - Year: 2026
+chatbots = MemorySessionStore(
+    max_sessions=Config.SESSION_MAX_SESSIONS,
+    idle_ttl=Config.SESSION_IDLE_TTL,
+    memory_budget=Config.SESSION_MEMORY_BUDGET
+)
+
+# Save conversations to disk before their session is evicted
+if Config.SAVE_CONVERSATIONS:
+    chatbots.add_eviction_hook(make_persist_hook(Config.CONVERSATION_DIR))
+
+
+def _create_chatbot(session_id):
+    """
+    Create an async chatbot for a session, restoring a persisted conversation if any
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        AsyncGPTChatbot instance
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    chatbot = AsyncGPTChatbot(
+        api_key=Config.OPENAI_API_KEY,
+        model=Config.DEFAULT_MODEL,
+        base_url=Config.OPENAI_BASE_URL
+    )
+    chatbot.set_system_prompt(Config.DEFAULT_SYSTEM_PROMPT)
+
+    if Config.SAVE_CONVERSATIONS:
+        restore_conversation(chatbot, Config.CONVERSATION_DIR, session_id)
+
+    return chatbot
+
+
+async def get_chatbot():
+    """
+    Get or create chatbot instance for current session
+
+    The request first waits (without blocking the event loop) for the
+    session's lease, so requests from the same session use the chatbot one
+    at a time; the lease is released when the request ends.
+
+    Returns:
+        AsyncGPTChatbot instance
+
+    Raises:
+        SessionBusy: If too many requests are queued for the session
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if 'session_id' not in session:
+        session['session_id'] = str(uuid.uuid4())
+
+    session_id = session['session_id']
+    locks = get_session_locks()
+    if locks is not None and 'session_lease' not in g:
+        g.session_lease = await locks.acquire_async(session_id)
+
+    def restore():
+        chatbot = chatbots.get_or_create(session_id, lambda: _create_chatbot(session_id))
+        # Pick up turns other workers added to a shared session (SESSION_BACKEND)
+        chatbot.sync_log()
+        return chatbot
+
+    # Restoring and syncing read the conversation log (file, SQLite or Redis), so off the event loop
+    return await asyncio.to_thread(restore)
+
+
+def error_response(error):
+    """
+    Build a JSON error response for a typed chatbot error
+
+    Args:
+        error: ChatbotError raised by the chatbot
+
+    Returns:
+        JSON response with the error's HTTP status and Retry-After header
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    response = jsonify({'error': str(error)})
+    response.status_code = error.http_status
+    if error.retry_after:
+        response.headers['Retry-After'] = str(math.ceil(error.retry_after))
+    return response
+
+
+def hold_session_lease(stream):
+    """
+    Keep the request's session lease until a streamed body is closed
+
+    Args:
+        stream: Async iterator of response chunks
+
+    Returns:
+        Iterator to use as the response body
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    lease = g.pop('session_lease', None)
+    return stream if lease is None else LeasedStream(stream, lease)
+
+
+@app.teardown_request
+async def release_session_lease(error=None):
+    """
+    Release the session lease taken by get_chatbot(), if any
+
+    Args:
+        error: Unhandled exception, if the request failed
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    lease = g.pop('session_lease', None)
+    if lease is not None:
+        lease.release()
+
+
+def trace_stream(stream):
+    """
+    Keep the request's span open, and current for the chatbot's stages, while a response streams
+
+    Args:
+        stream: Async iterator of response chunks
+
+    Returns:
+        Iterator to use as the response body
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.get('request_span')
+    if request_span is None:
+        return stream
+    g.request_span_held = True
+    return TracedStream(stream, request_span)
+
+
+@app.before_request
+async def start_request_span():
+    """
+    Start the request's root span when tracing is enabled (see tracing.py)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    route = request.url_rule.rule if request.url_rule is not None else None
+    request_span = start_server_span(request.method, route, request.path, request.headers.get('traceparent'))
+    if request_span.recording:
+        g.request_span = request_span
+
+
+@app.teardown_request
+async def end_request_span(error=None):
+    """
+    End the request's root span, unless a streamed body still holds it
+
+    Args:
+        error: Unhandled exception, if the request failed
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.pop('request_span', None)
+    if request_span is not None:
+        end_server_span(request_span, error, held=g.pop('request_span_held', False))
+
+
+@app.after_request
+async def tag_request_span(response):
+    """
+    Record the response status on the request's span and return its trace id
+
+    Args:
+        response: Outgoing response
+
+    Returns:
+        The response with an X-Trace-Id header when the request is traced
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    request_span = g.get('request_span')
+    if request_span is not None:
+        request_span.set_attribute('http.response.status_code', response.status_code)
+        response.headers['X-Trace-Id'] = request_span.trace_id
+    return response
+
+
+@app.after_request
+async def refresh_session_size(response):
+    """
+    Re-measure the session's chatbot after the request has mutated it
+
+    Args:
+        response: Outgoing response
+
+    Returns:
+        The unchanged response
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    session_id = session.get('session_id')
+    if session_id:
+        chatbots.refresh(session_id)
+    return response
+
+
+@app.after_serving
+async def close_clients():
+    """Close pooled async HTTP clients on shutdown"""
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    await close_all_async_clients()
+
+
+@app.route('/')
+async def index():
+    """
+    Render main chat interface
+
+    Returns:
+        Rendered HTML template
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    app_info = Config.get_info()
+    return await render_template('index.html', app_info=app_info)
+
+
+@app.route('/api/chat', methods=['POST'])
+async def chat():
+    """
+    Handle chat API requests
+
+    Returns:
+        JSON response with assistant message
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        data = await request.get_json()
+        user_message = data.get('message', '').strip()
+        model = data.get('model', Config.DEFAULT_MODEL)
+        temperature = float(data.get('temperature', Config.DEFAULT_TEMPERATURE))
+        max_tokens = int(data.get('max_tokens', Config.DEFAULT_MAX_TOKENS))
+
+        if not user_message:
+            return jsonify({'error': 'Message is required'}), 400
+
+        chatbot = await get_chatbot()
+        chatbot.model = model
+
+        response = await chatbot.get_response(
+            user_message,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+        return jsonify({
+            'response': response,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/clear', methods=['POST'])
+async def clear_history():
+    """
+    Clear conversation history
+
+    Returns:
+        JSON response confirming history cleared
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        await asyncio.to_thread(chatbot.clear_history)
+        return jsonify({'message': 'Conversation history cleared'})
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/history', methods=['GET'])
+async def get_history():
+    """
+    Get conversation history
+
+    Returns:
+        JSON response with conversation history
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        history = await asyncio.to_thread(chatbot.get_conversation_history)
+        return jsonify({'history': history})
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/info', methods=['GET'])
+async def get_info():
+    """
+    Get application information
+
+    Returns:
+        JSON response with app information
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify(Config.get_info())
+
+
+@app.route('/api/chat/stream', methods=['POST'])
+async def chat_stream():
+    """
+    Handle streaming chat API requests
+
+    Returns:
+        Server-Sent Events stream
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        data = await request.get_json()
+        user_message = data.get('message', '').strip()
+        model = data.get('model', Config.DEFAULT_MODEL)
+        temperature = float(data.get('temperature', Config.DEFAULT_TEMPERATURE))
+        max_tokens = int(data.get('max_tokens', Config.DEFAULT_MAX_TOKENS))
+
+        if not user_message:
+            return jsonify({'error': 'Message is required'}), 400
+
+        chatbot = await get_chatbot()
+        chatbot.model = model
+
+        # Held deltas are flushed when their window expires, even while upstream is quiet
+        stream = chatbot.get_streaming_response(user_message, temperature, max_tokens)
+        frames = sse_stream_async(stream, span=g.get('request_span', NOOP_SPAN))
+        response = Response(hold_session_lease(trace_stream(frames)), mimetype='text/event-stream')
+        response.timeout = None  # Streams may outlive the default response timeout
+        return response
+
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/stats', methods=['GET'])
+async def get_stats():
+    """
+    Get conversation statistics and token usage
+
+    Returns:
+        JSON response with statistics
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        stats = chatbot.get_conversation_stats()
+        return jsonify(stats)
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/export/json', methods=['GET'])
+async def export_json():
+    """
+    Export conversation as JSON
+
+    Returns:
+        JSON file download
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        history = await asyncio.to_thread(chatbot.get_conversation_history)
+        stats = chatbot.get_conversation_stats()
+
+        export_data = {
+            "conversation": history,
+            "statistics": stats,
+            "export_date": datetime.now().isoformat(),
+            "author": "RSK World (https://rskworld.in)"
+        }
+
+        json_str = json_lib.dumps(export_data, indent=2, ensure_ascii=False)
+        filename = f"conversation_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+        return Response(
+            json_str,
+            mimetype='application/json',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/export/txt', methods=['GET'])
+async def export_txt():
+    """
+    Export conversation as plain text
+
+    Returns:
+        TXT file download
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        filename = f"conversation_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        content = await asyncio.to_thread(chatbot._generate_txt_content)
+
+        return Response(
+            content.encode('utf-8'),
+            mimetype='text/plain',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/search', methods=['POST'])
+async def search_conversation():
+    """
+    Search conversation history
+
+    Accepts ``page``, ``page_size`` and ``scope`` ("session", the default, or
+    "archive" for every saved conversation when SEARCH_ARCHIVE_ENABLED is set).
+
+    Returns:
+        JSON response with ranked, highlighted matches
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        data = await request.get_json()
+        query = data.get('query', '').strip()
+        scope = data.get('scope', 'session')
+
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+        try:
+            page = int(data.get('page') or 1)
+            page_size = int(data.get('page_size') or Config.SEARCH_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'page and page_size must be integers'}), 400
+
+        if scope == 'archive':
+            if not Config.SEARCH_ARCHIVE_ENABLED:
+                return jsonify({'error': 'Archive search is disabled'}), 403
+            found = await asyncio.to_thread(get_archive_index().search, query, page, page_size)
+        elif scope == 'session':
+            chatbot = await get_chatbot()
+            found = await asyncio.to_thread(chatbot.search, query, page, page_size)
+        else:
+            return jsonify({'error': 'scope must be "session" or "archive"'}), 400
+
+        return jsonify({
+            'query': query,
+            'scope': scope,
+            'results': found['results'],
+            'count': found['total'],
+            'total': found['total'],
+            'page': found['page'],
+            'page_size': found['page_size']
+        })
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/batch', methods=['POST'])
+async def start_batch():
+    """
+    Start a batch of independent, stateless completions as a task on this event loop
+
+    Accepts ``prompts`` (strings or {prompt, id, system_prompt, temperature,
+    max_tokens}) and optional ``concurrency``, ``temperature``, ``max_tokens``,
+    ``system_prompt`` and ``job_id`` (resume a previous job from its checkpoint).
+
+    Returns:
+        202 JSON response with the job id to poll
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    data = await request.get_json(silent=True) or {}
+    try:
+        job = job_from_request(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    manager = get_batch_manager()
+    existing = manager.get(job.job_id)
+    if existing is not None and not existing.finished:
+        return jsonify({'error': f"Batch job '{job.job_id}' is already running"}), 409
+    try:
+        manager.submit_async(job, get_async_openai_client(Config.OPENAI_API_KEY, Config.OPENAI_BASE_URL))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job.job_id, 'status': job.status, 'total': len(job.items)}), 202
+
+
+@app.route('/api/batch/<job_id>', methods=['GET'])
+async def get_batch(job_id):
+    """
+    Poll a batch job's progress
+
+    ``?results=1`` adds results in input order; ``offset`` and ``limit``
+    page through them.
+
+    Returns:
+        JSON response with progress and optionally results
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    job = get_batch_manager().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Batch job not found'}), 404
+
+    body = job.progress()
+    if request.args.get('results') in ('1', 'true'):
+        try:
+            offset = int(request.args.get('offset', 0))
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError:
+            return jsonify({'error': 'offset and limit must be integers'}), 400
+        body['offset'] = offset
+        body['results'] = job.results_page(offset, limit)
+    return jsonify(body)
+
+
+@app.route('/api/batch/<job_id>', methods=['DELETE'])
+async def cancel_batch(job_id):
+    """
+    Cancel a batch job; items already in flight still finish
+
+    Returns:
+        JSON response with the job's progress
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    job = get_batch_manager().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Batch job not found'}), 404
+    job.cancel()
+    return jsonify(job.progress())
+
+
+@app.route('/api/summary', methods=['GET'])
+async def get_summary():
+    """
+    Get conversation summary
+
+    Returns:
+        JSON response with conversation summary
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        summary = await asyncio.to_thread(chatbot.get_conversation_summary)
+        return jsonify({'summary': summary})
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/reset-stats', methods=['POST'])
+async def reset_stats():
+    """
+    Reset conversation statistics
+
+    Returns:
+        JSON response confirming reset
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        chatbot = await get_chatbot()
+        chatbot.reset_stats()
+        return jsonify({'message': 'Statistics reset successfully'})
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/session-stats', methods=['GET'])
+async def get_session_stats():
+    """
+    Get session store statistics for this worker
+
+    Returns:
+        JSON response with live sessions, evictions and bytes held, and the
+        shared session backend's write conflicts, and per-session lock waits
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    backend = get_session_backend()
+    locks = get_session_locks()
+    return jsonify({
+        **chatbots.stats(),
+        "shared": backend.stats() if backend else None,
+        "locks": locks.stats() if locks else None
+    })
+
+
+@app.route('/api/rate-limit-stats', methods=['GET'])
+async def get_rate_limit_stats():
+    """
+    Get client-side rate limiter statistics
+
+    Returns:
+        JSON response with admitted, queued and shed requests and wait times per model
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    limiter = get_rate_limiter()
+    return jsonify({"enabled": limiter is not None, "models": limiter.stats() if limiter else {}})
+
+
+@app.route('/api/cache-stats', methods=['GET'])
+async def get_cache_stats():
+    """
+    Get response cache statistics for this worker
+
+    Returns:
+        JSON response with hits, misses and tier sizes for the exact and semantic caches,
+        and the single-flight collapse ratio
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    cache = get_response_cache()
+    semantic = get_semantic_cache()
+    flights = get_single_flight()
+    return jsonify({
+        "enabled": cache is not None,
+        **(cache.stats() if cache else {}),
+        "semantic": {"enabled": semantic is not None, **(semantic.stats() if semantic else {})},
+        "singleflight": {"enabled": flights is not None, **(flights.stats() if flights else {})}
+    })
+
+
+@app.route('/api/cost-stats', methods=['GET'])
+async def get_cost_stats():
+    """
+    Get spend for this worker
+
+    Returns:
+        JSON response with requests, tokens and cost for the worker, per API key
+        (hashed) and per model, and the configured budgets
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify({
+        **get_cost_ledger().stats(),
+        "budgets": {
+            "session_soft": Config.BUDGET_SESSION_SOFT or None,
+            "session_hard": Config.BUDGET_SESSION_HARD or None,
+            "key_soft": Config.BUDGET_KEY_SOFT or None,
+            "key_hard": Config.BUDGET_KEY_HARD or None,
+            "downgrade_model": Config.BUDGET_DOWNGRADE_MODEL or None
+        }
+    })
+
+
+@app.route('/api/stream-stats', methods=['GET'])
+async def get_stream_stats_route():
+    """
+    Get streaming statistics for this worker
+
+    Returns:
+        JSON response with streams cancelled by client disconnects and tokens saved
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify(get_stream_stats())
+
+
+@app.route('/metrics', methods=['GET'])
+async def get_metrics_route():
+    """
+    Export process-wide metrics in the Prometheus text format
+
+    Totals of every worker are merged when METRICS_MULTIPROC_DIR is set.
+
+    Returns:
+        text/plain response for a Prometheus scrape
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    metrics = get_metrics()
+    if metrics is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(await asyncio.to_thread(metrics.render), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/traces', methods=['GET'])
+async def get_traces():
+    """
+    Get recently finished spans of this worker as an OTLP/JSON trace export
+
+    Query parameters: trace_id (only that trace) and limit (most recent spans, default 100).
+
+    Returns:
+        JSON response in the OTLP ExportTraceServiceRequest format
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tracer = get_tracer()
+    if tracer is None or not isinstance(tracer.exporter, MemoryExporter):
+        return jsonify({'error': 'Tracing is disabled or not kept in memory (TRACING_EXPORTER=memory)'}), 404
+    limit = request.args.get('limit', default=100, type=int)
+    spans = tracer.exporter.spans(request.args.get('trace_id'), max(1, limit))
+    return jsonify(tracer.payload(spans))
+
+
+@app.route('/api/debug/profile', methods=['GET'])
+async def get_profile():
+    """
+    Sample this worker's stacks for a while and return them as folded stacks
+
+    Sampling runs on a thread, so the event loop keeps serving (and is
+    sampled) meanwhile. Query parameters: seconds (default 10, capped at
+    PROFILER_MAX_SECONDS), interval (seconds between samples) and idle
+    (1 keeps waiting threads).
+
+    Returns:
+        text/plain response with one "frame;frame;frame count" line per stack
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    if not token_valid(request.headers.get('X-Profiler-Token')):
+        return jsonify({'error': 'Invalid profiler token'}), 403
+    try:
+        result = await asyncio.to_thread(
+            profiler.profile,
+            request.args.get('seconds', default=10.0, type=float),
+            request.args.get('interval', type=float),
+            request.args.get('idle', '').lower() in ('1', 'true')
+        )
+    except ChatbotError as e:
+        return error_response(e)
+    response = Response(result['folded'], content_type='text/plain; charset=utf-8')
+    response.headers['X-Profile-Samples'] = str(result['samples'])
+    response.headers['X-Profile-Seconds'] = str(result['seconds'])
+    return response
+
+
+@app.route('/api/personas', methods=['GET'])
+async def get_personas():
+    """
+    Get all available personas
+
+    Returns:
+        JSON response with personas
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify(get_all_personas())
+
+
+@app.route('/api/personas/<persona_key>', methods=['POST'])
+async def set_persona(persona_key):
+    """
+    Set persona for current session
+
+    Args:
+        persona_key: Key of the persona to set
+
+    Returns:
+        JSON response confirming persona set
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    try:
+        persona = get_persona(persona_key)
+        chatbot = await get_chatbot()
+        await asyncio.to_thread(chatbot.set_system_prompt, persona['system_prompt'])
+        # Unknown keys fall back to the default persona; keeps metric labels bounded
+        chatbot.persona = persona_key if persona_key in get_all_personas() else "default"
+        return jsonify({
+            'message': f"Persona '{persona['name']}' set successfully",
+            'persona': persona
+        })
+    except ChatbotError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/templates', methods=['GET'])
+async def get_templates():
+    """
+    Get all available conversation templates
+
+    Returns:
+        JSON response with templates
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return jsonify(get_all_templates())
+
+
+if __name__ == '__main__':
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not Config.validate():
+        print("Warning: OPENAI_API_KEY not set. Please set it in .env file.")
+        print("For more information, visit: https://rskworld.in")
+
+    import uvicorn
+    uvicorn.run("asgi_app:app", host='0.0.0.0', port=5000)
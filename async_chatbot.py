@@ -0,0 +1,321 @@
+"""
+Async OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Native asyncio version of GPTChatbot built on the async OpenAI client.
+Waiting on the upstream API no longer holds a thread, so one process can
+serve thousands of concurrent conversations and streams.
+"""
+
+import time
+import asyncio
+from typing import AsyncGenerator, Callable, Dict, List, Optional
+
+from chatbot import GPTChatbot
+from client_pool import get_async_openai_client
+from config import Config
+from exceptions import ChatbotError
+from prompt_builder import post_chat_completion_async
+from response_cache import replay_chunks
+from retry_policy import is_upstream_error, to_upstream_error
+from stream_relay import AsyncChunkRelay, StreamMeter
+from tracing import KIND_CLIENT, span, use_span
+
+
+class AsyncGPTChatbot(GPTChatbot):
+    """
+    Async OpenAI GPT Chatbot Class
+
+    Same API surface as GPTChatbot: ``get_response`` is a coroutine and
+    ``get_streaming_response`` is an async generator. History, statistics,
+    search and export methods are inherited unchanged.
+
+    Author: RSK World (https://rskworld.in)
+    Year: 2026
+    """
+
+    def _create_client(self):
+        """
+        Get the shared async API client for this chatbot's credentials
+
+        Returns:
+            AsyncOpenAI client
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return get_async_openai_client(self.api_key, self.base_url)
+
+    async def _off_loop(self, function: Callable, *args):
+        """
+        Run a step that writes the conversation log or rate-limit file in a worker thread
+
+        Log writes are blocking file, SQLite or Redis I/O, and recording usage
+        reconciles a file rate-limit backend under flock; with neither the
+        step runs inline.
+
+        Args:
+            function: Chatbot method
+            *args: Its arguments
+
+        Returns:
+            What the method returns
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        limiter = self.rate_limiter
+        if self.log is None and not (limiter and limiter.blocking):
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    async def get_response(self, user_message: str, temperature: float = 0.7, max_tokens: int = 500,
+                           stream: bool = False, functions: Optional[List] = None) -> str:
+        """
+        Get response from GPT model without blocking the event loop
+
+        Args:
+            user_message: User's message
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens in response
+            stream: Whether to stream the response
+            functions: Optional list of function definitions for function calling
+
+        Returns:
+            Assistant's response
+
+        Raises:
+            UpstreamError: If the API call fails and will not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Each task has its own current span, so spans stay open across awaits
+        with span("chat.get_response", {"gen_ai.request.model": self.model, "chat.persona": self.persona,
+                                        "chat.stream": stream}) as request_span:
+            with span("chat.prepare"):
+                api_params = await self._off_loop(self._prepare_request, user_message, temperature,
+                                                  max_tokens, functions)
+
+            with span("chat.cache_lookup") as lookup:
+                cached = self._get_cached_response()
+                lookup.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                return await self._off_loop(self._record_cached_response, cached)
+
+            try:
+                if stream:
+                    return await self._get_streaming_response(api_params)
+
+                # Retries back off with asyncio.sleep, so waiting never blocks the loop
+                response, shared = await self._create_shared_completion(api_params)
+            except ChatbotError as e:
+                await self._off_loop(self._abandon_request, e)
+                raise
+
+            request_span.set_attribute("chat.shared", shared)
+            with span("chat.record"):
+                if shared:
+                    return await self._off_loop(self._record_shared_response, response)
+                return await self._off_loop(self._record_response, response)
+
+    async def _create_completion(self, api_params: dict):
+        """
+        Call the chat completions endpoint through the retry policy
+
+        Args:
+            api_params: API parameters dictionary
+
+        Returns:
+            Chat completion, or an async stream of chunks when api_params has stream=True
+
+        Raises:
+            UpstreamError: If the call fails and will not be retried
+            RateLimitExceeded: If the rate limiter sheds the call
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        async def attempt():
+            # Queued requests wait with asyncio.sleep instead of holding a thread
+            if self.rate_limiter:
+                with span("chat.rate_limit"):
+                    await self.rate_limiter.acquire_async(self._request_model, self._estimated_tokens)
+            self._attempt_started = time.perf_counter()
+            with span("chat.upstream", self._upstream_attributes(api_params), kind=KIND_CLIENT):
+                if self._prompt_json is not None:
+                    return await post_chat_completion_async(self.client, api_params, self._prompt_json)
+                return await self.client.chat.completions.create(**api_params)
+
+        return await self.retry_policy.call_async(attempt, on_retry=self._on_retry)
+
+    async def _create_shared_completion(self, api_params: dict):
+        """
+        Call the chat completions endpoint, sharing the call with identical requests in flight
+
+        Args:
+            api_params: API parameters dictionary
+
+        Returns:
+            (chat completion, shared) where shared is True if another session's call was reused
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self._flight_key is None:
+            return await self._create_completion(api_params), False
+        return await self.single_flight.do_async(self._flight_key, lambda: self._create_completion(api_params))
+
+    async def _get_streaming_response(self, api_params: dict) -> str:
+        """
+        Get streaming response from GPT model and collect it
+
+        Args:
+            api_params: API parameters dictionary
+
+        Returns:
+            Complete assistant response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._enable_stream(api_params)
+        parts = []
+
+        meter = StreamMeter(self._request_model)
+        stream = await self._create_completion(api_params)
+        try:
+            with span("chat.stream_read") as read:
+                async for chunk in stream:
+                    content = meter.observe(chunk)
+                    if content:
+                        parts.append(content)
+                read.set_attribute("chat.chunks", len(parts))
+        except Exception as e:
+            if is_upstream_error(e):
+                raise to_upstream_error(e) from e
+            raise
+
+        full_response = "".join(parts)
+        with span("chat.record"):
+            self._observe_stream(meter)
+            await self._off_loop(self.add_message, "assistant", full_response)
+            self._store_cached_response(full_response)
+        self.conversation_stats["total_requests"] += 1
+        self.conversation_stats["total_messages"] += 2  # user + assistant
+        return full_response
+
+    async def get_streaming_response(self, user_message: str, temperature: float = 0.7,
+                                     max_tokens: int = 500,
+                                     callback: Optional[Callable] = None) -> AsyncGenerator[str, None]:
+        """
+        Get streaming response as an async generator
+
+        Args:
+            user_message: User's message
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            callback: Optional callback function for each chunk
+
+        Yields:
+            Response chunks
+
+        Raises:
+            UpstreamError: If the API call fails and will not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Open across yields, so stages name it as parent instead of it being made current
+        with span("chat.stream", {"gen_ai.request.model": self.model, "chat.persona": self.persona},
+                  activate=False) as stream_span:
+            with span("chat.prepare", parent=stream_span):
+                api_params = await self._off_loop(self._prepare_request, user_message, temperature, max_tokens)
+                self._enable_stream(api_params)
+
+            with span("chat.cache_lookup", parent=stream_span) as lookup:
+                cached = self._get_cached_response()
+                lookup.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                for content in replay_chunks(cached):
+                    if callback:
+                        callback(content)
+                    yield content
+                await self._off_loop(self._record_cached_response, cached)
+                return
+
+            parts = []
+            upstream = relay = None
+            finished = shared = False
+            meter = StreamMeter(self._request_model)
+            try:
+                with use_span(stream_span):
+                    if self._flight_key is not None:
+                        # Identical streams in flight share one upstream read by a reader task
+                        relay, shared = await self.single_flight.stream_async(
+                            self._flight_key, lambda: self._create_completion(api_params)
+                        )
+                        stream = relay
+                    else:
+                        stream = upstream = await self._create_completion(api_params)
+                        if Config.STREAM_BUFFER_SIZE:
+                            # Upstream is read by its own task, at most STREAM_BUFFER_SIZE chunks ahead
+                            stream = relay = AsyncChunkRelay(upstream, Config.STREAM_BUFFER_SIZE)
+
+                async for chunk in stream:
+                    content = meter.observe(chunk)
+                    if content:
+                        parts.append(content)
+                        if callback:
+                            callback(content)
+                        yield content
+                finished = True
+            except (GeneratorExit, asyncio.CancelledError):
+                # The consumer stopped reading (client disconnected)
+                stream_span.set_attribute("chat.cancelled", True)
+                self._record_truncated_response(parts, max_tokens, meter, billed=not shared)
+                raise
+            except ChatbotError as e:
+                await self._off_loop(self._abandon_request, e)
+                raise
+            except Exception as e:
+                if not is_upstream_error(e):
+                    raise
+                error = to_upstream_error(e)
+                await self._off_loop(self._abandon_request, error)
+                raise error from e
+            finally:
+                if not finished:
+                    # Stop generation now instead of draining tokens nobody will read
+                    if relay is not None:
+                        await relay.cancel()
+                    elif upstream is not None:
+                        await upstream.close()
+                if stream_span.recording:
+                    stream_span.set_attributes(self._stream_attributes(meter, len(parts), shared))
+
+            with span("chat.record", parent=stream_span):
+                full_response = "".join(parts)
+                await self._off_loop(self.add_message, "assistant", full_response)
+                self.conversation_stats["total_messages"] += 2  # user + assistant
+                self._observe_stream(meter, billed=not shared)
+                if shared:
+                    self.conversation_stats["coalesced_requests"] += 1
+                    if self.metrics:
+                        self.metrics.requests.inc(self._request_model, self.persona, "coalesced")
+                    return
+                self._store_cached_response(full_response)
+                self.conversation_stats["total_requests"] += 1
+
+    async def batch(self, prompts: List, concurrency: Optional[int] = None, temperature: float = 0.7,
+                    max_tokens: int = 500, checkpoint: Optional[str] = None) -> List[Dict]:
+        """
+        Complete many independent prompts concurrently on the event loop
+
+        Args:
+            prompts: Prompts (strings, or dicts with prompt and optional id,
+                system_prompt, temperature, max_tokens)
+            concurrency: Requests in flight at once (defaults to Config.BATCH_CONCURRENCY)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per reply
+            checkpoint: Optional JSONL file to resume from and record results in
+
+        Returns:
+            One result per prompt in input order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        job = self._make_batch_job(prompts, concurrency, temperature, max_tokens, checkpoint)
+        results = await job.run_async(self.client)
+        self._record_batch(job)
+        return results
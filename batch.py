@@ -0,0 +1,715 @@
+"""
+Batch Completions for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Runs many independent, stateless prompts concurrently with bounded
+parallelism. Each prompt is a single system + user exchange: no session
+history is read or written. Every call goes through the shared rate limiter
+(waiting instead of failing when it would be shed), the retry policy and
+the response cache, and is checked against the spending budgets before it
+is sent and charged to the cost ledger when it returns. Results come back
+in input order with per-item errors, and completed items are appended to
+an optional JSONL checkpoint so an interrupted batch resumes where it
+stopped.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from config import Config
+from context_window import REPLY_TOKEN_OVERHEAD, count_message_tokens, count_tokens
+from exceptions import BudgetExceeded, RateLimitExceeded
+from metrics import get_metrics
+from pricing import budgets_enabled, check_budget, compute_cost, get_cost_ledger, key_id
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache, make_cache_key
+from retry_policy import RetryPolicy
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# Seconds an item waits for in-flight items to settle before rechecking the budget
+BUDGET_RECHECK_INTERVAL = 0.05
+
+BatchItem = Union[str, Dict[str, Any]]
+
+
+def checkpoint_path(job_id: str) -> str:
+    """
+    Get the checkpoint file of a batch job
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        Path under Config.BATCH_CHECKPOINT_DIR
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return os.path.join(Config.BATCH_CHECKPOINT_DIR, f"{job_id}.jsonl")
+
+
+class BatchJob:
+    """
+    A list of prompts with its progress and results
+
+    Items are strings or dicts with ``prompt`` and optional ``id``,
+    ``system_prompt``, ``temperature`` and ``max_tokens``.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, prompts: Sequence[BatchItem], model: Optional[str] = None,
+                 system_prompt: Optional[str] = None, temperature: float = 0.7,
+                 max_tokens: int = 500, concurrency: Optional[int] = None,
+                 checkpoint: Optional[str] = None, job_id: Optional[str] = None):
+        """
+        Create a batch job
+
+        Args:
+            prompts: Prompts to complete
+            model: Model for every item (defaults to Config.DEFAULT_MODEL)
+            system_prompt: Default system prompt (defaults to Config.DEFAULT_SYSTEM_PROMPT)
+            temperature: Default sampling temperature
+            max_tokens: Default maximum tokens per reply
+            concurrency: Requests in flight at once (defaults to Config.BATCH_CONCURRENCY)
+            checkpoint: Optional JSONL file to resume from and append results to
+            job_id: Identifier (generated when omitted)
+
+        Raises:
+            ValueError: If an item has no prompt
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.job_id = job_id or uuid.uuid4().hex
+        self.model = model or Config.DEFAULT_MODEL
+        self.concurrency = max(1, min(concurrency or Config.BATCH_CONCURRENCY, Config.BATCH_MAX_CONCURRENCY))
+        self.checkpoint = checkpoint
+        self.items = [self._normalize(item, system_prompt, temperature, max_tokens) for item in prompts]
+        self.results: List[Optional[Dict]] = [None] * len(self.items)
+        self.status = "pending"
+        self.completed = 0
+        self.failed = 0
+        self.cached = 0
+        self.resumed = 0
+        self.usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self.spent = 0.0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        # Shared process-wide like a chatbot's; GPTChatbot.batch passes its own
+        self.retry_policy = RetryPolicy()
+        self.rate_limiter = get_rate_limiter()
+        self.response_cache = get_response_cache()
+        # Each item is checked against the budgets and charged to this key as it completes
+        self.key_id = key_id(Config.OPENAI_API_KEY)
+        self.persona = "default"
+        self.session_spent = 0.0
+        self.cost_ledger = get_cost_ledger()
+        self.metrics = get_metrics()
+        self._reserved = 0.0
+        self._holds = 0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._checkpoint_file = None
+
+    @staticmethod
+    def _normalize(item: BatchItem, system_prompt: Optional[str], temperature: float,
+                   max_tokens: int) -> Dict:
+        """Fill an item's defaults and validate its settings (raises ValueError)"""
+        if isinstance(item, str):
+            item = {"prompt": item}
+        if not isinstance(item, dict) or not isinstance(item.get("prompt"), str) or not item["prompt"]:
+            raise ValueError("Every batch item needs a non-empty 'prompt'")
+        try:
+            temperature = float(item.get("temperature", temperature))
+        except (TypeError, ValueError):
+            raise ValueError("Batch item 'temperature' must be a number")
+        if not 0.0 <= temperature <= 2.0:
+            raise ValueError("Batch item 'temperature' must be between 0 and 2")
+        try:
+            max_tokens = int(item.get("max_tokens", max_tokens))
+        except (TypeError, ValueError):
+            raise ValueError("Batch item 'max_tokens' must be an integer")
+        if not 1 <= max_tokens <= Config.MAX_TOKENS_LIMIT:
+            raise ValueError(f"Batch item 'max_tokens' must be between 1 and {Config.MAX_TOKENS_LIMIT}")
+        return {
+            "id": item.get("id"),
+            "prompt": item["prompt"],
+            "system_prompt": item.get("system_prompt") or system_prompt or Config.DEFAULT_SYSTEM_PROMPT,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+    def _api_params(self, item: Dict, model: Optional[str] = None) -> Dict:
+        """Build the request for one item"""
+        return {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": item["system_prompt"]},
+                {"role": "user", "content": item["prompt"]}
+            ],
+            "temperature": item["temperature"],
+            "max_tokens": item["max_tokens"]
+        }
+
+    def _item_key(self, item: Dict) -> str:
+        """Fingerprint used to check that a checkpointed result belongs to this item"""
+        return make_cache_key(self._api_params(item))
+
+    def _estimate_tokens(self, item: Dict) -> int:
+        """Tokens reserved against the TPM limit for one item"""
+        return (count_message_tokens("system", item["system_prompt"], self.model)
+                + count_message_tokens("user", item["prompt"], self.model)
+                + REPLY_TOKEN_OVERHEAD + item["max_tokens"])
+
+    def _reserve(self, item: Dict, estimated: int) -> tuple:
+        """
+        Check one item against the budgets and hold its worst-case cost
+
+        Returns (model, hold), or (None, None) when only the holds of items
+        still in flight stand in the way and the caller should try again.
+        """
+        if not budgets_enabled():
+            return self.model, None
+        prompt_tokens = estimated - item["max_tokens"]
+        with self._lock:
+            # Items in flight count at their worst case so concurrency cannot overshoot
+            held = self._reserved
+            try:
+                model = check_budget(self.model, prompt_tokens, item["max_tokens"],
+                                     self.session_spent + self.spent + held,
+                                     self.cost_ledger.window_spend(self.key_id) + held)
+            except BudgetExceeded:
+                if self._holds:
+                    return None, None
+                raise
+            hold = compute_cost(model, prompt_tokens, item["max_tokens"])
+            self._reserved += hold
+            self._holds += 1
+        return model, hold
+
+    def _release(self, hold: Optional[float]):
+        """Drop an item's budget hold"""
+        if hold is not None:
+            with self._lock:
+                self._holds -= 1
+                # Reset with the last hold so float error cannot build up
+                self._reserved = self._reserved - hold if self._holds else 0.0
+
+    def _charge(self, model: str, item: Dict, estimated: int, usage, content: Optional[str]):
+        """Record one sent item's tokens and cost in the ledger and metrics"""
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens = estimated - item["max_tokens"]
+            completion_tokens = count_tokens(content or "", model)
+        cost = compute_cost(model, prompt_tokens, completion_tokens)
+        self.cost_ledger.record(self.key_id, model, prompt_tokens, completion_tokens, cost)
+        if self.metrics and cost:
+            self.metrics.cost.inc(model, self.persona, amount=cost)
+        with self._lock:
+            self.spent += cost
+
+    def _load_checkpoint(self):
+        """Reuse successful results recorded by an earlier run"""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    index = record["index"]
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn tail from an interrupted run
+                if (isinstance(index, int) and 0 <= index < len(self.items)
+                        and record.get("key") == self._item_key(self.items[index])
+                        and record.get("result", {}).get("status") == "ok"):
+                    self.results[index] = dict(record["result"], resumed=True)
+        self.resumed = sum(1 for result in self.results if result is not None)
+        self.completed = self.resumed
+
+    def _open_checkpoint(self):
+        """Load and open the checkpoint for appending"""
+        self._load_checkpoint()
+        if self.checkpoint:
+            directory = os.path.dirname(self.checkpoint)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._checkpoint_file = open(self.checkpoint, "a", encoding="utf-8")
+
+    def _close_checkpoint(self):
+        """Flush and close the checkpoint"""
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.close()
+            self._checkpoint_file = None
+
+    def _pending(self) -> List[int]:
+        """Indices that still need a result"""
+        return [i for i, result in enumerate(self.results) if result is None]
+
+    def _success(self, index: int, content: str, usage, cached: bool) -> Dict:
+        """Build a successful item result"""
+        result = {"index": index, "id": self.items[index]["id"], "status": "ok", "content": content,
+                  "cached": cached}
+        if usage is not None:
+            result["usage"] = {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
+        return result
+
+    def _failure(self, index: int, error: BaseException) -> Dict:
+        """Build a failed item result"""
+        return {"index": index, "id": self.items[index]["id"], "status": "error",
+                "error": str(error), "error_type": type(error).__name__}
+
+    def _record(self, index: int, result: Dict):
+        """Store a result, update progress and checkpoint it"""
+        with self._lock:
+            self.results[index] = result
+            self.completed += 1
+            if result["status"] != "ok":
+                self.failed += 1
+            if result.get("cached"):
+                self.cached += 1
+            for field, value in result.get("usage", {}).items():
+                self.usage[field] += value
+            if self._checkpoint_file is not None:
+                record = {"index": index, "key": self._item_key(self.items[index]), "result": result}
+                self._checkpoint_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._checkpoint_file.flush()
+
+    def _cached(self, api_params: Dict):
+        """Return (cache, key, cached reply) for a request"""
+        cache = self.response_cache
+        if cache is None or not cache.is_cacheable(api_params):
+            return None, None, None
+        key = make_cache_key(api_params)
+        return cache, key, cache.get(key)
+
+    def _finish(self):
+        """Mark the job finished"""
+        self.finished_at = time.time()
+        if self.status == "running":
+            self.status = "cancelled" if self._cancelled.is_set() else "completed"
+
+    def _complete(self, client, index: int) -> Dict:
+        """Complete one item with a sync client"""
+        item = self.items[index]
+        estimated = self._estimate_tokens(item)
+        hold = None
+        try:
+            model, hold = self._reserve(item, estimated)
+            while model is None and not self._cancelled.wait(BUDGET_RECHECK_INTERVAL):
+                model, hold = self._reserve(item, estimated)
+            if model is None:
+                raise BudgetExceeded("Batch cancelled while waiting for budget")
+            api_params = self._api_params(item, model)
+            cache, key, content = self._cached(api_params)
+            if content is not None:
+                return self._success(index, content, None, True)
+            limiter = self.rate_limiter
+
+            def attempt():
+                # Batch work waits for capacity instead of being shed
+                while limiter:
+                    try:
+                        limiter.acquire(model, estimated)
+                        break
+                    except RateLimitExceeded as e:
+                        if self._cancelled.wait(e.retry_after or 1.0):
+                            raise
+                return client.chat.completions.create(**api_params)
+
+            response = self.retry_policy.call(attempt)
+            content = response.choices[0].message.content
+            self._charge(model, item, estimated, response.usage, content)
+            if limiter and response.usage:
+                limiter.reconcile(model, estimated, response.usage.total_tokens)
+            if cache is not None and content:
+                cache.put(key, content)
+            return self._success(index, content, response.usage, False)
+        except Exception as e:
+            return self._failure(index, e)
+        finally:
+            self._release(hold)
+
+    async def _complete_async(self, client, index: int) -> Dict:
+        """Complete one item with an async client"""
+        item = self.items[index]
+        estimated = self._estimate_tokens(item)
+        hold = None
+        try:
+            model, hold = self._reserve(item, estimated)
+            while model is None and not self._cancelled.is_set():
+                await asyncio.sleep(BUDGET_RECHECK_INTERVAL)
+                model, hold = self._reserve(item, estimated)
+            if model is None:
+                raise BudgetExceeded("Batch cancelled while waiting for budget")
+            api_params = self._api_params(item, model)
+            cache, key, content = self._cached(api_params)
+            if content is not None:
+                return self._success(index, content, None, True)
+            limiter = self.rate_limiter
+
+            async def attempt():
+                # Batch work waits for capacity instead of being shed
+                while limiter:
+                    try:
+                        await limiter.acquire_async(model, estimated)
+                        break
+                    except RateLimitExceeded as e:
+                        if self._cancelled.is_set():
+                            raise
+                        await asyncio.sleep(e.retry_after or 1.0)
+                return await client.chat.completions.create(**api_params)
+
+            response = await self.retry_policy.call_async(attempt)
+            content = response.choices[0].message.content
+            self._charge(model, item, estimated, response.usage, content)
+            if limiter and response.usage:
+                await limiter.reconcile_async(model, estimated, response.usage.total_tokens)
+            if cache is not None and content:
+                cache.put(key, content)
+            return self._success(index, content, response.usage, False)
+        except Exception as e:
+            return self._failure(index, e)
+        finally:
+            self._release(hold)
+
+    def run(self, client) -> List[Dict]:
+        """
+        Run the job on worker threads
+
+        Args:
+            client: OpenAI client
+
+        Returns:
+            One result per item, in input order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            self._open_checkpoint()
+            pending = iter(self._pending())
+            pending_lock = threading.Lock()
+
+            def worker():
+                while not self._cancelled.is_set():
+                    with pending_lock:
+                        index = next(pending, None)
+                    if index is None:
+                        return
+                    self._record(index, self._complete(client, index))
+
+            threads = [threading.Thread(target=worker, name=f"batch-{self.job_id[:8]}-{n}", daemon=True)
+                       for n in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            raise
+        finally:
+            self._close_checkpoint()
+            self._finish()
+        return self.results
+
+    async def run_async(self, client) -> List[Dict]:
+        """
+        Run the job on the event loop
+
+        Args:
+            client: AsyncOpenAI client
+
+        Returns:
+            One result per item, in input order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            self._open_checkpoint()
+            pending = iter(self._pending())
+
+            async def worker():
+                while not self._cancelled.is_set():
+                    index = next(pending, None)
+                    if index is None:
+                        return
+                    self._record(index, await self._complete_async(client, index))
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            raise
+        finally:
+            self._close_checkpoint()
+            self._finish()
+        return self.results
+
+    def results_page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get a slice of results, with placeholders for items not done yet
+
+        Args:
+            offset: First item index
+            limit: Maximum number of results (all remaining when None)
+
+        Returns:
+            Results in input order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        offset = max(0, offset)
+        stop = len(self.results) if limit is None else min(len(self.results), offset + max(0, limit))
+        return [self.results[i] or {"index": i, "id": self.items[i]["id"], "status": "pending"}
+                for i in range(offset, stop)]
+
+    def cancel(self):
+        """
+        Stop starting new items; requests already in flight finish
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._cancelled.set()
+
+    def cost(self) -> float:
+        """
+        Get what the job's requests have cost so far
+
+        Returns:
+            Cost in USD, priced per item at the model that served it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return self.spent
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped running"""
+        return self.status in ("completed", "cancelled", "failed")
+
+    def progress(self) -> Dict:
+        """
+        Get the job's progress
+
+        Returns:
+            Dictionary with status, counts, usage and timing
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        total = len(self.items)
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": total,
+            "completed": self.completed,
+            "succeeded": self.completed - self.failed,
+            "failed": self.failed,
+            "cached": self.cached,
+            "resumed": self.resumed,
+            "progress": round(self.completed / total, 4) if total else 1.0,
+            "concurrency": self.concurrency,
+            "usage": dict(self.usage),
+            "cost": round(self.cost(), 6),
+            "elapsed": round(end - self.started_at, 3) if self.started_at else 0.0,
+            "error": self.error
+        }
+
+
+def run_batch(prompts: Sequence[BatchItem], concurrency: Optional[int] = None, client=None,
+              **options) -> List[Dict]:
+    """
+    Complete many independent prompts concurrently
+
+    Args:
+        prompts: Prompts (strings or item dicts)
+        concurrency: Requests in flight at once
+        client: OpenAI client (defaults to the shared client for Config credentials)
+        **options: BatchJob options (model, system_prompt, temperature, max_tokens, checkpoint)
+
+    Returns:
+        One result per prompt, in input order
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if client is None:
+        from client_pool import get_openai_client
+        client = get_openai_client(Config.OPENAI_API_KEY, Config.OPENAI_BASE_URL)
+    return BatchJob(prompts, concurrency=concurrency, **options).run(client)
+
+
+def job_from_request(data: Dict) -> BatchJob:
+    """
+    Build a batch job from an /api/batch request body
+
+    A ``job_id`` resumes that job from its checkpoint; items whose prompt and
+    settings are unchanged are not sent again.
+
+    Args:
+        data: Request JSON with prompts and optional job_id, concurrency,
+            temperature, max_tokens and system_prompt
+
+    Returns:
+        New BatchJob checkpointing under Config.BATCH_CHECKPOINT_DIR
+
+    Raises:
+        ValueError: If the request is invalid
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    prompts = data.get('prompts')
+    if not isinstance(prompts, list) or not prompts:
+        raise ValueError("prompts must be a non-empty list")
+    if len(prompts) > Config.BATCH_MAX_PROMPTS:
+        raise ValueError(f"At most {Config.BATCH_MAX_PROMPTS} prompts per batch")
+    job_id = data.get('job_id') or uuid.uuid4().hex
+    if not isinstance(job_id, str) or not JOB_ID_PATTERN.match(job_id):
+        raise ValueError("job_id must be 1-64 letters, digits, '-' or '_'")
+    try:
+        concurrency = int(data['concurrency']) if data.get('concurrency') else None
+        temperature = float(data.get('temperature', 0.7))
+        max_tokens = int(data.get('max_tokens', 500))
+    except (TypeError, ValueError):
+        raise ValueError("concurrency, temperature and max_tokens must be numbers")
+    return BatchJob(prompts, model=Config.DEFAULT_MODEL,
+                    system_prompt=data.get('system_prompt') or Config.DEFAULT_SYSTEM_PROMPT,
+                    temperature=temperature, max_tokens=max_tokens, concurrency=concurrency,
+                    checkpoint=checkpoint_path(job_id), job_id=job_id)
+
+
+class BatchJobManager:
+    """
+    Registry of background batch jobs for the web endpoints
+
+    Keeps at most ``max_jobs`` jobs; the oldest finished jobs are forgotten
+    first (their checkpoints stay on disk for resuming).
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_jobs: Optional[int] = None):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_jobs = Config.BATCH_MAX_JOBS if max_jobs is None else max_jobs
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, job: BatchJob):
+        """Add a job, evicting old finished ones (raises if the id is running)"""
+        with self._lock:
+            existing = self._jobs.get(job.job_id)
+            if existing is not None and not existing.finished:
+                raise ValueError(f"Batch job '{job.job_id}' is already running")
+            self._jobs[job.job_id] = job
+            self._jobs.move_to_end(job.job_id)
+            for job_id in [j for j, old in self._jobs.items() if old.finished]:
+                if len(self._jobs) <= self.max_jobs:
+                    break
+                del self._jobs[job_id]
+            if len(self._jobs) > self.max_jobs:
+                del self._jobs[job.job_id]
+                raise ValueError("Too many batch jobs running")
+
+    def submit(self, job: BatchJob, client) -> BatchJob:
+        """
+        Start a job on a background thread
+
+        Args:
+            job: Batch job
+            client: OpenAI client
+
+        Returns:
+            The job
+
+        Raises:
+            ValueError: If the job id is already running or too many jobs are running
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._register(job)
+
+        def run():
+            try:
+                job.run(client)
+            except Exception:
+                pass  # recorded on the job
+
+        threading.Thread(target=run, name=f"batch-{job.job_id[:8]}", daemon=True).start()
+        return job
+
+    def submit_async(self, job: BatchJob, client) -> BatchJob:
+        """
+        Start a job as a task on the running event loop
+
+        Args:
+            job: Batch job
+            client: AsyncOpenAI client
+
+        Returns:
+            The job
+
+        Raises:
+            ValueError: If the job id is already running or too many jobs are running
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._register(job)
+
+        async def run():
+            try:
+                await job.run_async(client)
+            except Exception:
+                pass  # recorded on the job
+            finally:
+                self._tasks.pop(job.job_id, None)
+
+        # Keep a reference so the task is not garbage collected mid-run
+        self._tasks[job.job_id] = asyncio.ensure_future(run())
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        """
+        Look up a job
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+_manager: Optional[BatchJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_batch_manager() -> BatchJobManager:
+    """
+    Get the process-wide batch job registry
+
+    Returns:
+        Shared BatchJobManager
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = BatchJobManager()
+    return _manager
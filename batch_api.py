@@ -0,0 +1,543 @@
+"""
+Offline Batch API Jobs for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Runs non-interactive workloads through the provider's asynchronous Batch
+API, which is billed at a discount in exchange for a completion window of
+up to 24 hours. Requests are staged line by line in a local JSONL file in
+the batch input format, the file is uploaded, the batch is polled until it
+finishes, and the output and error files are streamed back one line at a
+time. Results are matched to requests by ``custom_id``, so neither side is
+ever held in memory as a whole. The staged worst-case cost is checked
+against the budgets before upload, and each result's discounted cost is
+charged to the API key in the cost ledger as it is read.
+
+Usage:
+    python batch_api.py submit prompts.txt --persona teacher
+    python batch_api.py wait <batch_id> --output results.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from client_pool import get_openai_client
+from config import Config
+from context_window import REPLY_TOKEN_OVERHEAD, count_message_tokens
+from personas import PERSONAS, get_persona
+from pricing import budgets_enabled, check_budget, compute_cost
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+
+def make_request_line(custom_id: str, body: Dict) -> str:
+    """
+    Encode one request in the batch input format
+
+    Args:
+        custom_id: Identifier echoed back with the result
+        body: Chat completion request body
+
+    Returns:
+        One JSONL line (with trailing newline)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+                      ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def parse_result_line(line) -> Optional[Dict]:
+    """
+    Decode one line of a batch output or error file
+
+    Args:
+        line: JSONL line (str or bytes)
+
+    Returns:
+        Dictionary with custom_id, status ("ok" or "error"), content, model,
+        usage and error, or None for a blank line
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    if not line.strip():
+        return None
+    record = json.loads(line)
+    response = record.get("response") or {}
+    body = response.get("body") or {}
+    result = {"custom_id": record.get("custom_id"), "status_code": response.get("status_code")}
+
+    error = record.get("error") or body.get("error")
+    if error or response.get("status_code") != 200:
+        result["status"] = "error"
+        result["error"] = (error or {}).get("message") or f"HTTP {response.get('status_code')}"
+        return result
+
+    choice = body["choices"][0]
+    result["status"] = "ok"
+    result["content"] = choice["message"].get("content")
+    result["finish_reason"] = choice.get("finish_reason")
+    result["model"] = body.get("model")
+    if body.get("usage"):
+        result["usage"] = {field: body["usage"].get(field, 0)
+                           for field in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    return result
+
+
+def iter_file_lines(client, file_id: str) -> Iterator[bytes]:
+    """
+    Stream a provider file one line at a time
+
+    Args:
+        client: OpenAI client
+        file_id: File identifier
+
+    Yields:
+        Lines without their newline
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with client.files.with_streaming_response.content(file_id) as response:
+        for line in response.iter_lines():
+            if line:
+                yield line.encode("utf-8") if isinstance(line, str) else line
+
+
+def iter_batch_results(client, batch) -> Iterator[Dict]:
+    """
+    Stream the parsed results of a finished batch
+
+    Successful requests come from the output file and failed ones from the
+    error file, in whatever order the provider wrote them.
+
+    Args:
+        client: OpenAI client
+        batch: Batch object
+
+    Yields:
+        Parsed results (see parse_result_line)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in iter_file_lines(client, file_id):
+            result = parse_result_line(line)
+            if result is not None:
+                yield result
+
+
+class OfflineBatch:
+    """
+    A Batch API job built from a chatbot's model and persona system prompts
+
+    ``add`` writes each request straight to the staging file, ``submit``
+    uploads it and creates the batch, ``wait`` polls until the batch is
+    finished, and ``iter_results`` / ``save_results`` stream the results
+    back. A submitted batch can be picked up again later with ``attach``.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, chatbot, name: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Create an offline batch
+
+        Args:
+            chatbot: GPTChatbot (or AsyncGPTChatbot) supplying model, system
+                prompt and credentials
+            name: Staging file name (generated when omitted)
+            directory: Staging directory (defaults to Config.BATCH_API_DIR)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.chatbot = chatbot
+        self.model = chatbot.model
+        # The Batch API is synchronous request/response, so always use a sync client
+        self.client = get_openai_client(chatbot.api_key, chatbot.base_url)
+        self.name = name or f"batch-{uuid.uuid4().hex[:12]}"
+        self.directory = directory or Config.BATCH_API_DIR
+        self.path = os.path.join(self.directory, f"{self.name}.jsonl")
+        self.count = 0
+        self.staged_prompt_tokens = 0
+        self.staged_max_tokens = 0
+        self.batch = None
+        self._file = None
+        self._charged = set()
+
+    @classmethod
+    def attach(cls, chatbot, batch_id: str) -> "OfflineBatch":
+        """
+        Pick up a batch submitted earlier (e.g. by another process)
+
+        Args:
+            chatbot: GPTChatbot supplying credentials
+            batch_id: Provider batch identifier
+
+        Returns:
+            OfflineBatch bound to the existing batch
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        offline = cls(chatbot, name=batch_id)
+        offline.refresh(batch_id)
+        offline.count = offline.batch.request_counts.total if offline.batch.request_counts else 0
+        return offline
+
+    def add(self, prompt: str, custom_id: Optional[str] = None, persona: Optional[str] = None,
+            system_prompt: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 500) -> str:
+        """
+        Stage one request
+
+        Args:
+            prompt: User message
+            custom_id: Identifier for matching the result (defaults to the line number)
+            persona: Persona key whose system prompt to use
+            system_prompt: Explicit system prompt (overrides persona)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the reply
+
+        Returns:
+            The request's custom_id
+
+        Raises:
+            ValueError: If the batch was already submitted or is full
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.batch is not None:
+            raise ValueError("Batch already submitted")
+        if self.count >= Config.BATCH_API_MAX_REQUESTS:
+            raise ValueError(f"A batch holds at most {Config.BATCH_API_MAX_REQUESTS} requests")
+        if persona is not None and persona not in PERSONAS:
+            raise ValueError(f"Unknown persona '{persona}'")
+        if system_prompt is None:
+            system_prompt = get_persona(persona)["system_prompt"] if persona else self.chatbot.system_prompt
+
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+        custom_id = custom_id or f"request-{self.count}"
+        body = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        self._file.write(make_request_line(custom_id, body))
+        self.count += 1
+        self.staged_prompt_tokens += (count_message_tokens("system", system_prompt, self.model)
+                                      + count_message_tokens("user", prompt, self.model) + REPLY_TOKEN_OVERHEAD)
+        self.staged_max_tokens += max_tokens
+        return custom_id
+
+    def add_all(self, prompts: Iterable, **options) -> int:
+        """
+        Stage many requests
+
+        Args:
+            prompts: Prompts (strings, or dicts of ``add`` arguments)
+            **options: Defaults for ``add`` (persona, temperature, max_tokens, ...)
+
+        Returns:
+            Number of requests staged
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        added = 0
+        for item in prompts:
+            if isinstance(item, str):
+                self.add(item, **options)
+            else:
+                self.add(**{**options, **item})
+            added += 1
+        return added
+
+    def submit(self, completion_window: Optional[str] = None, metadata: Optional[Dict] = None):
+        """
+        Upload the staging file and create the batch
+
+        Args:
+            completion_window: Provider completion window (defaults to Config.BATCH_API_COMPLETION_WINDOW)
+            metadata: Optional metadata stored with the batch
+
+        Returns:
+            Batch object
+
+        Raises:
+            ValueError: If nothing was staged or the batch was already submitted
+            BudgetExceeded: If the staged requests could cross a hard budget
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.batch is not None:
+            raise ValueError("Batch already submitted")
+        if not self.count:
+            raise ValueError("No requests staged")
+        self._file.close()
+        self._file = None
+
+        if budgets_enabled():
+            chatbot = self.chatbot
+            model = check_budget(self.model, self.staged_prompt_tokens, self.staged_max_tokens,
+                                 chatbot.session_cost, chatbot.cost_ledger.window_spend(chatbot._key_id),
+                                 Config.BATCH_API_DISCOUNT)
+            if model != self.model:
+                self._restage(model)
+
+        with open(self.path, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        params = {
+            "input_file_id": uploaded.id,
+            "endpoint": BATCH_ENDPOINT,
+            "completion_window": completion_window or Config.BATCH_API_COMPLETION_WINDOW
+        }
+        if metadata:
+            params["metadata"] = metadata
+        self.batch = self.client.batches.create(**params)
+        return self.batch
+
+    def _restage(self, model: str):
+        """Rewrite the staging file for another model (the budget downgrade)"""
+        tmp = self.path + ".tmp"
+        with open(self.path, "r", encoding="utf-8") as source, open(tmp, "w", encoding="utf-8") as target:
+            for line in source:
+                record = json.loads(line)
+                target.write(make_request_line(record["custom_id"], dict(record["body"], model=model)))
+        os.replace(tmp, self.path)
+        self.model = model
+
+    def _charge(self, results: Iterator[Dict]) -> Iterator[Dict]:
+        """Record each result's discounted cost in the cost ledger the first time it is read"""
+        chatbot = self.chatbot
+        for result in results:
+            usage = result.get("usage")
+            if usage and result["custom_id"] not in self._charged:
+                self._charged.add(result["custom_id"])
+                model = result.get("model") or self.model
+                cost = compute_cost(model, usage["prompt_tokens"], usage["completion_tokens"],
+                                    Config.BATCH_API_DISCOUNT)
+                chatbot.cost_ledger.record(chatbot._key_id, model, usage["prompt_tokens"],
+                                           usage["completion_tokens"], cost)
+                chatbot.session_cost += cost
+                chatbot.conversation_stats["total_cost"] += cost
+                if chatbot.metrics and cost:
+                    chatbot.metrics.cost.inc(model, chatbot.persona, amount=cost)
+            yield result
+
+    def refresh(self, batch_id: Optional[str] = None):
+        """
+        Fetch the batch's current status
+
+        Args:
+            batch_id: Batch to fetch (defaults to the submitted one)
+
+        Returns:
+            Batch object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.batch = self.client.batches.retrieve(batch_id or self.batch.id)
+        return self.batch
+
+    @property
+    def done(self) -> bool:
+        """Whether the batch reached a terminal status"""
+        return self.batch is not None and self.batch.status in TERMINAL_STATUSES
+
+    def wait(self, poll_interval: Optional[float] = None, timeout: Optional[float] = None,
+             on_progress: Optional[Callable] = None):
+        """
+        Poll until the batch finishes
+
+        Args:
+            poll_interval: Seconds between polls (defaults to Config.BATCH_API_POLL_INTERVAL)
+            timeout: Give up after this many seconds (None waits for the completion window)
+            on_progress: Called with the Batch object after every poll
+
+        Returns:
+            Finished Batch object
+
+        Raises:
+            TimeoutError: If the batch is still running after ``timeout``
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        interval = Config.BATCH_API_POLL_INTERVAL if poll_interval is None else poll_interval
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.refresh()
+            if on_progress:
+                on_progress(self.batch)
+            if self.done:
+                return self.batch
+            if deadline is not None and time.monotonic() + interval > deadline:
+                raise TimeoutError(f"Batch {self.batch.id} still {self.batch.status} after {timeout}s")
+            time.sleep(interval)
+
+    def cancel(self):
+        """
+        Ask the provider to cancel the batch
+
+        Returns:
+            Batch object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.batch = self.client.batches.cancel(self.batch.id)
+        return self.batch
+
+    def iter_results(self) -> Iterator[Dict]:
+        """
+        Stream the batch's results line by line
+
+        Each result's cost is charged to the API key the first time it is read.
+
+        Yields:
+            Parsed results keyed by ``custom_id`` (see parse_result_line)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self.done:
+            self.refresh()
+        return self._charge(iter_batch_results(self.client, self.batch))
+
+    def save_results(self, path: str) -> Dict:
+        """
+        Stream the results into a local JSONL file
+
+        Args:
+            path: Output file
+
+        Returns:
+            Dictionary with succeeded/failed counts, summed token usage and
+            cost (at the Batch API discount, BATCH_API_DISCOUNT)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        summary = {"succeeded": 0, "failed": 0,
+                   "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}, "cost": 0.0}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for result in self.iter_results():
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+                summary["succeeded" if result["status"] == "ok" else "failed"] += 1
+                usage = result.get("usage", {})
+                for field, value in usage.items():
+                    summary["usage"][field] += value
+                if usage:
+                    summary["cost"] += compute_cost(result.get("model") or self.model, usage["prompt_tokens"],
+                                                    usage["completion_tokens"], Config.BATCH_API_DISCOUNT)
+        os.replace(tmp, path)
+        summary["cost"] = round(summary["cost"], 6)
+        return summary
+
+    def match_results(self, custom_ids: Iterable[str]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Pair requested ids with their results
+
+        Only results for the requested ids are kept while the files are
+        streamed, so memory grows with ``custom_ids``, not with the batch.
+
+        Args:
+            custom_ids: Identifiers to look up
+
+        Yields:
+            (custom_id, result or None if the batch has no result for it), in the given order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        wanted = {custom_id: None for custom_id in custom_ids}
+        for result in self.iter_results():
+            if result["custom_id"] in wanted:
+                wanted[result["custom_id"]] = result
+        return iter(wanted.items())
+
+    def status(self) -> Dict:
+        """
+        Summarize the batch
+
+        Returns:
+            Dictionary with id, status, counts and file ids
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.batch is None:
+            return {"name": self.name, "status": "staging", "staged": self.count, "path": self.path}
+        counts = self.batch.request_counts
+        return {
+            "name": self.name,
+            "id": self.batch.id,
+            "status": self.batch.status,
+            "staged": self.count,
+            "total": counts.total if counts else 0,
+            "completed": counts.completed if counts else 0,
+            "failed": counts.failed if counts else 0,
+            "output_file_id": self.batch.output_file_id,
+            "error_file_id": self.batch.error_file_id
+        }
+
+    def close(self):
+        """
+        Close the staging file without submitting
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def main():
+    """
+    Submit, poll and download Batch API jobs from the command line
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    from chatbot import GPTChatbot
+
+    parser = argparse.ArgumentParser(description="Offline Batch API jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit = commands.add_parser("submit", help="Stage prompts (one per line) and submit them")
+    submit.add_argument("prompts", help="Text file with one prompt per line ('-' for stdin)")
+    submit.add_argument("--persona", choices=sorted(PERSONAS), default=None)
+    submit.add_argument("--model", default=Config.DEFAULT_MODEL)
+    submit.add_argument("--temperature", type=float, default=Config.DEFAULT_TEMPERATURE)
+    submit.add_argument("--max-tokens", type=int, default=Config.DEFAULT_MAX_TOKENS)
+    wait = commands.add_parser("wait", help="Poll a batch and save its results")
+    wait.add_argument("batch_id")
+    wait.add_argument("--output", default=None, help="Results file (default: <BATCH_API_DIR>/<batch_id>.results.jsonl)")
+    wait.add_argument("--poll-interval", type=float, default=None)
+    status = commands.add_parser("status", help="Show a batch's status")
+    status.add_argument("batch_id")
+    args = parser.parse_args()
+
+    chatbot = GPTChatbot(api_key=Config.OPENAI_API_KEY, model=getattr(args, "model", Config.DEFAULT_MODEL),
+                         base_url=Config.OPENAI_BASE_URL)
+    chatbot.set_system_prompt(Config.DEFAULT_SYSTEM_PROMPT)
+
+    if args.command == "submit":
+        offline = OfflineBatch(chatbot)
+        source = sys.stdin if args.prompts == "-" else open(args.prompts, "r", encoding="utf-8")
+        with source:
+            prompts = (line.strip() for line in source if line.strip())
+            offline.add_all(prompts, persona=args.persona, temperature=args.temperature,
+                            max_tokens=args.max_tokens)
+        offline.submit()
+        print(json.dumps(offline.status(), indent=2))
+    elif args.command == "status":
+        print(json.dumps(OfflineBatch.attach(chatbot, args.batch_id).status(), indent=2))
+    else:
+        offline = OfflineBatch.attach(chatbot, args.batch_id)
+        offline.wait(args.poll_interval, on_progress=lambda batch: print(
+            f"{batch.status}: {batch.request_counts.completed if batch.request_counts else 0}"
+            f"/{batch.request_counts.total if batch.request_counts else 0}", file=sys.stderr))
+        os.makedirs(Config.BATCH_API_DIR, exist_ok=True)
+        output = args.output or os.path.join(Config.BATCH_API_DIR, f"{args.batch_id}.results.jsonl")
+        summary = offline.save_results(output)
+        print(json.dumps({**offline.status(), **summary, "results": output}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Load Test: Thread-per-Stream vs Native asyncio
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Holds N concurrent streaming completions open against the fake OpenAI server,
+once with GPTChatbot on one thread per stream (how the Flask app serves
+/api/chat/stream) and once with AsyncGPTChatbot tasks on a single event loop.
+Each run happens in a fresh subprocess so peak RSS is measured in isolation,
+then the highest concurrency that fits in the memory budget is reported.
+
+Usage:
+    python benchmarks/bench_async_load.py --levels 100 500 1000 --memory-mb 256
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import resource
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_threads(concurrency: int) -> int:
+    """Run one GPTChatbot stream per thread; returns completed streams"""
+    from chatbot import GPTChatbot
+
+    completed = []
+    start_barrier = threading.Barrier(concurrency)
+
+    def worker():
+        chatbot = GPTChatbot()
+        start_barrier.wait()
+        for _ in chatbot.get_streaming_response("Hello", max_tokens=30):
+            pass
+        completed.append(1)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(completed)
+
+
+def run_asyncio(concurrency: int) -> int:
+    """Run one AsyncGPTChatbot stream per task; returns completed streams"""
+    from async_chatbot import AsyncGPTChatbot
+
+    async def worker():
+        chatbot = AsyncGPTChatbot()
+        async for _ in chatbot.get_streaming_response("Hello", max_tokens=30):
+            pass
+        return 1
+
+    async def main():
+        results = await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return sum(results)
+
+    return asyncio.run(main())
+
+
+def worker_main(mode: str, concurrency: int):
+    """Entry point for a measurement subprocess"""
+    start = time.perf_counter()
+    completed = run_threads(concurrency) if mode == "threads" else run_asyncio(concurrency)
+    print(json.dumps({
+        "mode": mode,
+        "concurrency": concurrency,
+        "completed": completed,
+        "elapsed": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+
+def free_port() -> int:
+    """Pick a free TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    """
+    Run the load test
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Thread vs asyncio streaming load test")
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--memory-mb", type=float, default=256, help="Memory budget per process")
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--worker", choices=["threads", "asyncio"], help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(args.worker, args.concurrency)
+        return
+
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, os.path.join(ROOT, "benchmarks", "fake_openai_server.py"),
+        "--port", str(port), "--tokens-per-second", str(args.tokens_per_second)
+    ], stdout=subprocess.DEVNULL)
+    time.sleep(1)
+
+    results = []
+    try:
+        for mode in ("threads", "asyncio"):
+            for level in args.levels:
+                # Size the pools so connection limits never cap the test
+                shards = max(1, level // 100)
+                per_pool = -(-level // shards)
+                env = dict(os.environ,
+                           OPENAI_API_KEY="sk-fake",
+                           OPENAI_BASE_URL=f"http://127.0.0.1:{port}/v1",
+                           HTTP_ASYNC_POOL_SHARDS=str(shards),
+                           HTTP_MAX_CONNECTIONS=str(per_pool if mode == "asyncio" else level),
+                           HTTP_MAX_KEEPALIVE_CONNECTIONS=str(per_pool if mode == "asyncio" else level))
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__),
+                     "--worker", mode, "--concurrency", str(level)],
+                    env=env, capture_output=True, text=True
+                )
+                if output.returncode != 0:
+                    print(f"{mode} @ {level} failed:\n{output.stderr[-2000:]}")
+                    continue
+                result = json.loads(output.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(f"{mode:<8} concurrency={level:<6} completed={result['completed']:<6} "
+                      f"elapsed={result['elapsed']:.2f}s peak_rss={result['peak_rss_mb']:.1f}MiB")
+    finally:
+        server.terminate()
+
+    print()
+    print(f"Highest tested concurrency within {args.memory_mb:.0f} MiB:")
+    for mode in ("threads", "asyncio"):
+        fits = [r["concurrency"] for r in results
+                if r["mode"] == mode and r["peak_rss_mb"] <= args.memory_mb
+                and r["completed"] == r["concurrency"]]
+        print(f"  {mode:<8} {max(fits) if fits else 0}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: Shared Client Pool vs One Client per Session
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Simulates many web sessions taking turns against the fake OpenAI server and
+compares connection setups and latency between one OpenAI client per session
+(the old behaviour) and the shared client registry.
+
+Usage:
+    python benchmarks/bench_client_pool.py --sessions 50 --turns 2 --connect-latency 0.02
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+from client_pool import get_openai_client, close_all_clients
+from fake_openai_server import FakeOpenAIServer
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+def run(server: FakeOpenAIServer, clients, turns: int):
+    """
+    Send ``turns`` rounds of requests, one request per session per round
+
+    Args:
+        server: Running fake server
+        clients: One client per simulated session
+        turns: Number of rounds
+
+    Returns:
+        Tuple of (latencies in seconds, connections accepted)
+    """
+    server.reset_counters()
+    latencies = []
+    for _ in range(turns):
+        for client in clients:
+            start = time.perf_counter()
+            client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "Hello"}],
+                max_tokens=8
+            )
+            latencies.append(time.perf_counter() - start)
+    return latencies, server.connections
+
+
+def report(name: str, latencies, connections: int):
+    """Print a summary line"""
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    mean = statistics.mean(latencies) * 1000
+    print(f"{name:<24} connections={connections:<5} p50={p50:.2f}ms p95={p95:.2f}ms mean={mean:.2f}ms")
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Shared client pool benchmark")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument("--connect-latency", type=float, default=0.02,
+                        help="Seconds per new connection (simulated TLS handshake)")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency, connect_latency=args.connect_latency).start()
+    try:
+        per_session = [OpenAI(api_key="sk-fake", base_url=server.base_url)
+                       for _ in range(args.sessions)]
+        latencies, connections = run(server, per_session, args.turns)
+        report("client per session", latencies, connections)
+        for client in per_session:
+            client.close()
+
+        shared = [get_openai_client("sk-fake", server.base_url) for _ in range(args.sessions)]
+        latencies, connections = run(server, shared, args.turns)
+        report("shared client pool", latencies, connections)
+        close_all_clients()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
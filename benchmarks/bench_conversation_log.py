@@ -0,0 +1,95 @@
+"""
+Benchmark: Conversation Persistence Cost per Message
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Compares persisting after every message by rewriting the whole history
+with ``json.dump(..., indent=2)`` against appending one record to the
+conversation log, and times reopening the log and seeking to a turn.
+
+Usage:
+    python benchmarks/bench_conversation_log.py --messages 2000
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation_log import ConversationLog
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+def make_message(i: int) -> dict:
+    """Build a chat message of realistic size"""
+    role = "user" if i % 2 == 0 else "assistant"
+    return {"role": role, "content": f"Message {i}: " + "lorem ipsum dolor sit amet " * 12}
+
+
+def bench_rewrite(path: str, count: int) -> float:
+    """Seconds to persist ``count`` messages by rewriting the JSON file each time"""
+    history = []
+    start = time.perf_counter()
+    for i in range(count):
+        history.append(make_message(i))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, ensure_ascii=False)
+    return time.perf_counter() - start
+
+
+def bench_append(path: str, count: int, fsync_every: int) -> float:
+    """Seconds to persist ``count`` messages by appending to the log"""
+    log = ConversationLog(path, fsync_every=fsync_every)
+    start = time.perf_counter()
+    for i in range(count):
+        log.append(make_message(i))
+    log.close()
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Conversation persistence benchmark")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--fsync-every", type=int, default=32)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-conversation-log-")
+    try:
+        rewrite = bench_rewrite(os.path.join(directory, "conversation.json"), args.messages)
+        log_path = os.path.join(directory, "conversation.jsonl")
+        append = bench_append(log_path, args.messages, args.fsync_every)
+
+        start = time.perf_counter()
+        log = ConversationLog(log_path)
+        reopen = time.perf_counter() - start
+        start = time.perf_counter()
+        log.read(args.messages // 2)
+        seek = time.perf_counter() - start
+        log.close()
+
+        per_message = 1e6 / args.messages
+        print(f"json rewrite  {rewrite * per_message:10.1f}us/message")
+        print(f"log append    {append * per_message:10.1f}us/message (fsync every {args.fsync_every})")
+        print(f"reopen        {reopen * 1e3:10.2f}ms for {args.messages} records")
+        print(f"read turn N   {seek * 1e6:10.1f}us")
+        print(f"speedup {rewrite / append:.1f}x")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: Conversation History Memory
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Measures with tracemalloc the memory held by many sessions' histories,
+comparing the previous layout (a dict per message plus a parallel list of
+token counts and a timestamp list) with ConversationHistory. Message
+contents are created before measuring and shared by both layouts, so the
+numbers are the per-message bookkeeping each layout adds on top of the
+text itself.
+
+Usage:
+    python benchmarks/bench_history_memory.py --sessions 10000 --turns 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import ConversationHistory
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+TEXT = "Here is a typical chat message with a few sentences of content in it. "
+
+
+class DictHistory:
+    """Previous layout: list of dicts plus cached token counts and timestamps"""
+
+    def __init__(self):
+        self.messages = []
+        self.token_counts = []
+        self.timestamps = []
+
+    def append(self, role, content, tokens):
+        self.messages.append({"role": role, "content": content})
+        self.token_counts.append(tokens)
+        self.timestamps.append(time.time())
+
+
+def build(factory, contents, sessions: int, turns: int):
+    """Fill ``sessions`` histories of ``turns`` messages each"""
+    histories = []
+    for s in range(sessions):
+        history = factory()
+        for t in range(turns):
+            content = contents[s * turns + t]
+            history.append("user" if t % 2 == 0 else "assistant", content, 4 + len(content) // 4)
+        histories.append(history)
+    return histories
+
+
+def measure(factory, contents, sessions: int, turns: int) -> int:
+    """Bytes allocated while building and holding the histories"""
+    tracemalloc.start()
+    histories = build(factory, contents, sessions, turns)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del histories
+    return size
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Conversation history memory benchmark")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    total = args.sessions * args.turns
+    contents = [f"{i} {TEXT}" for i in range(total)]
+    content_bytes = sum(sys.getsizeof(c) for c in contents)
+
+    before = measure(DictHistory, contents, args.sessions, args.turns)
+    after = measure(ConversationHistory, contents, args.sessions, args.turns)
+
+    print(f"{args.sessions} sessions x {args.turns} turns = {total} messages "
+          f"(content itself: {content_bytes / 2**20:.1f} MiB, not counted below)")
+    for name, size in (("dicts", before), ("compact", after)):
+        print(f"{name:<8} {size / 2**20:8.1f} MiB  {size / total:6.1f} bytes/message")
+    print(f"saved {(before - after) / 2**20:.1f} MiB ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: Client-Side CPU per Request on Long Conversations
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Measures the CPU a chatbot spends preparing and sending each request (context
+selection, building ``messages``, SDK parameter handling, JSON encoding and
+parsing the reply) with the incremental prompt builder off and on. The
+OpenAI client talks to an in-process httpx MockTransport that returns a
+canned completion, so no network or server time is included. Both modes
+are checked to send identical request bodies.
+
+Usage:
+    python benchmarks/bench_prompt_builder.py --turns 200 --requests 200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import httpx
+from openai import OpenAI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import GPTChatbot
+from prompt_builder import PromptBuilder
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+REPLY = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "Short canned reply."}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}
+TEXT = "A fairly ordinary chat turn with a \"quote\", some unicode (café) and a few sentences. "
+
+
+def make_chatbot(builder: bool, turns: int, max_history: int, bodies: list) -> GPTChatbot:
+    """Create a chatbot with ``turns`` turns of history talking to a mock transport"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, json=REPLY)
+
+    chatbot = GPTChatbot(api_key="bench", model="gpt-4o")
+    chatbot.client = OpenAI(api_key="bench", base_url="http://bench.invalid/v1",
+                            http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    chatbot.rate_limiter = None
+    chatbot.response_cache = None
+    chatbot.semantic_cache = None
+    chatbot.context_builder.max_messages = max_history
+    chatbot.prompt_builder = PromptBuilder() if builder else None
+    for i in range(turns):
+        chatbot.add_message("user", f"Question {i}: " + TEXT * 4)
+        chatbot.add_message("assistant", f"Answer {i}: " + TEXT * 8)
+    return chatbot
+
+
+def run(builder: bool, turns: int, requests: int, max_history: int):
+    """CPU seconds per request and the request bodies sent"""
+    bodies = []
+    chatbot = make_chatbot(builder, turns, max_history, bodies)
+    chatbot.get_response("warm up", temperature=0.5)
+    start = time.process_time()
+    for i in range(requests):
+        chatbot.get_response(f"Follow-up {i}: " + TEXT, temperature=0.5)
+    return (time.process_time() - start) / requests, bodies
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Incremental prompt builder benchmark")
+    parser.add_argument("--turns", type=int, default=200, help="Turns of history before measuring")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    for label, max_history in (("whole history", 0), ("sliding window of 50", 50)):
+        before, old_bodies = run(False, args.turns, args.requests, max_history)
+        after, new_bodies = run(True, args.turns, args.requests, max_history)
+        assert [json.loads(b) for b in old_bodies] == [json.loads(b) for b in new_bodies]
+        size = len(new_bodies[-1]) / 1024
+        print(f"{label:<22} body={size:7.1f}KiB  before={before * 1e3:7.3f}ms  "
+              f"after={after * 1e3:7.3f}ms  speedup={before / after:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
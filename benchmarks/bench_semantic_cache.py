@@ -0,0 +1,105 @@
+"""
+Benchmark: Semantic Cache Lookup Latency and Hit Rate
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Fills the semantic cache with synthetic FAQ-style questions, then queries
+paraphrases (one word dropped, one word swapped for a synonym) and reports
+hit rate and lookup latency for the brute-force and IVF indexes.
+
+Usage:
+    python benchmarks/bench_semantic_cache.py --entries 20000 --queries 2000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+TOPICS = ["password", "invoice", "account", "subscription", "refund", "order", "shipping", "profile",
+          "email", "payment", "card", "plan", "device", "login", "report", "export", "team", "api",
+          "key", "webhook", "address", "language", "timezone", "notification", "backup", "upload"]
+ACTIONS = ["reset", "change", "cancel", "update", "delete", "download", "view", "renew", "verify",
+           "transfer", "recover", "enable", "disable", "share", "connect", "configure"]
+SYNONYMS = {"how": "what", "do": "can", "my": "the", "i": "we"}
+
+
+def make_question(rng: random.Random) -> str:
+    """Build a synthetic support question"""
+    return (f"how do i {rng.choice(ACTIONS)} my {rng.choice(TOPICS)} "
+            f"{rng.choice(TOPICS)} for {rng.choice(TOPICS)} {rng.randrange(1000)}")
+
+
+def paraphrase(question: str, rng: random.Random) -> str:
+    """Swap one word for a synonym"""
+    words = question.split()
+    swappable = [i for i, word in enumerate(words) if word in SYNONYMS]
+    i = rng.choice(swappable)
+    words[i] = SYNONYMS[words[i]]
+    return " ".join(words)
+
+
+def run(name: str, cache: SemanticCache, questions, queries):
+    """Fill the cache, query paraphrases and print a summary line"""
+    start = time.perf_counter()
+    for question in questions:
+        cache.put("bench", question, f"answer to {question}")
+    fill = time.perf_counter() - start
+
+    latencies = []
+    correct = 0
+    for original, query in queries:
+        start = time.perf_counter()
+        answer, _ = cache.lookup("bench", query)
+        latencies.append(time.perf_counter() - start)
+        correct += answer == f"answer to {original}"
+
+    latencies.sort()
+    stats = cache.stats()
+    print(f"{name:<12} index={stats['index']['bench']:<18} fill={fill:.2f}s "
+          f"hit_rate={stats['hit_rate']:.3f} correct={correct / len(queries):.3f} "
+          f"p50={statistics.median(latencies) * 1000:.3f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f}ms")
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Semantic cache benchmark")
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    questions = list(dict.fromkeys(make_question(rng) for _ in range(args.entries)))
+    originals = rng.sample(questions, min(args.queries, len(questions)))
+    queries = [(original, paraphrase(original, rng)) for original in originals]
+
+    common = dict(threshold=args.threshold, max_entries=len(questions), max_age=3600)
+    if semantic_cache.np is None:
+        print("NumPy not installed: only the pure-Python index is available")
+        run("python", SemanticCache(**common), questions, queries)
+        return
+    run("brute_force", SemanticCache(ivf_threshold=10 ** 9, **common), questions, queries)
+    run("ivf", SemanticCache(**common), questions, queries)
+
+
+if __name__ == "__main__":
+    main()
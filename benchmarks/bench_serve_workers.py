@@ -0,0 +1,237 @@
+"""
+Benchmark: Worker / Thread Mix for serve.py
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Starts the fake OpenAI server with a given upstream latency, then launches
+serve.py once per worker configuration (worker class x workers x threads)
+and drives it with a fixed number of concurrent clients, each in its own
+session. Reports throughput and latency percentiles per configuration and
+the best mix. With a slow upstream most of a request is spent waiting, so
+the winning mix usually has far more threads (or async tasks) than CPUs.
+
+The WSGI worker classes need gunicorn; without it only ``async`` runs.
+
+Usage:
+    python benchmarks/bench_serve_workers.py --upstream-latency 0.5 --clients 64
+    python benchmarks/bench_serve_workers.py --classes gthread --workers 2 4 --threads 8 32 --stream
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+def free_port() -> int:
+    """Pick a free TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def gunicorn_available() -> bool:
+    """Whether the WSGI worker classes can be benchmarked"""
+    try:
+        import gunicorn  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def wait_ready(port: int, timeout: float = 30.0) -> bool:
+    """Poll /api/info until the server answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/info")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def drive(port: int, clients: int, duration: float, stream: bool) -> Dict:
+    """
+    Send requests from concurrent clients for a fixed time
+
+    Each client keeps one keep-alive connection and its own session cookie,
+    so per-session serialization does not limit the test.
+    """
+    path = "/api/chat/stream" if stream else "/api/chat"
+    body = json.dumps({"message": "Hello", "temperature": 0.7, "max_tokens": 60})
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        cookie = None
+        while time.monotonic() < deadline:
+            headers = {"Content-Type": "application/json"}
+            if cookie:
+                headers["Cookie"] = cookie
+            started = time.perf_counter()
+            try:
+                conn.request("POST", path, body, headers)
+                response = conn.getresponse()
+                response.read()
+                cookie = (response.getheader("Set-Cookie") or "").split(";")[0] or cookie
+                ok = response.status == 200
+            except OSError:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99)
+    }
+
+
+def run_config(upstream: str, worker_class: str, workers: int, threads: int,
+               args: argparse.Namespace) -> Optional[Dict]:
+    """Launch serve.py with one configuration and measure it"""
+    port = free_port()
+    env = dict(os.environ,
+               OPENAI_API_KEY="sk-fake",
+               OPENAI_BASE_URL=upstream,
+               RESPONSE_CACHE_ENABLED="false",
+               SAVE_CONVERSATIONS="false",
+               RATE_LIMIT_ENABLED="false",
+               SINGLEFLIGHT_ENABLED="false",
+               # Each request is its own session here, so per-worker state is fine
+               SERVE_ALLOW_PER_WORKER_STATE="true",
+               HTTP_MAX_CONNECTIONS=str(max(100, threads * 2)),
+               HTTP_MAX_KEEPALIVE_CONNECTIONS=str(max(100, threads * 2)))
+    server = subprocess.Popen([
+        sys.executable, os.path.join(ROOT, "serve.py"),
+        "--bind", f"127.0.0.1:{port}",
+        "--worker-class", worker_class,
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--worker-connections", str(max(threads, args.clients)),
+        "--max-requests", "0"
+    ], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        if not wait_ready(port):
+            server.terminate()
+            print(f"{worker_class} workers={workers} threads={threads}: did not start\n"
+                  f"{server.communicate(timeout=10)[1][-2000:]}")
+            return None
+        drive(port, min(args.clients, 4), 1.0, args.stream)  # warm up connections and workers
+        result = drive(port, args.clients, args.duration, args.stream)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    result.update(worker_class=worker_class, workers=workers, threads=threads)
+    return result
+
+
+def main():
+    """
+    Run the worker mix benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Find the best serve.py worker/thread mix")
+    parser.add_argument("--upstream-latency", type=float, default=0.2, help="Fake server delay per request (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Fake server streaming rate")
+    parser.add_argument("--classes", nargs="+", default=["gthread", "sync", "async"],
+                        choices=["gthread", "sync", "gevent", "async"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16, 64],
+                        help="Threads per gthread worker (other classes run once per worker count)")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--stream", action="store_true", help="Benchmark /api/chat/stream instead of /api/chat")
+    args = parser.parse_args()
+
+    classes = args.classes
+    if not gunicorn_available():
+        classes = [name for name in classes if name == "async"]
+        print("gunicorn is not installed; only the async worker class can be benchmarked.")
+
+    fake_port = free_port()
+    command = [sys.executable, os.path.join(ROOT, "benchmarks", "fake_openai_server.py"),
+               "--port", str(fake_port), "--latency", str(args.upstream_latency)]
+    if args.tokens_per_second:
+        command += ["--tokens-per-second", str(args.tokens_per_second)]
+    fake = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    time.sleep(1)
+    upstream = f"http://127.0.0.1:{fake_port}/v1"
+
+    results = []
+    try:
+        for worker_class in classes:
+            thread_counts = args.threads if worker_class == "gthread" else [1]
+            for workers in args.workers:
+                for threads in thread_counts:
+                    result = run_config(upstream, worker_class, workers, threads, args)
+                    if result is None:
+                        continue
+                    results.append(result)
+                    print(f"{worker_class:<8} workers={workers:<3} threads={threads:<4} "
+                          f"rps={result['rps']:8.1f} p50={result['p50'] * 1000:7.1f}ms "
+                          f"p99={result['p99'] * 1000:7.1f}ms errors={result['errors']}")
+    finally:
+        fake.terminate()
+
+    clean = [r for r in results if not r["errors"]] or results
+    if clean:
+        best = max(clean, key=lambda r: r["rps"])
+        print()
+        print(f"Best mix at {args.upstream_latency:g}s upstream latency and {args.clients} clients: "
+              f"--worker-class {best['worker_class']} --workers {best['workers']}"
+              + (f" --threads {best['threads']}" if best["worker_class"] == "gthread" else "")
+              + f" ({best['rps']:.1f} req/s, p99 {best['p99'] * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
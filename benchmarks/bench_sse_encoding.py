@@ -0,0 +1,125 @@
+"""
+Benchmark: Streaming Pipeline CPU per Token
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Compares the old streaming path (``full_response += chunk`` plus one
+``json.dumps({'chunk': ...})`` per token) with the new one (parts list,
+precomputed frame prefix, C string escaper and frame coalescing). Token
+arrival is simulated with a virtual clock so the coalescing window behaves
+as it would at the given upstream rate without the benchmark sleeping.
+
+Usage:
+    python benchmarks/bench_sse_encoding.py --tokens 2000 --tokens-per-second 150
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sse import FrameCoalescer, sse_stream
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+WORDS = ["the", "model", "streams", "tokens", "quickly", "and", "each", "delta", "is", "tiny",
+         "\"quoted\"", "naïve", "café", "line\n", "tab\t", "emoji 😀", "x", "of", "a", "reply"]
+
+
+class VirtualClock:
+    """Clock advanced by the simulated token stream"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_tokens(count: int, rng: random.Random):
+    """Build token-sized deltas"""
+    return [(" " if i else "") + rng.choice(WORDS) for i in range(count)]
+
+
+def old_pipeline(tokens):
+    """Previous chat_stream + get_streaming_response behaviour"""
+    def chatbot_stream():
+        full_response = ""
+        for content in tokens:
+            full_response += content
+            yield content
+        chatbot_stream.reply = full_response
+
+    def generate():
+        for chunk in chatbot_stream():
+            yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+        yield f"data: {json.dumps({'done': True})}\n\n"
+
+    return list(generate())
+
+
+def new_pipeline(tokens, clock: VirtualClock, interval: float):
+    """Current chat_stream + get_streaming_response behaviour"""
+    def chatbot_stream():
+        parts = []
+        for content in tokens:
+            clock.now += interval
+            parts.append(content)
+            yield content
+        chatbot_stream.reply = "".join(parts)
+
+    return list(sse_stream(chatbot_stream(), FrameCoalescer(clock=clock)))
+
+
+def measure(fn, repeat: int) -> float:
+    """CPU seconds for ``repeat`` runs"""
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return time.process_time() - start
+
+
+def main():
+    """
+    Run the benchmark
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Streaming pipeline benchmark")
+    parser.add_argument("--tokens", type=int, default=2000, help="Tokens per reply")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0,
+                        help="Simulated upstream rate (drives the coalescing window)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens, random.Random(0))
+    interval = 1.0 / args.tokens_per_second
+
+    old_frames = old_pipeline(tokens)
+    new_frames = new_pipeline(tokens, VirtualClock(), interval)
+
+    # Both pipelines must deliver the same text
+    def decode(frames):
+        return "".join(json.loads(f[6:])["chunk"] for f in frames if '"chunk"' in f[:20])
+    assert decode(old_frames) == decode(new_frames) == "".join(tokens)
+
+    old_cpu = measure(lambda: old_pipeline(tokens), args.repeat)
+    new_cpu = measure(lambda: new_pipeline(tokens, VirtualClock(), interval), args.repeat)
+    per_token = 1e6 / (args.tokens * args.repeat)
+
+    for name, cpu, frames in (("before", old_cpu, old_frames), ("after", new_cpu, new_frames)):
+        size = sum(len(f.encode("utf-8")) for f in frames)
+        print(f"{name:<7} cpu/token={cpu * per_token:.3f}us frames={len(frames):<6} bytes={size}")
+    print(f"speedup {old_cpu / new_cpu:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
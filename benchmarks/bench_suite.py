@@ -0,0 +1,457 @@
+"""
+Benchmark Suite: Chatbot and Web Routes against the Fake OpenAI Server
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Measures throughput and latency without paying for API calls. The fake
+OpenAI server runs in this process (with optional latency, token rate and
+error injection) and every scenario runs in a fresh subprocess so its RSS
+is measured in isolation:
+
+- ``get_response``: GPTChatbot.get_response
+- ``stream``: GPTChatbot.get_streaming_response
+- ``async_stream``: AsyncGPTChatbot.get_streaming_response on one event loop
+- ``http_chat``: POST /api/chat on the Flask app (threaded server)
+- ``http_stream``: POST /api/chat/stream
+- ``http_search``: POST /api/search over a pre-filled conversation
+- ``http_export``: GET /api/export/json and /api/export/txt
+
+Each scenario reports requests/s, p50/p95/p99 latency, time to first token
+for streams, errors and peak RSS. Results can be written as JSON and
+compared with an earlier run; the comparison exits with status 1 when a
+metric regressed by more than the threshold.
+
+Usage:
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --scenarios stream http_stream --tokens-per-second 100
+    python benchmarks/bench_suite.py --compare results.json --threshold 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import resource
+import threading
+import subprocess
+import http.client
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+SCENARIOS = ["get_response", "stream", "async_stream", "http_chat", "http_stream", "http_search", "http_export"]
+# Metrics where a higher value is a regression (for rps a lower one is)
+HIGHER_IS_WORSE = ("p50", "p95", "p99", "ttft_p50", "ttft_p95", "ttft_p99", "peak_rss_mb", "error_rate")
+SEARCH_QUERIES = ["reply", "fake server", "benchmarks measure", "sentence", "chatbot model"]
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def free_port() -> int:
+    """Pick a free TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Recorder:
+    """Thread-safe collection of request latencies, TTFTs and errors"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.ttfts: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, latency: Optional[float], ttft: Optional[float] = None):
+        """Record one request (latency None for a failure)"""
+        with self._lock:
+            if latency is None:
+                self.errors += 1
+                return
+            self.latencies.append(latency)
+            if ttft is not None:
+                self.ttfts.append(ttft)
+
+    def summary(self, elapsed: float) -> Dict:
+        """Summarize the recorded requests"""
+        total = len(self.latencies) + self.errors
+        result = {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "elapsed": elapsed,
+            "rps": len(self.latencies) / elapsed if elapsed else 0.0,
+            "p50": percentile(self.latencies, 0.50),
+            "p95": percentile(self.latencies, 0.95),
+            "p99": percentile(self.latencies, 0.99)
+        }
+        if self.ttfts:
+            result.update(ttft_p50=percentile(self.ttfts, 0.50),
+                          ttft_p95=percentile(self.ttfts, 0.95),
+                          ttft_p99=percentile(self.ttfts, 0.99))
+        return result
+
+
+def run_clients(concurrency: int, requests: int, setup: Callable[[], object],
+                request: Callable[[object, int], Optional[float]], recorder: Recorder) -> float:
+    """
+    Run ``requests`` calls spread over ``concurrency`` threads
+
+    Args:
+        concurrency: Client threads
+        requests: Total timed requests
+        setup: Builds a client's state (untimed)
+        request: Sends one request; returns its TTFT (or None) and raises on failure
+        recorder: Where results go
+
+    Returns:
+        Wall-clock seconds of the timed part
+    """
+    states = [setup() for _ in range(concurrency)]
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(state):
+        barrier.wait()
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            started = time.perf_counter()
+            try:
+                ttft = request(state, index)
+            except Exception:
+                recorder.add(None)
+                continue
+            recorder.add(time.perf_counter() - started, ttft)
+
+    threads = [threading.Thread(target=client, args=(state,), daemon=True) for state in states]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def chatbot_scenario(name: str, args: argparse.Namespace) -> Dict:
+    """Benchmark GPTChatbot directly (get_response or stream)"""
+    from chatbot import GPTChatbot
+
+    recorder = Recorder()
+
+    def request(chatbot, index):
+        if index % args.turns == 0:
+            chatbot.clear_history()
+        if name == "get_response":
+            chatbot.get_response(f"Question {index}", max_tokens=args.max_tokens)
+            return None
+        started = time.perf_counter()
+        ttft = None
+        for _ in chatbot.get_streaming_response(f"Question {index}", max_tokens=args.max_tokens):
+            if ttft is None:
+                ttft = time.perf_counter() - started
+        return ttft
+
+    elapsed = run_clients(args.concurrency, args.requests, GPTChatbot, request, recorder)
+    return recorder.summary(elapsed)
+
+
+def async_stream_scenario(args: argparse.Namespace) -> Dict:
+    """Benchmark AsyncGPTChatbot streams as tasks on one event loop"""
+    from async_chatbot import AsyncGPTChatbot
+
+    recorder = Recorder()
+
+    async def client(counter):
+        chatbot = AsyncGPTChatbot()
+        for index in counter:
+            if index % args.turns == 0:
+                chatbot.clear_history()
+            started = time.perf_counter()
+            ttft = None
+            try:
+                async for _ in chatbot.get_streaming_response(f"Question {index}", max_tokens=args.max_tokens):
+                    if ttft is None:
+                        ttft = time.perf_counter() - started
+            except Exception:
+                recorder.add(None)
+                continue
+            recorder.add(time.perf_counter() - started, ttft)
+
+    async def main():
+        counter = iter(range(args.requests))
+        started = time.perf_counter()
+        await asyncio.gather(*(client(counter) for _ in range(args.concurrency)))
+        return time.perf_counter() - started
+
+    return recorder.summary(asyncio.run(main()))
+
+
+class HttpSession:
+    """A browser-like client: one keep-alive connection and a session cookie"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.cookie = None
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def send(self, method: str, path: str, payload: Optional[dict] = None,
+             first_byte: Optional[list] = None) -> bytes:
+        """Send a request and read the whole body; raises on a non-200 status"""
+        headers = {"Content-Type": "application/json"}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        body = json.dumps(payload) if payload is not None else None
+        started = time.perf_counter()
+        try:
+            self.conn.request(method, path, body, headers)
+            response = self.conn.getresponse()
+            if first_byte is not None:
+                data = [response.read1(65536)]
+                first_byte.append(time.perf_counter() - started)
+                data.append(response.read())
+                data = b"".join(data)
+            else:
+                data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+            raise
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";")[0]
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+        return data
+
+
+def http_scenario(name: str, args: argparse.Namespace) -> Dict:
+    """Benchmark a Flask route through a real threaded HTTP server"""
+    from werkzeug.serving import make_server
+    import app as flask_app
+
+    port = free_port()
+    server = make_server("127.0.0.1", port, flask_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    recorder = Recorder()
+    chat = {"temperature": 0.7, "max_tokens": args.max_tokens}
+
+    def setup():
+        session = HttpSession(port)
+        if name in ("http_search", "http_export"):
+            for turn in range(args.history_turns):
+                session.send("POST", "/api/chat", dict(chat, message=f"Tell me about topic {turn}"))
+        return session
+
+    def request(session, index):
+        if name == "http_chat":
+            if index % args.turns == 0:
+                session.send("POST", "/api/clear")
+            session.send("POST", "/api/chat", dict(chat, message=f"Question {index}"))
+        elif name == "http_stream":
+            if index % args.turns == 0:
+                session.send("POST", "/api/clear")
+            first_byte = []
+            data = session.send("POST", "/api/chat/stream", dict(chat, message=f"Question {index}"),
+                                first_byte=first_byte)
+            if b'"error"' in data:
+                raise RuntimeError("stream ended with an error frame")
+            return first_byte[0]
+        elif name == "http_search":
+            session.send("POST", "/api/search", {"query": SEARCH_QUERIES[index % len(SEARCH_QUERIES)]})
+        else:
+            session.send("GET", "/api/export/json" if index % 2 == 0 else "/api/export/txt")
+        return None
+
+    try:
+        elapsed = run_clients(args.concurrency, args.requests, setup, request, recorder)
+    finally:
+        server.shutdown()
+    return recorder.summary(elapsed)
+
+
+def scenario_main(name: str, args: argparse.Namespace):
+    """Entry point of a measurement subprocess; prints one JSON line"""
+    if name in ("get_response", "stream"):
+        result = chatbot_scenario(name, args)
+    elif name == "async_stream":
+        result = async_stream_scenario(args)
+    else:
+        result = http_scenario(name, args)
+    result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the benchmarked tree, if it is a git checkout"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10)
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare two result files
+
+    Args:
+        current: This run's results
+        baseline: Earlier results
+        threshold: Relative change counted as a regression (0.1 = 10%)
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    print()
+    print(f"Compared with {baseline['meta'].get('commit') or 'baseline'} "
+          f"({baseline['meta'].get('timestamp', '?')}):")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        changes = []
+        for metric, value in result.items():
+            before = old.get(metric)
+            if metric not in ("rps",) + HIGHER_IS_WORSE or value is None or not before:
+                continue
+            change = (value - before) / before
+            worse = change > threshold if metric in HIGHER_IS_WORSE else change < -threshold
+            changes.append(f"{metric} {change:+.0%}{' !' if worse else ''}")
+            if worse:
+                regressions.append(f"{name}: {metric} {before:.4g} -> {value:.4g} ({change:+.0%})")
+        print(f"  {name:<13} {', '.join(changes)}")
+    return regressions
+
+
+def format_ms(value: Optional[float]) -> str:
+    """Format seconds as milliseconds"""
+    return "-" if value is None else f"{value * 1000:.1f}"
+
+
+def main():
+    """
+    Run the benchmark suite
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Chatbot benchmark suite (fake OpenAI server)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-tokens", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=5, help="Turns per conversation before it is cleared")
+    parser.add_argument("--history-turns", type=int, default=20, help="Turns filled in before search/export")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server delay per request (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Fake server streaming rate")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests that fail")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--stream-abort-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare with an earlier results file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold for --compare")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        scenario_main(args.scenario, args)
+        return
+
+    from fake_openai_server import FakeOpenAIServer
+
+    fake = FakeOpenAIServer(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                            error_rate=args.error_rate, error_status=args.error_status,
+                            stream_abort_rate=args.stream_abort_rate, seed=0).start()
+    env = dict(os.environ,
+               OPENAI_API_KEY="sk-fake",
+               OPENAI_BASE_URL=fake.base_url,
+               SAVE_CONVERSATIONS="false",
+               RATE_LIMIT_ENABLED="false",
+               RESPONSE_CACHE_ENABLED="false",
+               SINGLEFLIGHT_ENABLED="false",
+               SEMANTIC_CACHE_ENABLED="false")
+    passthrough = ["--requests", str(args.requests), "--concurrency", str(args.concurrency),
+                   "--max-tokens", str(args.max_tokens), "--turns", str(args.turns),
+                   "--history-turns", str(args.history_turns)]
+
+    results = {}
+    print(f"{'scenario':<13} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'ttft p50':>9} {'ttft p99':>9} {'errors':>7} {'rss MiB':>8}")
+    try:
+        for name in args.scenarios:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", name] + passthrough,
+                                    env=env, cwd=ROOT, capture_output=True, text=True)
+            if output.returncode != 0:
+                print(f"{name} failed:\n{output.stderr[-2000:]}")
+                continue
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            results[name] = result
+            print(f"{name:<13} {result['rps']:>8.1f} {format_ms(result['p50']):>8} {format_ms(result['p95']):>8} "
+                  f"{format_ms(result['p99']):>8} {format_ms(result.get('ttft_p50')):>9} "
+                  f"{format_ms(result.get('ttft_p99')):>9} {result['errors']:>7} {result['peak_rss_mb']:>8.1f}")
+    finally:
+        fake.stop()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {key: value for key, value in vars(args).items()
+                         if key not in ("output", "compare", "threshold", "scenario")}
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("settings") != report["meta"]["settings"]:
+            print("\nWarning: the baseline was run with different settings")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+"""
+Fake OpenAI Server for Benchmarks
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Local stand-in for the OpenAI chat completions endpoint so the chatbot can be
+benchmarked without paying for real API calls. Supports streaming and
+non-streaming completions, configurable latency and token rate, and counts
+accepted TCP connections so connection reuse can be measured. Also implements
+the files and batches endpoints used by offline Batch API jobs: a batch is
+processed in a background thread after ``batch_latency`` seconds, and
+requests with a negative ``max_tokens`` land in the error file.
+
+Errors can be injected to exercise retries and partial streams: a fraction
+``error_rate`` of chat requests is answered with ``error_status`` (429s
+carry a Retry-After header), and a fraction ``stream_abort_rate`` of
+streams is cut off halfway through the reply.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8900 --latency 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=sk-fake python app.py
+"""
+
+import json
+import time
+import random
+import socket
+import uuid
+import argparse
+import threading
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+DEFAULT_REPLY = (
+    "This is a reply from the fake OpenAI server created by RSK World. "
+    "It streams a fixed sentence so benchmarks measure the chatbot, not the model."
+)
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """
+    Request handler implementing the chat completions endpoint
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        """Simulate connection setup cost (e.g. a TLS handshake) once per connection"""
+        super().setup()
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+
+    def do_POST(self):
+        """Route POST requests"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        self.server.record_request()
+        path = self.path.rstrip("/")
+
+        if path.endswith("/chat/completions"):
+            self._chat_completions(json.loads(raw or b"{}"))
+        elif path.endswith("/files"):
+            self._upload_file(raw)
+        elif path.endswith("/batches"):
+            self._create_batch(json.loads(raw or b"{}"))
+        elif "/batches/" in path and path.endswith("/cancel"):
+            self._send_batch(path.split("/")[-2], cancel=True)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_GET(self):
+        """Route GET requests"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.server.record_request()
+        path = self.path.split("?")[0].rstrip("/")
+        parts = path.split("/")
+        if "/files/" in path and path.endswith("/content"):
+            self._send_file_content(parts[-2])
+        elif "/files/" in path:
+            stored = self.server.files.get(parts[-1])
+            if stored is None:
+                self._send_json(404, {"error": {"message": "No such file"}})
+            else:
+                self._send_json(200, stored["object"])
+        elif "/batches/" in path:
+            self._send_batch(parts[-1])
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def _chat_completions(self, body: dict):
+        """Serve a streaming or non-streaming chat completion"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.roll(server.error_rate):
+            self._send_error(server.error_status)
+            return
+
+        if not body.get("stream"):
+            self._send_json(200, server.completion(body))
+            return
+
+        model = body.get("model", "gpt-3.5-turbo")
+        tokens = server.reply_tokens(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        delay = 1.0 / server.tokens_per_second if server.tokens_per_second else 0
+        abort_at = len(tokens) // 2 if server.roll(server.stream_abort_rate) else None
+        sent = 0
+        try:
+            for token in tokens:
+                if sent == abort_at:
+                    # Drop the connection without the final chunk or [DONE]
+                    server.record_stream(sent, aborted=True)
+                    self.close_connection = True
+                    return
+                if delay:
+                    time.sleep(delay)
+                sent += 1
+                self._write_event({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                })
+            self._write_event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            })
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage = server.completion(body)["usage"]
+                self._write_event({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage
+                })
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+            server.record_stream(sent, aborted=False)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up mid-stream
+            server.record_stream(sent, aborted=True)
+            self.close_connection = True
+
+    def _upload_file(self, raw: bytes):
+        """Store a multipart file upload"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            b"Content-Type: " + self.headers.get("Content-Type", "").encode("latin-1") + b"\r\n\r\n" + raw
+        )
+        fields, filename, content = {}, "upload.jsonl", b""
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename():
+                filename, content = part.get_filename(), part.get_payload(decode=True)
+            else:
+                fields[name] = part.get_content().strip()
+        stored = self.server.store_file(content, filename, fields.get("purpose", "batch"))
+        self._send_json(200, stored)
+
+    def _send_file_content(self, file_id: str):
+        """Send a stored file's bytes"""
+        stored = self.server.files.get(file_id)
+        if stored is None:
+            self._send_json(404, {"error": {"message": "No such file"}})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(stored["content"])))
+        self.end_headers()
+        self.wfile.write(stored["content"])
+
+    def _create_batch(self, body: dict):
+        """Create a batch and start processing it"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if body.get("input_file_id") not in self.server.files:
+            self._send_json(400, {"error": {"message": "Unknown input_file_id"}})
+            return
+        self._send_json(200, self.server.create_batch(body))
+
+    def _send_batch(self, batch_id: str, cancel: bool = False):
+        """Send (and optionally cancel) a batch"""
+        batch = self.server.batches.get(batch_id)
+        if batch is None:
+            self._send_json(404, {"error": {"message": "No such batch"}})
+            return
+        if cancel and batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+            batch["status"] = "cancelled"
+            batch["cancelled_at"] = int(time.time())
+        self._send_json(200, batch)
+
+    def _write_event(self, payload: dict):
+        """Write one SSE event as an HTTP chunk"""
+        self._write_chunk(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+
+    def _write_chunk(self, data: bytes):
+        """Write an HTTP/1.1 chunked-encoding frame"""
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_error(self, status: int):
+        """Send an injected API error"""
+        kind = {429: "rate_limit_exceeded", 400: "invalid_request_error"}.get(status, "server_error")
+        data = json.dumps({"error": {"message": f"Injected error {status}", "type": kind}}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload: dict):
+        """Send a JSON response with a Content-Length so the connection stays alive"""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """
+    Threaded fake OpenAI server with connection and request counters
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024  # Load tests open many connections at once
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 tokens_per_second: Optional[float] = None, reply: str = DEFAULT_REPLY,
+                 connect_latency: float = 0.0, batch_latency: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500, stream_abort_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Initialize the fake server
+
+        Args:
+            host: Bind address
+            port: Bind port (0 picks a free port)
+            latency: Seconds to wait before answering each request
+            tokens_per_second: Streaming token rate (None for as fast as possible)
+            reply: Reply text, split on spaces into tokens
+            connect_latency: Seconds added once per new connection (simulated handshake)
+            batch_latency: Seconds a batch stays in progress before it completes
+            error_rate: Fraction of chat requests answered with ``error_status``
+            error_status: HTTP status of injected errors (e.g. 429, 500, 503)
+            stream_abort_rate: Fraction of streams dropped halfway through
+            seed: Seed for the error injection (None for a random one)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__((host, port), FakeOpenAIHandler)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.connect_latency = connect_latency
+        self.batch_latency = batch_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_abort_rate = stream_abort_rate
+        self._random = random.Random(seed)
+        self.errors_injected = 0
+        self.files = {}
+        self.batches = {}
+        self.connections = 0
+        self.requests = 0
+        self.tokens_streamed = 0
+        self.streams_aborted = 0
+        self._counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def roll(self, rate: float) -> bool:
+        """Decide whether to inject a failure with probability ``rate``"""
+        if not rate:
+            return False
+        with self._counter_lock:
+            hit = self._random.random() < rate
+            self.errors_injected += hit
+        return hit
+
+    def reply_tokens(self, body: dict) -> list:
+        """Tokens of the canned reply, cut to the request's max_tokens"""
+        words = self.reply.split(" ")
+        max_tokens = body.get("max_tokens") or len(words)
+        return [w + " " for w in words[:max_tokens]]
+
+    def completion(self, body: dict) -> dict:
+        """Build a non-streaming chat completion for a request body"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        tokens = self.reply_tokens(body)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens)
+            }
+        }
+
+    def store_file(self, content: bytes, filename: str, purpose: str) -> dict:
+        """Store a file and return its file object"""
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        obj = {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+               "filename": filename, "purpose": purpose, "status": "processed"}
+        self.files[file_id] = {"object": obj, "content": content}
+        return obj
+
+    def create_batch(self, params: dict) -> dict:
+        """Register a batch and process it in the background"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": params.get("endpoint"),
+            "input_file_id": params["input_file_id"],
+            "completion_window": params.get("completion_window", "24h"),
+            "status": "validating",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "metadata": params.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}
+        }
+        self.batches[batch["id"]] = batch
+        threading.Thread(target=self._process_batch, args=(batch,), daemon=True).start()
+        return batch
+
+    def _process_batch(self, batch: dict):
+        """Answer every line of a batch's input file"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        lines = self.files[batch["input_file_id"]]["content"].splitlines()
+        batch["request_counts"]["total"] = len(lines)
+        batch["status"] = "in_progress"
+        batch["in_progress_at"] = int(time.time())
+        if self.batch_latency:
+            time.sleep(self.batch_latency)
+        if batch["status"] == "cancelled":
+            return
+
+        output, errors = [], []
+        for line in lines:
+            request = json.loads(line)
+            body = request["body"]
+            if (body.get("max_tokens") or 0) < 0:
+                response = {"status_code": 400, "request_id": uuid.uuid4().hex,
+                            "body": {"error": {"message": "max_tokens must be positive", "type": "invalid_request_error"}}}
+                errors.append({"id": f"batch_req_{uuid.uuid4().hex[:16]}", "custom_id": request["custom_id"],
+                               "response": response, "error": None})
+                batch["request_counts"]["failed"] += 1
+            else:
+                response = {"status_code": 200, "request_id": uuid.uuid4().hex, "body": self.completion(body)}
+                output.append({"id": f"batch_req_{uuid.uuid4().hex[:16]}", "custom_id": request["custom_id"],
+                               "response": response, "error": None})
+                batch["request_counts"]["completed"] += 1
+
+        # Like the real service, results are not in input order
+        output.reverse()
+        for key, records in (("output_file_id", output), ("error_file_id", errors)):
+            if records:
+                content = "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+                batch[key] = self.store_file(content, f"{batch['id']}_{key}.jsonl", "batch_output")["id"]
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the OpenAI client"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def get_request(self):
+        """Accept a connection and count it"""
+        conn = super().get_request()
+        # Avoid Nagle/delayed-ACK stalls on reused keep-alive connections
+        conn[0].setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._counter_lock:
+            self.connections += 1
+        return conn
+
+    def record_request(self):
+        """Count one HTTP request"""
+        with self._counter_lock:
+            self.requests += 1
+
+    def record_stream(self, tokens: int, aborted: bool):
+        """Count tokens written by one streaming response"""
+        with self._counter_lock:
+            self.tokens_streamed += tokens
+            self.streams_aborted += aborted
+
+    def reset_counters(self):
+        """Reset connection, request and stream counters"""
+        with self._counter_lock:
+            self.connections = 0
+            self.requests = 0
+            self.tokens_streamed = 0
+            self.streams_aborted = 0
+            self.errors_injected = 0
+
+    def start(self) -> "FakeOpenAIServer":
+        """Serve in a background thread"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """
+    Run the fake server from the command line
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Streaming token rate")
+    parser.add_argument("--connect-latency", type=float, default=0.0, help="Seconds per new connection")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of chat requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected errors")
+    parser.add_argument("--stream-abort-rate", type=float, default=0.0, help="Fraction of streams cut off halfway")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for error injection")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, args.latency, args.tokens_per_second,
+                              connect_latency=args.connect_latency, error_rate=args.error_rate,
+                              error_status=args.error_status, stream_abort_rate=args.stream_abort_rate,
+                              seed=args.seed)
+    print(f"Fake OpenAI server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Fake Redis Server for Benchmarks
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Local stand-in for a Redis server so the shared session backend
+(SESSION_BACKEND=redis) can be exercised without installing one. Speaks
+RESP2 and implements the commands the backend uses: hashes, lists, key
+expiry and WATCH/MULTI/EXEC transactions.
+Commands run one at a time under a lock, like Redis's single thread.
+
+Usage:
+    python benchmarks/fake_redis_server.py --port 6390
+    SESSION_BACKEND=redis SESSION_REDIS_URL=redis://127.0.0.1:6390/0 python app.py
+"""
+
+import time
+import argparse
+import threading
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+
+class FakeRedisHandler(StreamRequestHandler):
+    """
+    One client connection; keeps its own WATCH and MULTI state
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def handle(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.watched = {}
+        self.queued = None
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.wfile.write(self._encode(self.server.dispatch(self, command)))
+
+    def _read_command(self):
+        """Read one command (an array of bulk strings)"""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command, e.g. from telnet
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _encode(self, reply) -> bytes:
+        """Encode a reply"""
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, Exception):
+            return b"-ERR %s\r\n" % str(reply).encode("utf-8")
+        if isinstance(reply, bool):
+            return b":%d\r\n" % reply
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, str):
+            return b"+%s\r\n" % reply.encode("utf-8")
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        if isinstance(reply, NullArray):
+            return b"*-1\r\n"
+        return b"*%d\r\n" % len(reply) + b"".join(self._encode(item) for item in reply)
+
+
+class NullArray:
+    """Null multi-bulk reply (EXEC after a WATCHed key changed)"""
+
+
+class FakeRedisServer(ThreadingTCPServer):
+    """
+    Threaded fake Redis server holding its data in memory
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the fake server
+
+        Args:
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__((host, port), FakeRedisHandler)
+        self.data = {}
+        self.expires = {}
+        self.revisions = {}  # key -> write count, for WATCH
+        self.commands = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """redis:// URL of the server"""
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def _live(self, key: bytes):
+        """Value of a key, dropping it if it expired"""
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+            self._touch(key)
+        return self.data.get(key)
+
+    def _touch(self, key: bytes):
+        """Record a write to a key"""
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+
+    def dispatch(self, client: FakeRedisHandler, args: list):
+        """Run one command for a client, queueing it inside MULTI"""
+        name = args[0].decode("ascii").upper()
+        with self._lock:
+            self.commands += 1
+            if client.queued is not None and name not in ("EXEC", "DISCARD", "MULTI", "WATCH"):
+                client.queued.append(args)
+                return "QUEUED"
+            if name == "MULTI":
+                client.queued = []
+                return "OK"
+            if name == "DISCARD":
+                client.queued = None
+                client.watched = {}
+                return "OK"
+            if name == "EXEC":
+                queued, client.queued = client.queued or [], None
+                watched, client.watched = client.watched, {}
+                if any(self.revisions.get(key, 0) != revision for key, revision in watched.items()):
+                    return NullArray()
+                return [self._run(client, command) for command in queued]
+            return self._run(client, args)
+
+    def _run(self, client: FakeRedisHandler, args: list):
+        """Execute one command (lock held)"""
+        name = args[0].decode("ascii").upper()
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return Exception(f"unknown command '{name}'")
+        try:
+            return handler(client, *args[1:])
+        except (TypeError, ValueError) as e:
+            return Exception(f"wrong arguments for '{name}': {e}")
+
+    def cmd_ping(self, client, *args):
+        return args[0] if args else "PONG"
+
+    def cmd_select(self, client, db):
+        return "OK"
+
+    def cmd_auth(self, client, *args):
+        return "OK"
+
+    def cmd_watch(self, client, *keys):
+        for key in keys:
+            self._live(key)
+            client.watched[key] = self.revisions.get(key, 0)
+        return "OK"
+
+    def cmd_unwatch(self, client):
+        client.watched = {}
+        return "OK"
+
+    def cmd_del(self, client, *keys):
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                self._touch(key)
+                removed += 1
+        return removed
+
+    def cmd_expire(self, client, key, seconds):
+        if self._live(key) is None:
+            return 0
+        self.expires[key] = time.monotonic() + int(seconds)
+        return 1
+
+    def cmd_ttl(self, client, key):
+        if self._live(key) is None:
+            return -2
+        deadline = self.expires.get(key)
+        return -1 if deadline is None else int(deadline - time.monotonic())
+
+    def _hash(self, key: bytes, create: bool = False):
+        value = self._live(key)
+        if value is None and create:
+            value = self.data[key] = {}
+        return value
+
+    def cmd_hget(self, client, key, field):
+        return (self._hash(key) or {}).get(field)
+
+    def cmd_hmget(self, client, key, *fields):
+        value = self._hash(key) or {}
+        return [value.get(field) for field in fields]
+
+    def cmd_hset(self, client, key, *pairs):
+        value = self._hash(key, create=True)
+        added = 0
+        for field, item in zip(pairs[::2], pairs[1::2]):
+            added += field not in value
+            value[field] = item
+        self._touch(key)
+        return added
+
+    def cmd_hincrby(self, client, key, field, amount):
+        value = self._hash(key, create=True)
+        number = int(value.get(field, b"0")) + int(amount)
+        value[field] = str(number).encode("ascii")
+        self._touch(key)
+        return number
+
+    def _list(self, key: bytes, create: bool = False):
+        value = self._live(key)
+        if value is None and create:
+            value = self.data[key] = []
+        return value
+
+    def cmd_rpush(self, client, key, *items):
+        value = self._list(key, create=True)
+        value.extend(items)
+        self._touch(key)
+        return len(value)
+
+    def cmd_rpop(self, client, key):
+        value = self._list(key)
+        if not value:
+            return None
+        item = value.pop()
+        if not value:
+            del self.data[key]
+        self._touch(key)
+        return item
+
+    def cmd_llen(self, client, key):
+        return len(self._list(key) or [])
+
+    def cmd_lrange(self, client, key, start, stop):
+        value = self._list(key) or []
+        start, stop = int(start), int(stop)
+        size = len(value)
+        start = max(0, start + size if start < 0 else start)
+        stop = stop + size if stop < 0 else stop
+        return value[start:stop + 1]
+
+    def start(self) -> "FakeRedisServer":
+        """Serve in a background thread"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """
+    Run the fake server from the command line
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    parser = argparse.ArgumentParser(description="Fake Redis server for the shared session backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server = FakeRedisServer(args.host, args.port)
+    print(f"Fake Redis server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
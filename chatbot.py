@@ -17,8 +17,40 @@ import os
 import json
 import time
 from typing import List, Dict, Optional, Generator, Callable
-from openai import OpenAI
 from datetime import datetime
+from batch import BatchJob
+from batch_api import OfflineBatch
+from client_pool import get_openai_client
+from config import Config
+from context_window import ContextBuilder, count_message_tokens, count_tokens
+from exceptions import BudgetExceeded, ChatbotError, SessionConflict
+from history import ConversationHistory
+from metrics import get_metrics
+from pricing import budgets_enabled, check_budget, compute_cost, get_cost_ledger, key_id
+from prompt_builder import PromptBuilder, post_chat_completion
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache, make_cache_key, replay_chunks
+from retry_policy import RetryPolicy, is_upstream_error, to_upstream_error
+from conversation_log import ConversationLog, read_conversation, write_conversation
+from search_index import InvertedIndex, Query, build_hit, clamp_page, paginate
+from semantic_cache import get_semantic_cache, make_namespace
+from singleflight import get_single_flight
+from stream_relay import ChunkRelay, StreamMeter, record_cancelled_stream
+from tracing import KIND_CLIENT, current_span, span, use_span
+
+# Rough per-object overhead used for memory accounting
+# Author: RSK World (https://rskworld.in) - Year: 2026
+CHATBOT_OVERHEAD_BYTES = 4096  # instance, client reference, stats dicts
+
+
+def _round(seconds: Optional[float]) -> Optional[float]:
+    """Round a duration for the stats output"""
+    return round(seconds, 4) if seconds is not None else None
+
+
+def _mean(total: float, count: int) -> Optional[float]:
+    """Mean duration, or None when nothing was measured"""
+    return round(total / count, 4) if count else None
 
 
 class GPTChatbot:
@@ -32,24 +64,38 @@ class GPTChatbot:
     Year: 2026
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo",
+                 base_url: Optional[str] = None):
         """
         Initialize the GPT Chatbot
         
         Args:
             api_key: OpenAI API key (if not provided, will use OPENAI_API_KEY env variable)
             model: Model to use (gpt-3.5-turbo, gpt-4, etc.)
+            base_url: Optional API base URL (if not provided, will use OPENAI_BASE_URL env variable)
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        # Shared per (api_key, base_url) so sessions reuse one connection pool
+        self.client = self._create_client()
         self.model = model
-        self.conversation_history: List[Dict[str, str]] = []
+        # Compact storage; reads like a list of message dicts (see history.py)
+        self.history = ConversationHistory()
         self.system_prompt = "You are a helpful and friendly AI assistant."
         
+        # Context window - token counts are cached per message so history is never re-tokenized
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.context_builder = ContextBuilder()
+        self.pinned_messages = set()
+        # Serialized prompt kept between calls so only new turns are encoded
+        self.prompt_builder = PromptBuilder() if Config.PROMPT_BUILDER_ENABLED else None
+        self._prompt_json: Optional[bytes] = None
+        self._system_tokens = count_message_tokens("system", self.system_prompt, self.model)
+        
         # Advanced features - Author: RSK World (https://rskworld.in) - Year: 2026
         self.token_usage = {
             "prompt_tokens": 0,
@@ -59,11 +105,88 @@ class GPTChatbot:
         self.conversation_stats = {
             "total_messages": 0,
             "total_requests": 0,
+            "total_retries": 0,
+            "total_errors": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "semantic_cache_hits": 0,
+            "semantic_cache_misses": 0,
+            "coalesced_requests": 0,
+            "cancelled_streams": 0,
+            "tokens_saved": 0,
             "total_cost": 0.0,
             "start_time": datetime.now().isoformat()
         }
-        self.max_retries = 3
-        self.retry_delay = 1
+        self.stream_stats = self._empty_stream_stats()
+        self.retry_policy = RetryPolicy()
+        # Shared by every session in the process so bursts stay under RPM/TPM limits
+        self.rate_limiter = get_rate_limiter()
+        self._estimated_tokens = 0
+        # Opt-in cache for deterministic requests, shared by every session
+        self.response_cache = get_response_cache()
+        self._cache_key: Optional[str] = None
+        self.semantic_cache = get_semantic_cache()
+        self._semantic_query: Optional[list] = None
+        # Identical deterministic requests in flight share one upstream call
+        self.single_flight = get_single_flight()
+        self._flight_key: Optional[str] = None
+        # Process-wide metrics, labelled by model and persona (see /metrics)
+        self.metrics = get_metrics()
+        self.persona = "default"
+        self._attempt_started = 0.0
+        # Spend is priced per request and added up per session, API key and process
+        self.cost_ledger = get_cost_ledger()
+        self._key_id = key_id(self.api_key)
+        # Session spend for budgets; unlike conversation_stats it survives reset_stats
+        self.session_cost = 0.0
+        # Model the current request is sent with (self.model unless a soft budget downgraded it)
+        self._request_model = self.model
+        # Built on the first search, then kept up to date as messages are added
+        self._search_index: Optional[InvertedIndex] = None
+        # Append-only log every history change is written to (see attach_log)
+        self.log: Optional[ConversationLog] = None
+        # Leading turns still only in the log (restored lazily; see _ensure_history)
+        self._history_offset = 0
+    
+    @property
+    def conversation_history(self) -> ConversationHistory:
+        """Conversation messages (indexable and iterable as message dicts)"""
+        self._ensure_history()
+        return self.history
+    
+    @conversation_history.setter
+    def conversation_history(self, messages: List[Dict]):
+        self._set_history(messages)
+        if self.log is not None:
+            self._write_log(lambda: self.log.replace(self.history.to_list(timestamps=True)))
+    
+    @property
+    def max_retries(self) -> int:
+        """Total attempts per request (kept for backward compatibility)"""
+        return self.retry_policy.max_attempts
+    
+    @max_retries.setter
+    def max_retries(self, value: int):
+        self.retry_policy.max_attempts = value
+    
+    @property
+    def retry_delay(self) -> float:
+        """Backoff base in seconds (kept for backward compatibility)"""
+        return self.retry_policy.base_delay
+    
+    @retry_delay.setter
+    def retry_delay(self, value: float):
+        self.retry_policy.base_delay = value
+    
+    def _create_client(self):
+        """
+        Get the shared API client for this chatbot's credentials
+        
+        Returns:
+            OpenAI client
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return get_openai_client(self.api_key, self.base_url)
     
     def set_system_prompt(self, prompt: str):
         """
@@ -74,22 +197,111 @@ class GPTChatbot:
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
         self.system_prompt = prompt
+        self._system_tokens = count_message_tokens("system", prompt, self.model)
+        self._invalidate_prompt()
+        # Shared backends keep the prompt with the session so every worker uses it
+        meta = getattr(self.log, "meta", None)
+        if meta is not None and meta.get("system_prompt") != prompt:
+            self._write_log(lambda: self.log.set_meta(dict(meta, system_prompt=prompt)))
     
-    def add_message(self, role: str, content: str):
+    def add_message(self, role: str, content: str, truncated: bool = False):
         """
         Add a message to conversation history
         
         Args:
             role: Message role (user, assistant, system)
             content: Message content
+            truncated: Mark a reply that was cut short (e.g. the client disconnected)
+            
+        Raises:
+            SessionConflict: If another request changed the shared conversation first
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        self.conversation_history.append({"role": role, "content": content})
+        self.history.append(role, content, count_message_tokens(role, content, self.model),
+                            truncated=truncated)
+        if self._search_index is not None:
+            self._search_index.add(len(self.history) - 1, content or "")
+        if self.log is not None:
+            self._write_log(lambda: self.log.append(self.history.message(-1, timestamp=True)))
     
     def clear_history(self):
         """Clear conversation history"""
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        self.conversation_history = []
+        self.history = ConversationHistory()
+        self._history_offset = 0
+        self.pinned_messages = set()
+        self._search_index = None
+        self._invalidate_prompt()
+        if self.log is not None:
+            self._write_log(self.log.clear)
+    
+    def pin_message(self, index: int):
+        """
+        Pin a message so it is always sent, however the context is trimmed
+        
+        Args:
+            index: Index of the message in conversation history
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._ensure_history()
+        if not 0 <= index < len(self.history):
+            raise IndexError(f"No message at index {index}")
+        self.pinned_messages.add(index)
+    
+    def unpin_message(self, index: int):
+        """
+        Unpin a previously pinned message
+        
+        Args:
+            index: Index of the message in conversation history
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.pinned_messages.discard(index)
+    
+    def _build_messages(self, max_tokens: int) -> List[Dict[str, str]]:
+        """
+        Build the messages list for an API call within the model's token budget
+        
+        Args:
+            max_tokens: Tokens reserved for the completion
+            
+        Returns:
+            Messages list starting with the system prompt
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.context_builder.build(
+            self.system_prompt,
+            self._system_tokens,
+            self.history,
+            self.history.token_counts,
+            self.model,
+            max_tokens,
+            self.pinned_messages
+        )
+    
+    def _invalidate_prompt(self):
+        """
+        Drop the cached serialized prompt after history changed other than by appending
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.prompt_builder is not None:
+            self.prompt_builder.invalidate()
+    
+    def memory_footprint(self) -> int:
+        """
+        Estimate the memory held by this chatbot instance
+        
+        The estimate is maintained incrementally as messages are added, so
+        calling this is O(1) regardless of conversation length.
+        
+        Returns:
+            Estimated size in bytes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        index_bytes = self._search_index.memory_footprint() if self._search_index is not None else 0
+        prompt_bytes = self.prompt_builder.memory_footprint() if self.prompt_builder is not None else 0
+        return (CHATBOT_OVERHEAD_BYTES + len(self.system_prompt) + self.history.memory_footprint()
+                + index_bytes + prompt_bytes)
     
     def get_response(self, user_message: str, temperature: float = 0.7, max_tokens: int = 500, 
                      stream: bool = False, functions: Optional[List] = None) -> str:
@@ -105,64 +317,343 @@ class GPTChatbot:
             
         Returns:
             Assistant's response
+            
+        Raises:
+            UpstreamError: If the API call fails and will not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with span("chat.get_response", {"gen_ai.request.model": self.model, "chat.persona": self.persona,
+                                        "chat.stream": stream}) as request_span:
+            with span("chat.prepare"):
+                api_params = self._prepare_request(user_message, temperature, max_tokens, functions)
+            
+            with span("chat.cache_lookup") as lookup:
+                cached = self._get_cached_response()
+                lookup.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                if stream:
+                    print(cached)
+                return self._record_cached_response(cached)
+            
+            try:
+                if stream:
+                    return self._get_streaming_response(api_params)
+                
+                # Call OpenAI API (retried with jittered backoff by the retry policy)
+                response, shared = self._create_shared_completion(api_params)
+            except ChatbotError as e:
+                self._abandon_request(e)
+                raise
+            
+            request_span.set_attribute("chat.shared", shared)
+            with span("chat.record"):
+                if shared:
+                    return self._record_shared_response(response)
+                return self._record_response(response)
+    
+    def _create_completion(self, api_params: dict):
+        """
+        Call the chat completions endpoint through the retry policy
+        
+        Args:
+            api_params: API parameters dictionary
+            
+        Returns:
+            Chat completion, or a stream of chunks when api_params has stream=True
+            
+        Raises:
+            UpstreamError: If the call fails and will not be retried
+            RateLimitExceeded: If the rate limiter sheds the call
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def attempt():
+            # Every attempt, retries included, counts against the shared limits
+            if self.rate_limiter:
+                with span("chat.rate_limit"):
+                    self.rate_limiter.acquire(self._request_model, self._estimated_tokens)
+            # Latency is measured from the attempt that succeeds, after any queueing
+            self._attempt_started = time.perf_counter()
+            with span("chat.upstream", self._upstream_attributes(api_params), kind=KIND_CLIENT):
+                if self._prompt_json is not None:
+                    return post_chat_completion(self.client, api_params, self._prompt_json)
+                return self.client.chat.completions.create(**api_params)
+        
+        return self.retry_policy.call(attempt, on_retry=self._on_retry)
+    
+    def _upstream_attributes(self, api_params: dict) -> dict:
+        """
+        Span attributes of an upstream call (OpenTelemetry GenAI conventions)
+        
+        Args:
+            api_params: API parameters dictionary
+            
+        Returns:
+            Attributes for the chat.upstream span
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return {
+            "gen_ai.system": "openai",
+            "gen_ai.operation.name": "chat",
+            "gen_ai.request.model": self._request_model,
+            "gen_ai.request.max_tokens": api_params.get("max_tokens", 0),
+            "chat.stream": bool(api_params.get("stream"))
+        }
+    
+    def _create_shared_completion(self, api_params: dict):
+        """
+        Call the chat completions endpoint, sharing the call with identical requests in flight
+        
+        Args:
+            api_params: API parameters dictionary
+            
+        Returns:
+            (chat completion, shared) where shared is True if another session's call was reused
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self._flight_key is None:
+            return self._create_completion(api_params), False
+        return self.single_flight.do(self._flight_key, lambda: self._create_completion(api_params))
+    
+    def _on_retry(self, attempt: int, delay: float, error: BaseException):
+        """
+        Record a retry
+        
+        Args:
+            attempt: Number of the retry about to be made
+            delay: Seconds until the retry
+            error: Error that triggered the retry
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.conversation_stats["total_retries"] += 1
+        if self.metrics:
+            self.metrics.retries.inc(self._request_model, self.persona)
+        print(f"Retry attempt {attempt}/{self.max_retries - 1} after {delay:.2f}s: {error}")
+    
+    def _abandon_request(self, error: Optional[BaseException] = None):
+        """
+        Roll back a failed request so history does not keep an unanswered user turn
+        
+        Args:
+            error: The error that failed the request
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.conversation_stats["total_errors"] += 1
+        if self.metrics:
+            error_class = type(error).__name__ if error is not None else "unknown"
+            if getattr(error, "status_code", None):
+                error_class += f":{error.status_code}"
+            self.metrics.errors.inc(self._request_model, self.persona, error_class)
+            self.metrics.requests.inc(self._request_model, self.persona, "error")
+        self._discard_user_turn()
+    
+    def _discard_user_turn(self):
+        """
+        Remove a trailing user message that never got a reply
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.history and self.history.role(-1) == 'user':
+            msg = self.history.pop()
+            self.pinned_messages.discard(len(self.history))
+            self._invalidate_prompt()
+            if self._search_index is not None:
+                self._search_index.remove(len(self.history), msg['content'] or "")
+            if self.log is not None:
+                try:
+                    self._write_log(self.log.pop)
+                except SessionConflict:
+                    pass  # Reloaded from the log; the error being handled is the one to report
+    
+    def _prepare_request(self, user_message: str, temperature: float, max_tokens: int,
+                         functions: Optional[List] = None) -> dict:
+        """
+        Add the user's message to history and build the API parameters
+        
+        Args:
+            user_message: User's message
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            functions: Optional list of function definitions for function calling
+            
+        Returns:
+            API parameters dictionary (without "messages" when the prompt builder
+            serialized them; see _prompt_json)
+            
+        Raises:
+            BudgetExceeded: If the request would cross a hard budget (nothing is sent)
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
         # Add user message to history
         self.add_message("user", user_message)
         
-        # Prepare messages for API call
-        messages = [{"role": "system", "content": self.system_prompt}]
-        messages.extend(self.conversation_history)
-        
         # Prepare API parameters
         api_params = {
             "model": self.model,
-            "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
         
+        # keep_first pins the conversation's opening turns, which a lazy restore skipped
+        if self.context_builder.strategy == "keep_first":
+            self._ensure_history()
+        
+        # Prepare messages for API call (trimmed to the model's token budget)
+        self._prompt_json = None
+        with span("chat.encode") as encode:
+            if self.prompt_builder is not None:
+                # Sent as pre-serialized JSON; only turns new since the last call are encoded
+                indices = self.context_builder.select_messages(
+                    self._system_tokens, self.history.token_counts, self.model, max_tokens,
+                    self.pinned_messages
+                )
+                self._prompt_json = self.prompt_builder.messages_json(self.system_prompt, self.history, indices)
+            else:
+                api_params["messages"] = self._build_messages(max_tokens)
+            encode.set_attribute("chat.prompt_tokens", self.context_builder.last_prompt_tokens)
+        
         if functions:
             api_params["functions"] = functions
             api_params["function_call"] = "auto"
         
-        # Retry logic with exponential backoff
-        # Author: RSK World (https://rskworld.in) - Year: 2026
-        for attempt in range(self.max_retries):
+        # Reserved against the TPM limit until the real usage is known
+        self._estimated_tokens = self.context_builder.last_prompt_tokens + max_tokens
+        
+        # Budgets are checked before anything is sent: downgrade past soft, refuse past hard
+        self._request_model = self.model
+        if budgets_enabled():
             try:
-                if stream:
-                    return self._get_streaming_response(api_params)
-                
-                # Call OpenAI API
-                response = self.client.chat.completions.create(**api_params)
-                
-                # Extract assistant response
-                assistant_message = response.choices[0].message.content
-                
-                # Track token usage
-                if response.usage:
-                    self.token_usage["prompt_tokens"] += response.usage.prompt_tokens
-                    self.token_usage["completion_tokens"] += response.usage.completion_tokens
-                    self.token_usage["total_tokens"] += response.usage.total_tokens
-                
-                # Update statistics
-                self.conversation_stats["total_requests"] += 1
-                self.conversation_stats["total_messages"] += 2  # user + assistant
-                
-                # Add assistant response to history
-                self.add_message("assistant", assistant_message)
-                
-                return assistant_message
-                
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    wait_time = self.retry_delay * (2 ** attempt)
-                    print(f"Retry attempt {attempt + 1}/{self.max_retries} after {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    error_msg = f"Error getting response after {self.max_retries} attempts: {str(e)}"
-                    print(error_msg)
-                    return error_msg
+                self._request_model = check_budget(
+                    self.model, self.context_builder.last_prompt_tokens, max_tokens,
+                    self.session_cost, self.cost_ledger.window_spend(self._key_id)
+                )
+            except BudgetExceeded as e:
+                self._abandon_request(e)
+                raise
+            api_params["model"] = self._request_model
+        
+        # Key computed before any stream flag is added so both paths share entries
+        self._cache_key = self._flight_key = None
+        cacheable = self.response_cache and self.response_cache.is_cacheable(api_params)
+        shareable = self.single_flight and self.single_flight.is_shareable(api_params)
+        if cacheable or shareable:
+            if self._prompt_json is not None:
+                key = make_cache_key(dict(api_params, messages=json.loads(self._prompt_json)))
+            else:
+                key = make_cache_key(api_params)
+            self._cache_key = key if cacheable else None
+            self._flight_key = key if shareable else None
+        
+        # Paraphrase lookups are scoped to the model and system prompt
+        self._semantic_query = None
+        if self.semantic_cache and not functions and (
+                self._history_offset + len(self.history) == 1 or not Config.SEMANTIC_CACHE_FIRST_TURN_ONLY):
+            self._semantic_query = [make_namespace(self._request_model, self.system_prompt), user_message, None]
+        
+        return api_params
+    
+    def _get_cached_response(self) -> Optional[str]:
+        """
+        Look up the prepared request in the exact, then the semantic, cache
+        
+        Returns:
+            Cached reply, or None on a miss or when the request is not cacheable
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self._cache_key is not None:
+            cached = self.response_cache.get(self._cache_key)
+            if cached is not None:
+                self.conversation_stats["cache_hits"] += 1
+                return cached
+            self.conversation_stats["cache_misses"] += 1
+        
+        if self._semantic_query is not None:
+            namespace, text, _ = self._semantic_query
+            cached, self._semantic_query[2] = self.semantic_cache.lookup(namespace, text)
+            if cached is not None:
+                self.conversation_stats["semantic_cache_hits"] += 1
+                return cached
+            self.conversation_stats["semantic_cache_misses"] += 1
+        
+        return None
+    
+    def _record_cached_response(self, content: str, outcome: str = "cached") -> str:
+        """
+        Record a reply served from the cache (no upstream request or tokens spent)
+        
+        Args:
+            content: Cached reply
+            outcome: Metrics outcome label ("cached" or "coalesced")
+            
+        Returns:
+            Assistant's response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.metrics:
+            self.metrics.requests.inc(self._request_model, self.persona, outcome)
+        self.conversation_stats["total_messages"] += 2  # user + assistant
+        self.add_message("assistant", content)
+        return content
+    
+    def _store_cached_response(self, content: Optional[str]):
+        """
+        Store a completed reply for the prepared request
+        
+        Args:
+            content: Assistant reply (function-call replies without text are skipped)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not content:
+            return
+        if self._cache_key is not None:
+            self.response_cache.put(self._cache_key, content)
+        if self._semantic_query is not None:
+            namespace, text, vector = self._semantic_query
+            self.semantic_cache.put(namespace, text, content, vector)
+    
+    def _record_shared_response(self, response) -> str:
+        """
+        Record a reply shared from another session's identical call (no tokens spent)
+        
+        Args:
+            response: Chat completion returned to the call's leader
+            
+        Returns:
+            Assistant's response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.conversation_stats["coalesced_requests"] += 1
+        return self._record_cached_response(response.choices[0].message.content, "coalesced")
+    
+    def _record_response(self, response) -> str:
+        """
+        Record a completed (non-streaming) response in usage, stats and history
+        
+        Args:
+            response: Chat completion returned by the API
+            
+        Returns:
+            Assistant's response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Extract assistant response
+        assistant_message = response.choices[0].message.content
+        
+        # Track token usage and cost (estimated if the API reported no usage)
+        prompt_tokens, completion_tokens = self._record_usage(response.usage, assistant_message)
+        if self.metrics:
+            self.metrics.observe_completion(
+                self._request_model, self.persona, self._attempt_started, time.perf_counter(),
+                completion_tokens, prompt_tokens=prompt_tokens
+            )
+        
+        # Update statistics
+        self.conversation_stats["total_requests"] += 1
+        self.conversation_stats["total_messages"] += 2  # user + assistant
+        
+        # Add assistant response to history
+        self.add_message("assistant", assistant_message)
+        self._store_cached_response(assistant_message)
+        
+        return assistant_message
     
     def _get_streaming_response(self, api_params: dict) -> str:
         """
@@ -175,21 +666,121 @@ class GPTChatbot:
             Complete assistant response
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        api_params["stream"] = True
-        full_response = ""
+        self._enable_stream(api_params)
+        parts = []  # Joined once at the end instead of concatenating per chunk
         
-        stream = self.client.chat.completions.create(**api_params)
+        meter = StreamMeter(self._request_model)
+        stream = self._create_completion(api_params)
         
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
-                full_response += content
-                print(content, end='', flush=True)
+        try:
+            with span("chat.stream_read") as read:
+                for chunk in stream:
+                    content = meter.observe(chunk)
+                    if content:
+                        parts.append(content)
+                        print(content, end='', flush=True)
+                read.set_attribute("chat.chunks", len(parts))
+        except Exception as e:
+            if is_upstream_error(e):
+                raise to_upstream_error(e) from e
+            raise
         
         print()  # New line after streaming
-        self.add_message("assistant", full_response)
+        full_response = "".join(parts)
+        with span("chat.record"):
+            self._observe_stream(meter)
+            self.add_message("assistant", full_response)
+            self._store_cached_response(full_response)
+        self.conversation_stats["total_requests"] += 1
+        self.conversation_stats["total_messages"] += 2  # user + assistant
         return full_response
     
+    def _enable_stream(self, api_params: dict):
+        """
+        Turn the request into a streaming one
+        
+        Args:
+            api_params: API parameters dictionary
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        api_params["stream"] = True
+        if Config.STREAM_INCLUDE_USAGE:
+            # The final chunk carries the billed usage (with empty choices)
+            api_params["stream_options"] = {"include_usage": True}
+    
+    def _observe_stream(self, meter: StreamMeter, billed: bool = True):
+        """
+        Record a finished stream in usage, cost, stream statistics and metrics
+        
+        Args:
+            meter: The stream's meter
+            billed: Whether this session's own upstream call produced the stream
+                (False for a follower of a shared stream, whose tokens the leader records)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        stats = self.stream_stats
+        stats["streams"] += 1
+        ttft = meter.time_to_first_token
+        if ttft is not None:
+            stats["ttft_total"] += ttft
+            stats["ttft_streams"] += 1
+            stats["last_ttft"] = ttft
+        itl = meter.inter_token_latency
+        if itl is not None:
+            stats["itl_total"] += itl
+            stats["itl_streams"] += 1
+            stats["max_gap"] = max(stats["max_gap"], meter.max_gap)
+        if not billed:
+            return
+        
+        stats["usage_reported" if meter.usage is not None else "usage_estimated"] += 1
+        prompt_tokens, completion_tokens = self._record_usage(meter.usage, completion_tokens=meter.estimated_tokens)
+        if self.metrics:
+            self.metrics.observe_completion(
+                self._request_model, self.persona, self._attempt_started, time.perf_counter(),
+                completion_tokens, first_token=meter.first_token, prompt_tokens=prompt_tokens,
+                inter_token_latency=itl
+            )
+    
+    def _record_usage(self, usage, content: Optional[str] = None,
+                      completion_tokens: Optional[int] = None) -> tuple:
+        """
+        Add a request's tokens and cost to the session, API key and process totals
+        
+        Args:
+            usage: Usage reported by the API, or None to estimate it
+            content: Reply text, counted when usage is missing
+            completion_tokens: Completion estimate used instead of counting content
+            
+        Returns:
+            (prompt_tokens, completion_tokens) that were recorded
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        model = self._request_model
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens = self.context_builder.last_prompt_tokens
+            if completion_tokens is None:
+                completion_tokens = count_tokens(content or "", model)
+        cost = compute_cost(model, prompt_tokens, completion_tokens)
+        
+        self.token_usage["prompt_tokens"] += prompt_tokens
+        self.token_usage["completion_tokens"] += completion_tokens
+        self.token_usage["total_tokens"] += prompt_tokens + completion_tokens
+        self.conversation_stats["total_cost"] += cost
+        self.session_cost += cost
+        self.cost_ledger.record(self._key_id, model, prompt_tokens, completion_tokens, cost)
+        if self.rate_limiter:
+            self.rate_limiter.reconcile(model, self._estimated_tokens, prompt_tokens + completion_tokens)
+        if self.metrics and cost:
+            self.metrics.cost.inc(model, self.persona, amount=cost)
+        stage = current_span()
+        if stage.recording:
+            stage.set_attributes({"gen_ai.usage.input_tokens": prompt_tokens,
+                                  "gen_ai.usage.output_tokens": completion_tokens, "chat.cost": cost})
+        return prompt_tokens, completion_tokens
+    
     def get_streaming_response(self, user_message: str, temperature: float = 0.7, 
                                max_tokens: int = 500, callback: Optional[Callable] = None) -> Generator[str, None, None]:
         """
@@ -203,71 +794,363 @@ class GPTChatbot:
             
         Yields:
             Response chunks
+            
+        Raises:
+            UpstreamError: If the API call fails and will not be retried
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        self.add_message("user", user_message)
-        
-        messages = [{"role": "system", "content": self.system_prompt}]
-        messages.extend(self.conversation_history)
-        
-        try:
-            stream = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True
-            )
+        # Open across yields, so stages name it as parent instead of it being made current
+        with span("chat.stream", {"gen_ai.request.model": self.model, "chat.persona": self.persona},
+                  activate=False) as stream_span:
+            with span("chat.prepare", parent=stream_span):
+                api_params = self._prepare_request(user_message, temperature, max_tokens)
+                self._enable_stream(api_params)
             
-            full_response = ""
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
+            with span("chat.cache_lookup", parent=stream_span) as lookup:
+                cached = self._get_cached_response()
+                lookup.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                # Replay the cached reply as chunks so callers see the usual stream
+                for content in replay_chunks(cached):
                     if callback:
                         callback(content)
                     yield content
+                self._record_cached_response(cached)
+                return
             
-            self.add_message("assistant", full_response)
-            self.conversation_stats["total_requests"] += 1
+            parts = []
+            upstream = relay = None
+            finished = shared = False
+            meter = StreamMeter(self._request_model)
+            try:
+                with use_span(stream_span):
+                    if self._flight_key is not None:
+                        # Identical streams in flight share one upstream read by a reader thread
+                        relay, shared = self.single_flight.stream(
+                            self._flight_key, lambda: self._create_completion(api_params)
+                        )
+                        stream = relay
+                    else:
+                        stream = upstream = self._create_completion(api_params)
+                        if Config.STREAM_BUFFER_SIZE:
+                            # Upstream is read on its own thread, at most STREAM_BUFFER_SIZE chunks ahead
+                            stream = relay = ChunkRelay(upstream, Config.STREAM_BUFFER_SIZE)
+                
+                for chunk in stream:
+                    content = meter.observe(chunk)
+                    if content:
+                        parts.append(content)
+                        if callback:
+                            callback(content)
+                        yield content
+                finished = True
+            except GeneratorExit:
+                # The consumer stopped reading (client disconnected)
+                stream_span.set_attribute("chat.cancelled", True)
+                self._record_truncated_response(parts, max_tokens, meter, billed=not shared)
+                raise
+            except ChatbotError as e:
+                self._abandon_request(e)
+                raise
+            except Exception as e:
+                if not is_upstream_error(e):
+                    raise
+                error = to_upstream_error(e)
+                self._abandon_request(error)
+                raise error from e
+            finally:
+                if not finished:
+                    # Stop generation now instead of draining tokens nobody will read
+                    if relay is not None:
+                        relay.cancel()
+                    elif upstream is not None:
+                        upstream.close()
+                if stream_span.recording:
+                    stream_span.set_attributes(self._stream_attributes(meter, len(parts), shared))
             
-        except Exception as e:
-            error_msg = f"Error in streaming: {str(e)}"
-            if callback:
-                callback(error_msg)
-            yield error_msg
+            with span("chat.record", parent=stream_span):
+                full_response = "".join(parts)
+                self.add_message("assistant", full_response)
+                self.conversation_stats["total_messages"] += 2  # user + assistant
+                self._observe_stream(meter, billed=not shared)
+                if shared:
+                    self.conversation_stats["coalesced_requests"] += 1
+                    if self.metrics:
+                        self.metrics.requests.inc(self._request_model, self.persona, "coalesced")
+                    return
+                self._store_cached_response(full_response)
+                self.conversation_stats["total_requests"] += 1
+    
+    def _stream_attributes(self, meter: StreamMeter, chunks: int, shared: bool) -> dict:
+        """
+        Span attributes of a finished or aborted stream
+        
+        Args:
+            meter: The stream's meter
+            chunks: Content chunks delivered
+            shared: Whether the stream was shared from another session's call
+            
+        Returns:
+            Attributes for the chat.stream span
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        attributes = {"chat.chunks": chunks, "chat.shared": shared}
+        if meter.time_to_first_token is not None:
+            attributes["chat.time_to_first_token"] = meter.time_to_first_token
+        if meter.inter_token_latency is not None:
+            attributes["chat.inter_token_latency"] = meter.inter_token_latency
+        return attributes
+    
+    def _record_truncated_response(self, parts: List[str], max_tokens: int, meter: StreamMeter,
+                                   billed: bool = True):
+        """
+        Keep the part of a reply that was streamed before the client went away
+        
+        Args:
+            parts: Chunks delivered so far
+            max_tokens: Completion token limit of the request
+            meter: The stream's meter
+            billed: Whether this session's own upstream call produced the chunks
+                (False for a follower of a shared stream)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        partial = "".join(parts)
+        if billed:
+            # No usage chunk arrives on an aborted stream; the prompt and the tokens generated are billed
+            self.stream_stats["usage_estimated"] += 1
+            self._record_usage(None, completion_tokens=meter.estimated_tokens)
+        tokens_saved = max(0, max_tokens - meter.estimated_tokens)
+        self.conversation_stats["total_requests"] += 1
+        self.conversation_stats["cancelled_streams"] += 1
+        self.conversation_stats["tokens_saved"] += tokens_saved
+        if self.metrics:
+            self.metrics.requests.inc(self._request_model, self.persona, "cancelled")
+        record_cancelled_stream(tokens_saved)
+        if partial:
+            self.add_message("assistant", partial, truncated=True)
+        else:
+            self._discard_user_turn()
+    
+    def batch(self, prompts: List, concurrency: Optional[int] = None, temperature: float = 0.7,
+              max_tokens: int = 500, checkpoint: Optional[str] = None) -> List[Dict]:
+        """
+        Complete many independent prompts concurrently
+        
+        Each prompt is sent on its own with this chatbot's model and system
+        prompt; conversation history is neither used nor changed.
+        
+        Args:
+            prompts: Prompts (strings, or dicts with prompt and optional id,
+                system_prompt, temperature, max_tokens)
+            concurrency: Requests in flight at once (defaults to Config.BATCH_CONCURRENCY)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per reply
+            checkpoint: Optional JSONL file to resume from and record results in
+            
+        Returns:
+            One result per prompt in input order, each with status "ok" and
+            content or status "error" and error
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        job = self._make_batch_job(prompts, concurrency, temperature, max_tokens, checkpoint)
+        results = job.run(self.client)
+        self._record_batch(job)
+        return results
+    
+    def offline_batch(self, name: Optional[str] = None) -> OfflineBatch:
+        """
+        Start staging an offline Batch API job with this chatbot's model and system prompt
+        
+        Args:
+            name: Staging file name (generated when omitted)
+            
+        Returns:
+            OfflineBatch to ``add`` prompts to, then ``submit``, ``wait`` and read results from
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return OfflineBatch(self, name)
+    
+    def _make_batch_job(self, prompts: List, concurrency: Optional[int], temperature: float,
+                        max_tokens: int, checkpoint: Optional[str]) -> BatchJob:
+        """
+        Create a batch job that shares this chatbot's limiter, cache and retry policy
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        job = BatchJob(prompts, model=self.model, system_prompt=self.system_prompt,
+                       temperature=temperature, max_tokens=max_tokens,
+                       concurrency=concurrency, checkpoint=checkpoint)
+        job.retry_policy = self.retry_policy
+        job.rate_limiter = self.rate_limiter
+        job.response_cache = self.response_cache
+        job.key_id = self._key_id
+        job.persona = self.persona
+        job.session_spent = self.session_cost
+        job.cost_ledger = self.cost_ledger
+        job.metrics = self.metrics
+        return job
+    
+    def _record_batch(self, job: BatchJob):
+        """
+        Add a finished batch's requests and token usage to the statistics
+        
+        The ledger and cost metric were charged item by item while it ran.
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        for field, value in job.usage.items():
+            self.token_usage[field] += value
+        requests = job.completed - job.resumed - job.cached - job.failed
+        cost = job.cost()
+        self.conversation_stats["total_cost"] += cost
+        self.session_cost += cost
+        self.conversation_stats["total_requests"] += requests
+        self.conversation_stats["total_errors"] += job.failed
+        self.conversation_stats["cache_hits"] += job.cached
     
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """
         Get full conversation history
         
         Returns:
-            List of conversation messages
+            List of conversation messages (a copy)
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        return self.conversation_history
+        self._ensure_history()
+        return self.history.to_list()
     
     def save_conversation(self, filename: str):
         """
-        Save conversation to JSON file
+        Save conversation to a JSON file, or a compacted log if it ends in .jsonl
         
         Args:
             filename: Output filename
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._ensure_history()
+        if filename.endswith(".jsonl"):
+            write_conversation(filename, self.history.to_list(timestamps=True))
+            return
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.conversation_history, f, indent=2, ensure_ascii=False)
+            json.dump(self.history.to_list(), f, indent=2, ensure_ascii=False)
     
     def load_conversation(self, filename: str):
         """
-        Load conversation from JSON file
+        Load conversation from a JSON file or a .jsonl conversation log
         
         Args:
             filename: Input filename
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        with open(filename, 'r', encoding='utf-8') as f:
-            self.conversation_history = json.load(f)
+        if filename.endswith(".jsonl"):
+            messages = read_conversation(filename)
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                messages = json.load(f)
+        self.conversation_history = messages
+    
+    def attach_log(self, log: ConversationLog):
+        """
+        Persist every history change to an append-only conversation log
+        
+        A log that already holds messages replaces the current history (only
+        the turns the context window can use are read when SESSION_LAZY_LOAD
+        is set); an empty one is seeded with it. Works the same with a
+        SessionLog from a shared backend (see session_backend.py).
+        
+        Args:
+            log: Conversation log
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.log = log
+        if len(log) or getattr(log, "meta", None):
+            self._load_from_log()
+        elif self.history:
+            log.replace(self.history.to_list(timestamps=True))
+    
+    def _load_from_log(self):
+        """
+        Replace history with the attached log's turns, leaving older ones for _ensure_history
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        log = self.log
+        start = max(0, len(log) - Config.MAX_CONVERSATION_HISTORY) if Config.SESSION_LAZY_LOAD else 0
+        self._set_history(log.messages(start))
+        self._history_offset = start
+        prompt = (getattr(log, "meta", None) or {}).get("system_prompt")
+        if prompt and prompt != self.system_prompt:
+            self.system_prompt = prompt
+            self._system_tokens = count_message_tokens("system", prompt, self.model)
+    
+    def _ensure_history(self):
+        """
+        Read the leading turns a lazy restore skipped, before anything that needs the whole conversation
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        offset = self._history_offset
+        if not offset:
+            return
+        pinned = {index + offset for index in self.pinned_messages}
+        self._set_history(self.log.messages(0, offset) + self.history.to_list(timestamps=True))
+        self.pinned_messages = pinned
+    
+    def _write_log(self, write: Callable):
+        """
+        Apply a write to the attached log, reloading from it if another request got there first
+        
+        Args:
+            write: Callable performing the write
+            
+        Raises:
+            SessionConflict: If the shared conversation changed (history now matches it)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        try:
+            write()
+        except SessionConflict:
+            self.log.changes()
+            self._load_from_log()
+            raise
+    
+    def sync_log(self):
+        """
+        Catch up with turns other workers wrote to a shared session since this one last looked
+        
+        Only the new turns are read when the conversation was just appended
+        to; anything else (a retry, a clear, a new system prompt) reloads it.
+        Call before serving each request; a no-op for per-worker logs.
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        changes = getattr(self.log, "changes", None)
+        if changes is None:
+            return
+        change = changes()
+        if change is None:
+            return
+        rewritten, appended = change
+        if rewritten:
+            self._load_from_log()
+            return
+        for message in appended:
+            self.history.append(message['role'], message['content'],
+                                count_message_tokens(message['role'], message['content'], self.model),
+                                truncated=message.get('truncated', False), timestamp=message.get('timestamp'))
+            if self._search_index is not None:
+                self._search_index.add(len(self.history) - 1, message['content'] or "")
+    
+    def _set_history(self, messages: List[Dict]):
+        """
+        Replace conversation history and rebuild the per-message caches
+        
+        Args:
+            messages: Conversation messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.history = ConversationHistory.from_messages(
+            messages, lambda role, content: count_message_tokens(role, content, self.model)
+        )
+        self._history_offset = 0
+        self.pinned_messages = set()
+        self._search_index = None
+        self._invalidate_prompt()
     
     def get_token_usage(self) -> Dict:
         """
@@ -289,12 +1172,53 @@ class GPTChatbot:
         # Author: RSK World (https://rskworld.in) - Year: 2026
         stats = self.conversation_stats.copy()
         stats["token_usage"] = self.token_usage.copy()
+        stats["context"] = {
+            "strategy": self.context_builder.strategy,
+            "last_prompt_tokens": self.context_builder.last_prompt_tokens,
+            "last_trimmed_messages": self.context_builder.last_trimmed
+        }
+        stats["cache"] = {
+            "enabled": self.response_cache is not None,
+            "hits": self.conversation_stats["cache_hits"],
+            "misses": self.conversation_stats["cache_misses"],
+            "semantic_enabled": self.semantic_cache is not None,
+            "semantic_hits": self.conversation_stats["semantic_cache_hits"],
+            "semantic_misses": self.conversation_stats["semantic_cache_misses"]
+        }
+        stats["prompt_builder"] = self.prompt_builder.stats() if self.prompt_builder is not None else None
+        stream_stats = self.stream_stats
+        stats["streaming"] = {
+            "streams": stream_stats["streams"],
+            "usage_reported": stream_stats["usage_reported"],
+            "usage_estimated": stream_stats["usage_estimated"],
+            "avg_time_to_first_token": _mean(stream_stats["ttft_total"], stream_stats["ttft_streams"]),
+            "last_time_to_first_token": _round(stream_stats["last_ttft"]),
+            "avg_inter_token_latency": _mean(stream_stats["itl_total"], stream_stats["itl_streams"]),
+            "max_inter_token_gap": _round(stream_stats["max_gap"]) if stream_stats["itl_streams"] else None
+        }
+        stats["budget"] = {
+            "session_cost": round(self.session_cost, 6),
+            "session_soft": Config.BUDGET_SESSION_SOFT or None,
+            "session_hard": Config.BUDGET_SESSION_HARD or None,
+            "key_window_cost": round(self.cost_ledger.window_spend(self._key_id), 6),
+            "key_soft": Config.BUDGET_KEY_SOFT or None,
+            "key_hard": Config.BUDGET_KEY_HARD or None,
+            "last_model": self._request_model
+        }
         stats["current_time"] = datetime.now().isoformat()
         return stats
     
+    @staticmethod
+    def _empty_stream_stats() -> Dict:
+        """Zeroed per-session streaming totals (see get_conversation_stats)"""
+        return {"streams": 0, "usage_reported": 0, "usage_estimated": 0,
+                "ttft_total": 0.0, "ttft_streams": 0, "last_ttft": None,
+                "itl_total": 0.0, "itl_streams": 0, "max_gap": 0.0}
+    
     def reset_stats(self):
         """Reset token usage and conversation statistics"""
         # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stream_stats = self._empty_stream_stats()
         self.token_usage = {
             "prompt_tokens": 0,
             "completion_tokens": 0,
@@ -303,6 +1227,15 @@ class GPTChatbot:
         self.conversation_stats = {
             "total_messages": 0,
             "total_requests": 0,
+            "total_retries": 0,
+            "total_errors": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "semantic_cache_hits": 0,
+            "semantic_cache_misses": 0,
+            "coalesced_requests": 0,
+            "cancelled_streams": 0,
+            "tokens_saved": 0,
             "total_cost": 0.0,
             "start_time": datetime.now().isoformat()
         }
@@ -338,13 +1271,14 @@ class GPTChatbot:
             String content
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._ensure_history()
         content = "=" * 60 + "\n"
         content += "OpenAI GPT Chatbot Conversation\n"
         content += f"Created by RSK World (https://rskworld.in)\n"
         content += f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
         content += "=" * 60 + "\n\n"
         
-        for msg in self.conversation_history:
+        for msg in self.history:
             role = msg['role'].upper()
             msg_content = msg['content']
             content += f"[{role}]\n{msg_content}\n\n"
@@ -358,25 +1292,61 @@ class GPTChatbot:
         
         return content
     
-    def search_conversation(self, query: str) -> List[Dict]:
+    def _get_search_index(self) -> InvertedIndex:
         """
-        Search conversation history for messages containing query
+        Get the search index, building it from history on first use
+        
+        Returns:
+            Inverted index over conversation history
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._ensure_history()
+        if self._search_index is None:
+            index = InvertedIndex()
+            for i in range(len(self.history)):
+                index.add(i, self.history.content(i) or "")
+            self._search_index = index
+        return self._search_index
+    
+    def search(self, query: str, page: int = 1, page_size: Optional[int] = None) -> Dict:
+        """
+        Search conversation history with BM25 ranking
+        
+        Every word must match. Quoted text matches as a phrase and a
+        trailing * matches a prefix, e.g. ``"reset password" acc*``.
         
         Args:
             query: Search query string
+            page: 1-based page number
+            page_size: Results per page
             
         Returns:
-            List of matching messages
+            Dictionary with ranked, highlighted results and the total number of matches
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        query_lower = query.lower()
-        results = []
-        
-        for msg in self.conversation_history:
-            if query_lower in msg['content'].lower():
-                results.append(msg)
+        page, page_size = clamp_page(page, page_size)
+        index = self._get_search_index()
+        scored, terms = index.search(Query(query, index.stemming))
+        results = [
+            build_hit(self.history[doc_id], score, terms, index.stemming, index=doc_id)
+            for score, doc_id in paginate(scored, page, page_size)
+        ]
+        return {"results": results, "total": len(scored), "page": page, "page_size": page_size}
+    
+    def search_conversation(self, query: str) -> List[Dict]:
+        """
+        Search conversation history for messages matching query
         
-        return results
+        Args:
+            query: Search query string (see search() for the syntax)
+            
+        Returns:
+            List of matching messages, best match first
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        index = self._get_search_index()
+        scored, _ = index.search(Query(query, index.stemming))
+        return [self.history[doc_id] for _, doc_id in paginate(scored, 1, len(scored))]
     
     def get_conversation_summary(self) -> str:
         """
@@ -386,11 +1356,12 @@ class GPTChatbot:
             Conversation summary string
         """
         # Author: RSK World (https://rskworld.in) - Year: 2026
-        user_messages = [msg for msg in self.conversation_history if msg['role'] == 'user']
-        assistant_messages = [msg for msg in self.conversation_history if msg['role'] == 'assistant']
+        self._ensure_history()
+        user_messages = [msg for msg in self.history if msg['role'] == 'user']
+        assistant_messages = [msg for msg in self.history if msg['role'] == 'assistant']
         
         summary = f"Conversation Summary:\n"
-        summary += f"- Total Messages: {len(self.conversation_history)}\n"
+        summary += f"- Total Messages: {len(self.history)}\n"
         summary += f"- User Messages: {len(user_messages)}\n"
         summary += f"- Assistant Messages: {len(assistant_messages)}\n"
         summary += f"- Total Tokens Used: {self.token_usage['total_tokens']}\n"
@@ -450,8 +1421,11 @@ def main():
                 continue
             
             # Get response from chatbot
-            response = chatbot.get_response(user_input)
-            print(f"Assistant: {response}\n")
+            try:
+                response = chatbot.get_response(user_input)
+                print(f"Assistant: {response}\n")
+            except ChatbotError as e:
+                print(f"Error: {e}\n")
         
     except ValueError as e:
         print(f"Error: {e}")
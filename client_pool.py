@@ -0,0 +1,197 @@
+"""
+Shared OpenAI Client Pool
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Process-wide registry of OpenAI clients keyed by API key and base URL.
+Every GPTChatbot using the same credentials shares one HTTP connection pool,
+so sessions reuse warm keep-alive connections instead of opening their own.
+"""
+
+import itertools
+import threading
+import importlib.util
+from typing import Dict, List, Optional, Tuple
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+from config import Config
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with openai>=1.0
+    httpx = None
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+_clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+_async_clients: Dict[Tuple[str, Optional[str]], List[AsyncOpenAI]] = {}
+_async_round_robin = itertools.count()
+_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """
+    Check whether HTTP/2 support (the ``h2`` package) is installed
+
+    Returns:
+        True if httpx can negotiate HTTP/2
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(max_connections: Optional[int] = None,
+                      max_keepalive_connections: Optional[int] = None,
+                      keepalive_expiry: Optional[float] = None,
+                      http2: Optional[bool] = None,
+                      asynchronous: bool = False):
+    """
+    Build a pooled httpx client for the OpenAI SDK
+
+    Args:
+        max_connections: Maximum open connections per pool
+        max_keepalive_connections: Maximum idle keep-alive connections
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Enable HTTP/2 (defaults to Config.HTTP2_ENABLED when h2 is installed)
+        asynchronous: Build an httpx.AsyncClient instead of an httpx.Client
+
+    Returns:
+        httpx client instance, or None if httpx is unavailable
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if httpx is None:
+        return None
+
+    limits = httpx.Limits(
+        max_connections=max_connections or Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=max_keepalive_connections or Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else Config.HTTP_KEEPALIVE_EXPIRY
+    )
+    if http2 is None:
+        http2 = Config.HTTP2_ENABLED
+    http2 = bool(http2) and http2_available()
+
+    if asynchronous:
+        client_class = getattr(openai, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+    else:
+        client_class = getattr(openai, "DefaultHttpxClient", httpx.Client)
+    return client_class(limits=limits, http2=http2)
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Get the shared OpenAI client for an API key and base URL
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional API base URL (e.g. a proxy or local stub server)
+
+    Returns:
+        Shared OpenAI client
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # Retries are owned by RetryPolicy, so the SDK must not retry on its own
+            kwargs = {"api_key": api_key, "max_retries": 0}
+            if base_url:
+                kwargs["base_url"] = base_url
+            http_client = build_http_client()
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            client = OpenAI(**kwargs)
+            _clients[key] = client
+    return client
+
+
+def get_async_openai_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get a shared async OpenAI client for an API key and base URL
+
+    httpcore's async pool rescans every connection on each read, which turns
+    quadratic with thousands of open streams, so async clients are sharded:
+    each key gets Config.HTTP_ASYNC_POOL_SHARDS clients handed out
+    round-robin. Async clients hold connections bound to the event loop that
+    opened them, so they should only be shared within one event loop (one per
+    process under an ASGI server).
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional API base URL (e.g. a proxy or local stub server)
+
+    Returns:
+        Shared AsyncOpenAI client
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    key = (api_key, base_url)
+    shards = _async_clients.get(key)
+    if shards is None:
+        with _lock:
+            shards = _async_clients.get(key)
+            if shards is None:
+                shards = []
+                for _ in range(max(1, Config.HTTP_ASYNC_POOL_SHARDS)):
+                    kwargs = {"api_key": api_key, "max_retries": 0}
+                    if base_url:
+                        kwargs["base_url"] = base_url
+                    http_client = build_http_client(asynchronous=True)
+                    if http_client is not None:
+                        kwargs["http_client"] = http_client
+                    shards.append(AsyncOpenAI(**kwargs))
+                _async_clients[key] = shards
+    return shards[next(_async_round_robin) % len(shards)]
+
+
+def close_all_clients():
+    """Close every pooled sync client and empty the registry"""
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"Error closing OpenAI client: {e}")
+
+
+async def close_all_async_clients():
+    """Close every pooled async client and empty the registry"""
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with _lock:
+        clients = [client for shards in _async_clients.values() for client in shards]
+        _async_clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Error closing async OpenAI client: {e}")
+
+
+def get_pool_stats() -> Dict:
+    """
+    Get client registry statistics
+
+    Returns:
+        Dictionary with the number of pooled clients and pool settings
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return {
+        "clients": len(_clients),
+        "async_clients": sum(len(shards) for shards in _async_clients.values()),
+        "max_connections": Config.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": Config.HTTP_KEEPALIVE_EXPIRY,
+        "http2": bool(Config.HTTP2_ENABLED) and http2_available()
+    }
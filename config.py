@@ -26,6 +26,15 @@ class Config:
     # OpenAI API Configuration
     # Author: RSK World (https://rskworld.in) - Year: 2026
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # Optional proxy or local stub server
+    
+    # HTTP Connection Pool Settings (shared by all sessions in a worker)
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # Seconds
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"  # Used when h2 is installed
+    HTTP_ASYNC_POOL_SHARDS = int(os.getenv("HTTP_ASYNC_POOL_SHARDS", "4"))  # Async clients per key (each with its own pool)
     
     # Model Configuration
     # Author: RSK World (https://rskworld.in) - Year: 2026
@@ -43,12 +52,159 @@ class Config:
     # Author: RSK World (https://rskworld.in) - Year: 2026
     DEFAULT_SYSTEM_PROMPT = "You are a helpful and friendly AI assistant created by RSK World (https://rskworld.in)."
     
+    # Retry Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    RETRY_MAX_ATTEMPTS = 3  # Total attempts including the first
+    RETRY_BASE_DELAY = 0.5  # Seconds; full-jitter backoff base
+    RETRY_MAX_DELAY = 8.0  # Seconds; cap on a single backoff
+    RETRY_MAX_ELAPSED = 20.0  # Seconds; give up rather than wait longer in total
+    RETRY_BUDGET_RATIO = 0.2  # Retries allowed per request across the process
+    RETRY_BUDGET_MIN_PER_SECOND = 1.0  # Retries always allowed per second
+    
+    # Rate Limit Settings (client side, shared by all sessions)
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_RPM = float(os.getenv("RATE_LIMIT_RPM", "500"))  # Requests per minute per model
+    RATE_LIMIT_TPM = float(os.getenv("RATE_LIMIT_TPM", "200000"))  # Estimated tokens per minute per model
+    MODEL_RATE_LIMITS = {}  # Per-model overrides, e.g. {"gpt-4": (500, 30000)}
+    RATE_LIMIT_MODE = os.getenv("RATE_LIMIT_MODE", "queue")  # Options: queue, shed
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))  # Seconds a queued request may wait
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # Options: memory, file (shared by workers)
+    RATE_LIMIT_FILE = os.getenv("RATE_LIMIT_FILE", "/tmp/openai-chatbot-ratelimit.json")
+    
+    # Response Cache Settings (opt-in, deterministic requests only)
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_MAX_TEMPERATURE = 0.0  # Only replies at or below this temperature are cached
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))  # Seconds an entry stays valid
+    RESPONSE_CACHE_MEMORY_ENTRIES = int(os.getenv("RESPONSE_CACHE_MEMORY_ENTRIES", "1024"))  # In-memory LRU size
+    RESPONSE_CACHE_DISK_PATH = os.getenv("RESPONSE_CACHE_DISK_PATH") or None  # sqlite file; unset disables the disk tier
+    RESPONSE_CACHE_DISK_ENTRIES = int(os.getenv("RESPONSE_CACHE_DISK_ENTRIES", "100000"))  # Disk tier size
+    
+    # Semantic Cache Settings (opt-in, answers paraphrased questions from the cache)
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))  # Minimum cosine similarity
+    SEMANTIC_CACHE_FIRST_TURN_ONLY = True  # Only answer opening questions, whose reply does not depend on history
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))  # LRU size
+    SEMANTIC_CACHE_MAX_AGE = int(os.getenv("SEMANTIC_CACHE_MAX_AGE", "86400"))  # Seconds an entry stays valid
+    SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH") or None  # Directory to persist the index; unset keeps it in memory
+    SEMANTIC_CACHE_SAVE_EVERY = 50  # New entries between saves to disk
+    SEMANTIC_CACHE_DIM = 512  # Embedding dimension
+    SEMANTIC_CACHE_EMBEDDING_FUNCTION = os.getenv("SEMANTIC_CACHE_EMBEDDING_FUNCTION", "")  # "module:function"; default hashing embedding
+    SEMANTIC_CACHE_IVF_THRESHOLD = 4096  # Entries before the NumPy index switches from brute force to IVF
+    SEMANTIC_CACHE_NPROBE = 8  # IVF lists scanned per lookup
+    
+    # Request Coalescing Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"  # Share one upstream call among identical concurrent requests
+    SINGLEFLIGHT_MAX_TEMPERATURE = float(os.getenv("SINGLEFLIGHT_MAX_TEMPERATURE", "0.0"))  # Raising it shares one sampled reply among users
+    SINGLEFLIGHT_STREAM_BUFFER = int(os.getenv("SINGLEFLIGHT_STREAM_BUFFER", "1024"))  # Chunks kept per shared stream; later joiners start their own
+    
+    # Streaming Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SSE_COALESCE_MS = float(os.getenv("SSE_COALESCE_MS", "16"))  # Window for merging small deltas into one frame (0 disables)
+    SSE_COALESCE_CHARS = int(os.getenv("SSE_COALESCE_CHARS", "512"))  # Buffered characters that force a frame out
+    STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "32"))  # Chunks read ahead of a slow client (0 disables the reader)
+    STREAM_INCLUDE_USAGE = os.getenv("STREAM_INCLUDE_USAGE", "true").lower() == "true"  # Ask for a final usage chunk so streamed replies are billed exactly
+    
     # Conversation Settings
     # Author: RSK World (https://rskworld.in) - Year: 2026
-    MAX_CONVERSATION_HISTORY = 50  # Maximum messages to keep in history
-    SAVE_CONVERSATIONS = True  # Whether to save conversations
-    CONVERSATION_DIR = "conversations"  # Directory to save conversations
+    MAX_CONVERSATION_HISTORY = 50  # Maximum history messages sent per request
+    CONTEXT_STRATEGY = "sliding_window"  # Options: sliding_window, keep_first
+    CONTEXT_KEEP_FIRST = 2  # Leading messages always kept by the keep_first strategy
+    PROMPT_BUILDER_ENABLED = os.getenv("PROMPT_BUILDER_ENABLED", "true").lower() == "true"  # Reuse the serialized prompt between calls
+    SAVE_CONVERSATIONS = os.getenv("SAVE_CONVERSATIONS", "true").lower() == "true"  # Append every message to a per-session log
+    CONVERSATION_DIR = os.getenv("CONVERSATION_DIR", "conversations")  # Directory for conversation logs (<session_id>.jsonl)
+    CONVERSATION_LOG_FSYNC_EVERY = int(os.getenv("CONVERSATION_LOG_FSYNC_EVERY", "32"))  # Records between fsyncs (1 = every message)
+    CONVERSATION_LOG_FSYNC_INTERVAL = float(os.getenv("CONVERSATION_LOG_FSYNC_INTERVAL", "1.0"))  # Longest seconds between fsyncs while writing
+    CONVERSATION_LOG_COMPACT_MIN = int(os.getenv("CONVERSATION_LOG_COMPACT_MIN", "64"))  # Dead records (pops, clears) before compaction
+    CONVERSATION_LOG_MAX_OPEN = int(os.getenv("CONVERSATION_LOG_MAX_OPEN", "128"))  # Logs keeping their file and map open at once (up to two descriptors each); the least recently used are closed
     
+    # Search Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SEARCH_STEMMING = True  # Match plural and singular forms
+    SEARCH_PAGE_SIZE = 20  # Default results per page
+    SEARCH_MAX_PAGE_SIZE = 100  # Largest page a client may request
+    SEARCH_ARCHIVE_ENABLED = os.getenv("SEARCH_ARCHIVE_ENABLED", "false").lower() == "true"  # Allow scope=archive (all saved conversations; single-user deployments only)
+    
+    # Batch Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))  # Default requests in flight per batch
+    BATCH_MAX_CONCURRENCY = 64  # Largest concurrency a caller may request
+    BATCH_MAX_PROMPTS = int(os.getenv("BATCH_MAX_PROMPTS", "10000"))  # Prompts accepted per /api/batch job
+    BATCH_MAX_JOBS = 100  # Jobs kept for polling; the oldest finished ones are forgotten first
+    BATCH_CHECKPOINT_DIR = os.getenv("BATCH_CHECKPOINT_DIR", "batch_checkpoints")  # Checkpoints (<job_id>.jsonl) for resuming
+    BATCH_API_DIR = os.getenv("BATCH_API_DIR", "batch_api")  # Staging and results files for offline Batch API jobs
+    BATCH_API_COMPLETION_WINDOW = "24h"  # Provider completion window for offline jobs
+    BATCH_API_POLL_INTERVAL = float(os.getenv("BATCH_API_POLL_INTERVAL", "30"))  # Seconds between status polls
+    BATCH_API_MAX_REQUESTS = 50000  # Provider limit on requests per batch input file
+    
+    # Metrics Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # Collect metrics and serve /metrics
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR") or None  # Directory shared by worker processes; unset reports this process only
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))  # Seconds between writes of a worker's totals to the directory
+    
+    # Cost Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    MODEL_PRICES = os.getenv("MODEL_PRICES", "")  # JSON overrides of USD per 1M tokens, e.g. {"gpt-4o": [2.5, 10]}
+    UNKNOWN_MODEL_PRICE = os.getenv("UNKNOWN_MODEL_PRICE", "")  # JSON [input, output] USD per 1M tokens for unpriced models (unset: free, refused under a hard budget)
+    BATCH_API_DISCOUNT = float(os.getenv("BATCH_API_DISCOUNT", "0.5"))  # Price multiplier for offline Batch API jobs
+    BUDGET_SESSION_SOFT = float(os.getenv("BUDGET_SESSION_SOFT", "0"))  # USD per session before requests are downgraded (0 disables)
+    BUDGET_SESSION_HARD = float(os.getenv("BUDGET_SESSION_HARD", "0"))  # USD per session before requests are refused (0 disables)
+    BUDGET_KEY_SOFT = float(os.getenv("BUDGET_KEY_SOFT", "0"))  # USD per API key and window before downgrading (0 disables)
+    BUDGET_KEY_HARD = float(os.getenv("BUDGET_KEY_HARD", "0"))  # USD per API key and window before refusing (0 disables)
+    BUDGET_WINDOW = int(os.getenv("BUDGET_WINDOW", "86400"))  # Seconds per API key budget window
+    BUDGET_DOWNGRADE_MODEL = os.getenv("BUDGET_DOWNGRADE_MODEL", "gpt-4o-mini")  # Model used past a soft budget (empty keeps the model)
+    
+    # Session Store Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))  # Live sessions per worker
+    SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", "3600"))  # Seconds before an idle session is evicted
+    SESSION_MEMORY_BUDGET = int(os.getenv("SESSION_MEMORY_BUDGET", str(256 * 1024 * 1024)))  # Bytes per worker
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "file")  # Where conversations live: file (per worker), sqlite (one machine) or redis (any node)
+    SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "sessions.db")  # Database for SESSION_BACKEND=sqlite
+    SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")  # Server for SESSION_BACKEND=redis (any Redis-protocol server)
+    SESSION_REDIS_PREFIX = os.getenv("SESSION_REDIS_PREFIX", "chatbot:session:")  # Key prefix for SESSION_BACKEND=redis
+    SESSION_BACKEND_TTL = int(os.getenv("SESSION_BACKEND_TTL", str(30 * 24 * 3600)))  # Seconds after its last write a shared session is deleted (0 keeps them)
+    SESSION_LAZY_LOAD = os.getenv("SESSION_LAZY_LOAD", "true").lower() == "true"  # Restore only the last MAX_CONVERSATION_HISTORY turns; older ones load on demand (keep_first loads them on the next request)
+    SESSION_LOCK_ENABLED = os.getenv("SESSION_LOCK_ENABLED", "true").lower() == "true"  # Serialize requests that share a session
+    SESSION_QUEUE_DEPTH = int(os.getenv("SESSION_QUEUE_DEPTH", "4"))  # Requests that may wait behind a session's running request before 429s
+    SESSION_LOCK_TIMEOUT = float(os.getenv("SESSION_LOCK_TIMEOUT", "120"))  # Seconds a queued request waits for its session (0 waits forever)
+    
+    # Server Settings (serve.py / chatbot-serve)
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    SERVE_BIND = os.getenv("SERVE_BIND", "0.0.0.0:5000")  # Address the server listens on
+    SERVE_WORKER_CLASS = os.getenv("SERVE_WORKER_CLASS", "gthread")  # gthread, sync, gevent or async (asgi_app on uvicorn workers)
+    SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "0"))  # Worker processes (0 for 2 x CPUs + 1, or 1 while sessions or rate limits are per worker)
+    SERVE_ALLOW_PER_WORKER_STATE = os.getenv("SERVE_ALLOW_PER_WORKER_STATE", "false").lower() == "true"  # Allow several workers with SESSION_BACKEND=file or RATE_LIMIT_BACKEND=memory
+    SERVE_THREADS = int(os.getenv("SERVE_THREADS", "8"))  # Threads per gthread worker
+    SERVE_WORKER_CONNECTIONS = int(os.getenv("SERVE_WORKER_CONNECTIONS", "1000"))  # Concurrent clients per gevent worker
+    SERVE_PRELOAD = os.getenv("SERVE_PRELOAD", "true").lower() == "true"  # Import the app once in the master and fork workers from it
+    SERVE_TIMEOUT = int(os.getenv("SERVE_TIMEOUT", "120"))  # Seconds a silent worker may run before it is killed
+    SERVE_GRACEFUL_TIMEOUT = int(os.getenv("SERVE_GRACEFUL_TIMEOUT", "60"))  # Seconds a stopping worker gets to finish in-flight requests
+    SERVE_DRAIN_TIMEOUT = float(os.getenv("SERVE_DRAIN_TIMEOUT", "50"))  # Seconds streams may run after shutdown starts before ending with a retry frame
+    SERVE_KEEPALIVE = int(os.getenv("SERVE_KEEPALIVE", "5"))  # Seconds an idle keep-alive connection stays open
+    SERVE_MAX_REQUESTS = int(os.getenv("SERVE_MAX_REQUESTS", "1000"))  # Requests before a worker is recycled (0 never)
+    SERVE_MAX_REQUESTS_JITTER = int(os.getenv("SERVE_MAX_REQUESTS_JITTER", "100"))  # Random extra requests so workers do not recycle together
+    SERVE_MAX_WORKER_MEMORY = int(os.getenv("SERVE_MAX_WORKER_MEMORY", "0"))  # MiB of RSS after which a worker is recycled (0 never)
+
+    # Tracing and Profiling Settings
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"  # Record per-request spans for each chat stage
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "memory")  # memory (/api/traces), file (TRACING_FILE), otlp (TRACING_OTLP_ENDPOINT) or none (hooks only)
+    TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))  # Fraction of new traces recorded (a traceparent header's flag wins)
+    TRACING_BUFFER_SIZE = int(os.getenv("TRACING_BUFFER_SIZE", "1000"))  # Spans kept in memory, or queued for the OTLP exporter
+    TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")  # OTLP/JSON span per line for TRACING_EXPORTER=file
+    TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")  # OTLP/HTTP JSON traces endpoint of a collector
+    TRACING_OTLP_HEADERS = os.getenv("TRACING_OTLP_HEADERS", "")  # Extra headers for the collector, as key=value,key2=value2
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "openai-gpt-chatbot")  # service.name of exported spans
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"  # Serve the sampling profiler at /api/debug/profile
+    PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")  # Required X-Profiler-Token header value (empty allows anyone who can reach the endpoint)
+    PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))  # Longest profile a request may ask for
+    PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))  # Seconds between stack samples
+
     # Application Settings
     # Author: RSK World (https://rskworld.in) - Year: 2026
     APP_NAME = "OpenAI GPT Chatbot"
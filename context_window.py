@@ -0,0 +1,271 @@
+"""
+Context Window Management for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Token-budgeted prompt construction. Instead of sending the entire
+conversation history on every call, the context builder keeps the prompt
+within the model's context window (reserving room for the completion) using
+one of several trimming strategies.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+from config import Config
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# Context window sizes in tokens, matched by longest model-name prefix
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-3.5-turbo-instruct": 4096,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+
+# Tokens added by the chat format for each message and for priming the reply
+MESSAGE_TOKEN_OVERHEAD = 4
+REPLY_TOKEN_OVERHEAD = 3
+
+CONTEXT_STRATEGIES = ("sliding_window", "keep_first")
+
+_encodings: Dict[str, object] = {}
+
+
+def get_context_window(model: str) -> int:
+    """
+    Get the context window size for a model
+
+    Args:
+        model: Model name
+
+    Returns:
+        Context window size in tokens
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    best = None
+    for prefix in MODEL_CONTEXT_WINDOWS:
+        if model.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return MODEL_CONTEXT_WINDOWS[best] if best else DEFAULT_CONTEXT_WINDOW
+
+
+def _get_encoding(model: str):
+    """Get (and cache) the tiktoken encoding for a model"""
+    encoding = _encodings.get(model)
+    if encoding is None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        _encodings[model] = encoding
+    return encoding
+
+
+def count_tokens(text: Optional[str], model: str = "gpt-3.5-turbo") -> int:
+    """
+    Count the tokens in a piece of text
+
+    Uses tiktoken when it is installed; otherwise falls back to the usual
+    estimate of roughly four characters per token.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer should be used
+
+    Returns:
+        Number of tokens
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_get_encoding(model).encode(text))
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(role: str, content: Optional[str], model: str = "gpt-3.5-turbo") -> int:
+    """
+    Count the tokens a single chat message contributes to the prompt
+
+    Args:
+        role: Message role
+        content: Message content
+        model: Model whose tokenizer should be used
+
+    Returns:
+        Number of tokens including per-message formatting overhead
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return MESSAGE_TOKEN_OVERHEAD + count_tokens(content, model)
+
+
+class ContextBuilder:
+    """
+    Builds the messages list sent to the API within a token budget
+
+    Strategies:
+        sliding_window: keep the most recent messages that fit
+        keep_first: always keep the first ``keep_first`` messages (e.g. the
+            opening request or a loaded template), then the most recent ones
+
+    Pinned messages are kept under every strategy. Token counts are supplied
+    per message by the caller, so history is never re-tokenized.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, strategy: Optional[str] = None, keep_first: Optional[int] = None,
+                 max_messages: Optional[int] = None):
+        """
+        Initialize the context builder
+
+        Args:
+            strategy: Trimming strategy (sliding_window or keep_first)
+            keep_first: Number of leading messages kept by the keep_first strategy
+            max_messages: Maximum history messages sent per request (None for no limit)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.strategy = strategy or Config.CONTEXT_STRATEGY
+        if self.strategy not in CONTEXT_STRATEGIES:
+            raise ValueError(f"Unknown context strategy '{self.strategy}'. "
+                             f"Choose from: {', '.join(CONTEXT_STRATEGIES)}")
+        self.keep_first = Config.CONTEXT_KEEP_FIRST if keep_first is None else keep_first
+        self.max_messages = Config.MAX_CONVERSATION_HISTORY if max_messages is None else max_messages
+        self.last_prompt_tokens = 0
+        self.last_trimmed = 0
+
+    def get_budget(self, model: str, max_tokens: int, system_tokens: int) -> int:
+        """
+        Get the token budget available for conversation history
+
+        Args:
+            model: Model name
+            max_tokens: Tokens reserved for the completion
+            system_tokens: Tokens used by the system prompt
+
+        Returns:
+            Tokens available for history messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return get_context_window(model) - max_tokens - system_tokens - REPLY_TOKEN_OVERHEAD
+
+    def select(self, token_counts: Sequence[int], budget: int,
+               pinned: Iterable[int] = ()) -> List[int]:
+        """
+        Select which history messages to send
+
+        The most recent message (the user's new turn) is always selected.
+
+        Args:
+            token_counts: Token count of each history message
+            budget: Tokens available for history
+            pinned: Indices of messages that must be kept
+
+        Returns:
+            Sorted list of selected message indices
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        total = len(token_counts)
+        if total == 0:
+            return []
+
+        limit = self.max_messages if self.max_messages else total
+        required = set(i for i in pinned if 0 <= i < total)
+        if self.strategy == "keep_first":
+            required.update(range(min(self.keep_first, total)))
+
+        selected = {total - 1}
+        used = token_counts[total - 1]
+        for i in sorted(required):
+            if len(selected) >= limit:
+                break
+            if i in selected or used + token_counts[i] > budget:
+                continue
+            selected.add(i)
+            used += token_counts[i]
+
+        # Fill the remaining budget with the most recent turns
+        for i in range(total - 2, -1, -1):
+            if len(selected) >= limit:
+                break
+            if i in selected:
+                continue
+            if used + token_counts[i] > budget:
+                break
+            selected.add(i)
+            used += token_counts[i]
+
+        self.last_trimmed = total - len(selected)
+        return sorted(selected)
+
+    def select_messages(self, system_tokens: int, token_counts: Sequence[int], model: str,
+                        max_tokens: int, pinned: Iterable[int] = ()) -> List[int]:
+        """
+        Select the history messages for an API call and record the prompt size
+
+        Args:
+            system_tokens: Token count of the system prompt message
+            token_counts: Token count of each history message
+            model: Model name
+            max_tokens: Tokens reserved for the completion
+            pinned: Indices of messages that must be kept
+
+        Returns:
+            Sorted list of selected message indices
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        budget = self.get_budget(model, max_tokens, system_tokens)
+        indices = self.select(token_counts, budget, pinned)
+        self.last_prompt_tokens = (system_tokens + REPLY_TOKEN_OVERHEAD
+                                   + sum(token_counts[i] for i in indices))
+        return indices
+
+    def build(self, system_prompt: str, system_tokens: int, history: Sequence[Dict],
+              token_counts: Sequence[int], model: str, max_tokens: int,
+              pinned: Iterable[int] = ()) -> List[Dict]:
+        """
+        Build the messages list for an API call
+
+        Args:
+            system_prompt: System prompt
+            system_tokens: Token count of the system prompt message
+            history: Conversation history (a ConversationHistory or list of dicts)
+            token_counts: Token count of each history message
+            model: Model name
+            max_tokens: Tokens reserved for the completion
+            pinned: Indices of messages that must be kept
+
+        Returns:
+            Messages list starting with the system prompt
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        indices = self.select_messages(system_tokens, token_counts, model, max_tokens, pinned)
+
+        messages = [{"role": "system", "content": system_prompt}]
+        api_messages = getattr(history, "api_messages", None)
+        if api_messages is not None:
+            messages.extend(api_messages(indices))
+        else:
+            # Local markers such as "truncated" are not part of the API schema
+            messages.extend(history[i] if len(history[i]) == 2
+                            else {"role": history[i]["role"], "content": history[i]["content"]}
+                            for i in indices)
+        return messages
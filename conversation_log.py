@@ -0,0 +1,561 @@
+"""
+Conversation Log for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Append-only, line-delimited JSON storage for a conversation. Every history
+change is one record (``add``, ``pop`` or ``clear``) appended to the file,
+so saving a message costs one small write instead of rewriting the whole
+history. fsync is batched by record count and time. An in-memory offset
+index gives O(1) access to turn N, and records are read lazily through a
+memory map. Dead records are dropped by compaction, and a torn record left
+at the tail by a crash is truncated when the log is opened. Only the
+``CONVERSATION_LOG_MAX_OPEN`` most recently used logs keep their file
+descriptor and map open; the others are closed and reopened on next use.
+"""
+
+import os
+import json
+import mmap
+import time
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+RECORD_ADD_PREFIX = b'{"op":"add"'
+RECORD_POP = b'{"op":"pop"}\n'
+RECORD_CLEAR = b'{"op":"clear"}\n'
+
+
+# Logs holding an open descriptor, least recently used first
+_open_logs: "OrderedDict[ConversationLog, None]" = OrderedDict()
+_open_logs_lock = threading.Lock()
+
+
+def _touch_open_log(log: "ConversationLog"):
+    """Mark a log's descriptor recently used, closing the oldest others past the cap"""
+    with _open_logs_lock:
+        _open_logs[log] = None
+        _open_logs.move_to_end(log)
+        excess = len(_open_logs) - max(1, Config.CONVERSATION_LOG_MAX_OPEN)
+        for victim in list(_open_logs):
+            if excess <= 0:
+                break
+            # A log in use is skipped rather than waited for, so two logs never wait on each other
+            if victim is log or not victim._lock.acquire(blocking=False):
+                continue
+            try:
+                victim._release_file()
+            finally:
+                victim._lock.release()
+            del _open_logs[victim]
+            excess -= 1
+
+
+def _forget_open_log(log: "ConversationLog"):
+    """Drop a closed log from the open set"""
+    with _open_logs_lock:
+        _open_logs.pop(log, None)
+
+
+def encode_record(message: Dict) -> bytes:
+    """
+    Encode a message as an ``add`` record
+
+    Args:
+        message: Conversation message
+
+    Returns:
+        One newline-terminated JSON line
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    record = {"op": "add"}
+    record.update(message)
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode_record(line: bytes) -> Dict:
+    """
+    Decode an ``add`` record back into a message
+
+    Args:
+        line: JSON line
+
+    Returns:
+        Conversation message
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    record = json.loads(line)
+    del record["op"]
+    return record
+
+
+def _is_valid(line: bytes) -> bool:
+    """Check that a complete line is a well-formed record"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(record, dict) and record.get("op") in ("add", "pop", "clear")
+
+
+def scan_records(data):
+    """
+    Replay the records in a log image
+
+    Only the last record is fully parsed: a crash can only tear the tail,
+    so earlier records just have their op checked.
+
+    Args:
+        data: File contents (bytes or memory map)
+
+    Returns:
+        Tuple of (live record starts, live record lengths, record count,
+        end offset of the last valid record)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    starts = array("q")
+    lengths = array("q")
+    records = 0
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = data.find(b"\n", pos)
+        if end < 0:
+            break  # torn: no terminator
+        line = data[pos:end + 1]
+        last = end + 1 == size
+        if last and not _is_valid(line):
+            break
+        if line.startswith(RECORD_ADD_PREFIX):
+            starts.append(pos)
+            lengths.append(end + 1 - pos)
+        elif line == RECORD_POP:
+            if starts:
+                starts.pop()
+                lengths.pop()
+        elif line == RECORD_CLEAR:
+            starts = array("q")
+            lengths = array("q")
+        else:
+            break
+        records += 1
+        pos = end + 1
+    return starts, lengths, records, pos
+
+
+def read_conversation(path: str) -> List[Dict]:
+    """
+    Read the live messages of a log without modifying it
+
+    Args:
+        path: Log file path
+
+    Returns:
+        Conversation messages (a torn tail is ignored)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with open(path, "rb") as f:
+        data = f.read()
+    starts, lengths, _, _ = scan_records(data)
+    return [decode_record(data[start:start + length]) for start, length in zip(starts, lengths)]
+
+
+def _fsync_directory(path: str):
+    """Make a rename in ``path``'s directory durable (POSIX only)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_conversation(path: str, messages: Iterable[Dict]):
+    """
+    Atomically write a compacted log holding ``messages``
+
+    Args:
+        path: Log file path
+        messages: Conversation messages
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for message in messages:
+            f.write(encode_record(message))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path)
+
+
+class ConversationLog:
+    """
+    Append-only conversation log with an offset index
+
+    The file is created on the first write, so sessions that never send a
+    message leave nothing on disk. Appends hold an exclusive ``flock`` and
+    pick up records written by other processes before writing, so
+    concurrent writers never interleave or corrupt records.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, path: str, fsync_every: Optional[int] = None,
+                 fsync_interval: Optional[float] = None, compact_min: Optional[int] = None):
+        """
+        Open a log, recovering from a torn tail if needed
+
+        Args:
+            path: Log file path
+            fsync_every: Records written between fsyncs (1 syncs every record)
+            fsync_interval: Longest time in seconds between fsyncs while writing
+            compact_min: Dead records tolerated before compaction
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.path = path
+        self.fsync_every = max(1, Config.CONVERSATION_LOG_FSYNC_EVERY if fsync_every is None else fsync_every)
+        self.fsync_interval = (Config.CONVERSATION_LOG_FSYNC_INTERVAL
+                               if fsync_interval is None else fsync_interval)
+        self.compact_min = Config.CONVERSATION_LOG_COMPACT_MIN if compact_min is None else compact_min
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._inode = None
+        self._map: Optional[mmap.mmap] = None
+        self._mapped = 0
+        self._starts = array("q")
+        self._lengths = array("q")
+        self._records = 0
+        self._size = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.recovered_bytes = 0
+        self.compactions = 0
+        if os.path.exists(path):
+            self._open()
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the log file across processes"""
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _open(self):
+        """Open (or create) the file and load its index unless it is unchanged since it was closed"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+        status = os.fstat(self._fd)
+        unchanged = status.st_ino == self._inode and status.st_size == self._size
+        self._inode = status.st_ino
+        if not unchanged:
+            with self._file_lock():
+                self._load()
+        _touch_open_log(self)
+
+    def _use_file(self):
+        """Reopen the file if it was closed for other logs and mark it recently used (lock held)"""
+        if self._fd is None:
+            self._open()
+        else:
+            _touch_open_log(self)
+
+    def _release_file(self):
+        """Sync and close the descriptor and map (lock held); the index is kept"""
+        if self._fd is None:
+            return
+        self._sync()
+        self._unmap()
+        os.close(self._fd)
+        self._fd = None
+
+    def _unmap(self):
+        """Drop the read mapping"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._mapped = 0
+
+    def _load(self):
+        """Rebuild the offset index from disk, truncating a torn tail (file lock held)"""
+        self._unmap()
+        size = os.fstat(self._fd).st_size
+        if size:
+            data = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+            try:
+                self._starts, self._lengths, self._records, end = scan_records(data)
+            finally:
+                data.close()
+        else:
+            self._starts, self._lengths, self._records, end = array("q"), array("q"), 0, 0
+        if end < size:
+            os.ftruncate(self._fd, end)
+            os.fsync(self._fd)
+            self.recovered_bytes += size - end
+        self._size = end
+
+    def _replaced(self) -> bool:
+        """Check whether another process compacted (replaced) or deleted the file"""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    def _reopen(self):
+        """Reopen the file after it was replaced and reload the index"""
+        self._unmap()
+        os.close(self._fd)
+        self._open()
+
+    def _with_current_file(self, action: Callable):
+        """Run ``action`` under the file lock once the index matches the file on disk (lock held)"""
+        self._use_file()
+        while True:
+            with self._file_lock():
+                if not self._replaced():
+                    if os.fstat(self._fd).st_size != self._size:
+                        self._load()  # another process appended
+                    return action()
+            self._reopen()
+
+    def _write(self, data: bytes) -> int:
+        """Append raw record bytes and update fsync bookkeeping (lock held)"""
+        def append_record():
+            view = memoryview(data)
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            start = self._size
+            self._size += len(data)
+            self._records += 1
+            self._pending += 1
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+            return start
+
+        return self._with_current_file(append_record)
+
+    def _sync(self):
+        """fsync pending records"""
+        if self._fd is not None and self._pending:
+            os.fsync(self._fd)
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _maybe_compact(self):
+        """Compact once dead records outnumber live ones (lock held)"""
+        dead = self._records - len(self._starts)
+        if dead >= self.compact_min and dead > len(self._starts):
+            self._compact()
+
+    def _read(self, start: int, length: int) -> bytes:
+        """Read a record through the memory map (lock held)"""
+        if start + length > self._mapped:
+            self._unmap()
+            self._map = mmap.mmap(self._fd, self._size, access=mmap.ACCESS_READ)
+            self._mapped = self._size
+        return self._map[start:start + length]
+
+    def _replace_file(self, records: List[bytes]):
+        """Atomically replace the file with ``records`` (lock and file lock held)"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_directory(self.path)
+        # Closing the old descriptor releases the file lock only once the new file is in place
+        old_fd = self._fd
+        self._unmap()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+        self._inode = os.fstat(self._fd).st_ino
+        os.close(old_fd)
+        self._starts = array("q")
+        self._lengths = array("q")
+        offset = 0
+        for record in records:
+            self._starts.append(offset)
+            self._lengths.append(len(record))
+            offset += len(record)
+        self._records = len(records)
+        self._size = offset
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _compact(self):
+        """Rewrite the log with only its live records (lock held)"""
+        def rewrite_live():
+            self._replace_file([self._read(start, length)
+                                for start, length in zip(self._starts, self._lengths)])
+
+        self._with_current_file(rewrite_live)
+        self.compactions += 1
+
+    def append(self, message: Dict):
+        """
+        Append a message
+
+        Args:
+            message: Conversation message
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        record = encode_record(message)
+        with self._lock:
+            start = self._write(record)
+            self._starts.append(start)
+            self._lengths.append(len(record))
+
+    def pop(self):
+        """
+        Remove the last message
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            if not self._starts:
+                return
+            self._write(RECORD_POP)
+            self._starts.pop()
+            self._lengths.pop()
+            self._maybe_compact()
+
+    def clear(self):
+        """
+        Remove every message
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            if self._fd is None and not os.path.exists(self.path):
+                return
+            self._write(RECORD_CLEAR)
+            self._starts = array("q")
+            self._lengths = array("q")
+            self._maybe_compact()
+
+    def replace(self, messages: Iterable[Dict]):
+        """
+        Replace the whole log with ``messages`` (e.g. after loading a file)
+
+        Args:
+            messages: Conversation messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        records = [encode_record(message) for message in messages]
+        with self._lock:
+            self._with_current_file(lambda: self._replace_file(records))
+
+    def compact(self):
+        """
+        Drop records that no longer contribute to the conversation
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            if self._fd is not None or os.path.exists(self.path):
+                self._compact()
+
+    def read(self, index: int) -> Dict:
+        """
+        Read one message without loading the others
+
+        Args:
+            index: Turn index (negative indexes count from the end)
+
+        Returns:
+            Conversation message
+
+        Raises:
+            IndexError: If there is no such turn
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            if self._starts:
+                self._use_file()
+            return decode_record(self._read(self._starts[index], self._lengths[index]))
+
+    def messages(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """
+        Read a range of messages
+
+        Args:
+            start: First turn
+            stop: Turn to stop before (defaults to the end)
+
+        Returns:
+            Conversation messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            if self._starts:
+                self._use_file()
+            return [decode_record(self._read(offset, length))
+                    for offset, length in zip(self._starts[start:stop], self._lengths[start:stop])]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.read(i)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def sync(self):
+        """
+        fsync records written since the last sync
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """
+        Sync and release the file
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._release_file()
+        _forget_open_log(self)
+
+    def stats(self) -> Dict:
+        """
+        Get log statistics
+
+        Returns:
+            Dictionary with message and record counts, file size and recovery info
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return {
+                "messages": len(self._starts),
+                "records": self._records,
+                "bytes": self._size,
+                "unsynced_records": self._pending,
+                "compactions": self.compactions,
+                "recovered_bytes": self.recovered_bytes
+            }
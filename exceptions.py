@@ -0,0 +1,136 @@
+"""
+Exceptions for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Typed errors raised by the chatbot instead of returning error text as if
+it were an assistant message. Each error carries the HTTP status the web
+layer should answer with.
+"""
+
+from typing import Optional
+
+
+class ChatbotError(Exception):
+    """
+    Base class for all chatbot errors
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 500
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initialize the error
+
+        Args:
+            message: Error message
+            retry_after: Seconds the caller should wait before trying again, if known
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UpstreamError(ChatbotError):
+    """
+    The OpenAI API call failed
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False,
+                 retry_after: Optional[float] = None, attempts: int = 1,
+                 cause: Optional[BaseException] = None):
+        """
+        Initialize the error
+
+        Args:
+            message: Error message
+            status_code: Upstream HTTP status code (None for connection errors)
+            retryable: Whether the failure was classified as transient
+            retry_after: Seconds the caller should wait before trying again, if known
+            attempts: Number of attempts made before giving up
+            cause: Original exception
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__(message, retry_after)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.attempts = attempts
+        self.cause = cause
+
+    @property
+    def http_status(self) -> int:
+        """HTTP status for the web layer: 429 when rate limited, 503 when transient, else 502"""
+        if self.status_code == 429:
+            return 429
+        return 503 if self.retryable else 502
+
+
+class RetryBudgetExhausted(UpstreamError):
+    """
+    A retryable failure was not retried because the process retry budget is spent
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    @property
+    def http_status(self) -> int:
+        return 503
+
+
+class RateLimitExceeded(ChatbotError):
+    """
+    The client-side rate limiter shed a request instead of queueing it
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 429
+
+
+class SessionBusy(ChatbotError):
+    """
+    A request found its session's queue full, or waited too long for the
+    requests ahead of it
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 429
+
+
+class BudgetExceeded(ChatbotError):
+    """
+    A request was refused because it would cross a hard spending budget
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 402
+
+
+class SessionConflict(ChatbotError):
+    """
+    A conversation was changed by another request (e.g. a second tab) since this one read it
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 409
+
+
+class ProfilerBusy(ChatbotError):
+    """
+    A profile was requested while another one is still running in this worker
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    http_status = 409
@@ -0,0 +1,235 @@
+"""
+Conversation History Storage for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Compact container for a conversation's messages. Instead of one dict per
+message, history is kept in parallel arrays: a one-byte code per interned
+role, a list of content strings, and packed arrays of cached token counts,
+timestamps and flags. That is roughly 30 bytes of bookkeeping per message
+instead of a few hundred, which adds up across thousands of live sessions.
+The container still reads like a list of ``{"role", "content"}`` dicts.
+"""
+
+import sys
+import time
+from array import array
+from collections import abc
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# Role codes are process-wide; unknown roles are interned on first use
+ROLES: List[str] = ["system", "user", "assistant", "function", "tool"]
+_ROLE_CODES: Dict[str, int] = {role: code for code, role in enumerate(ROLES)}
+
+FLAG_TRUNCATED = 1
+
+# Bytes per message held by the arrays and the content list slot
+SLOT_BYTES = 1 + 8 + 4 + 8 + 1
+STR_OVERHEAD_BYTES = sys.getsizeof("")
+
+
+def role_code(role: str) -> int:
+    """
+    Get the code for a role, interning new roles
+
+    Args:
+        role: Message role
+
+    Returns:
+        One-byte role code
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    code = _ROLE_CODES.get(role)
+    if code is None:
+        if len(ROLES) >= 256:
+            raise ValueError(f"Too many distinct message roles (at '{role}')")
+        code = _ROLE_CODES.setdefault(role, len(ROLES))
+        if code == len(ROLES):
+            ROLES.append(sys.intern(role))
+    return code
+
+
+class ConversationHistory(abc.Sequence):
+    """
+    Conversation messages stored as parallel arrays
+
+    Indexing and iteration yield message dicts, so code written against a
+    list of dicts keeps working. ``api_messages`` builds the request payload
+    directly from the arrays, sharing the content strings.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    __slots__ = ("_roles", "_contents", "_tokens", "_timestamps", "_flags", "_content_bytes")
+
+    def __init__(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._roles = array("B")
+        self._contents: List[Optional[str]] = []
+        self._tokens = array("I")
+        self._timestamps = array("d")
+        self._flags = array("B")
+        self._content_bytes = 0
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Dict],
+                      counter: Callable[[str, Optional[str]], int]) -> "ConversationHistory":
+        """
+        Build a history from message dicts
+
+        Args:
+            messages: Messages with role, content and optional truncated/timestamp
+            counter: Returns the prompt token count of (role, content)
+
+        Returns:
+            New ConversationHistory
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        history = cls()
+        for msg in messages:
+            history.append(msg['role'], msg['content'], counter(msg['role'], msg['content']),
+                           truncated=msg.get('truncated', False), timestamp=msg.get('timestamp'))
+        return history
+
+    def append(self, role: str, content: Optional[str], tokens: int,
+               truncated: bool = False, timestamp: Optional[float] = None):
+        """
+        Append a message
+
+        Args:
+            role: Message role
+            content: Message content
+            tokens: Prompt tokens the message contributes
+            truncated: Mark a reply that was cut short
+            timestamp: Creation time (defaults to now)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._roles.append(role_code(role))
+        self._contents.append(content)
+        self._tokens.append(tokens)
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+        self._flags.append(FLAG_TRUNCATED if truncated else 0)
+        self._content_bytes += STR_OVERHEAD_BYTES + len(content or "")
+
+    def pop(self) -> Dict:
+        """
+        Remove and return the last message
+
+        Returns:
+            The removed message
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        message = self.message(-1)
+        self._roles.pop()
+        content = self._contents.pop()
+        self._tokens.pop()
+        self._timestamps.pop()
+        self._flags.pop()
+        self._content_bytes -= STR_OVERHEAD_BYTES + len(content or "")
+        return message
+
+    def _message(self, i: int, timestamp: bool = False) -> Dict:
+        """Materialize message ``i`` as a dict"""
+        message = {"role": ROLES[self._roles[i]], "content": self._contents[i]}
+        if self._flags[i] & FLAG_TRUNCATED:
+            message["truncated"] = True
+        if timestamp:
+            message["timestamp"] = self._timestamps[i]
+        return message
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._message(i) for i in range(*index.indices(len(self)))]
+        return self._message(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self._message(i)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ConversationHistory, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def role(self, index: int) -> str:
+        """Get the role of message ``index`` without building a dict"""
+        return ROLES[self._roles[index]]
+
+    def content(self, index: int) -> Optional[str]:
+        """Get the content of message ``index`` without building a dict"""
+        return self._contents[index]
+
+    def timestamp(self, index: int) -> float:
+        """Get the creation time of message ``index``"""
+        return self._timestamps[index]
+
+    @property
+    def token_counts(self) -> Sequence[int]:
+        """Cached prompt token count of each message"""
+        return self._tokens
+
+    def api_messages(self, indices: Iterable[int]) -> List[Dict]:
+        """
+        Build the API payload for selected messages
+
+        Only ``role`` and ``content`` are sent; local markers such as
+        ``truncated`` are left out. Content strings are shared, not copied.
+
+        Args:
+            indices: Message indices
+
+        Returns:
+            List of ``{"role", "content"}`` dicts
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        roles, contents = self._roles, self._contents
+        return [{"role": ROLES[roles[i]], "content": contents[i]} for i in indices]
+
+    def message(self, index: int, timestamp: bool = False) -> Dict:
+        """
+        Get one message as a dict
+
+        Args:
+            index: Message index (negative indexes count from the end)
+            timestamp: Include the message's ``timestamp``
+
+        Returns:
+            Message dict
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self._message(range(len(self))[index], timestamp)
+
+    def to_list(self, timestamps: bool = False) -> List[Dict]:
+        """
+        Copy the history out as a list of message dicts
+
+        Args:
+            timestamps: Include each message's ``timestamp``
+
+        Returns:
+            List of messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return [self._message(i, timestamps) for i in range(len(self))]
+
+    def memory_footprint(self) -> int:
+        """
+        Estimate the memory held by the history (O(1))
+
+        Returns:
+            Estimated size in bytes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return len(self) * SLOT_BYTES + self._content_bytes
+
+    def __repr__(self) -> str:
+        return f"ConversationHistory({self.to_list()!r})"
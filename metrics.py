@@ -0,0 +1,450 @@
+"""
+Process-Wide Metrics for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Counters and histograms labelled by model and persona, exported in the
+Prometheus text format at ``/metrics``. Every thread updates its own shard,
+so the request path never takes a lock; shards are only summed when the
+metrics are read. With ``METRICS_MULTIPROC_DIR`` set, each worker process
+writes its totals to a file in that directory every
+``METRICS_FLUSH_INTERVAL`` seconds and a scrape of any worker merges all of
+them, so gunicorn workers report as one service. Clear the directory when
+the service is (re)deployed.
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TTFT_BUCKETS = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0)
+TOKENS_PER_SECOND_BUCKETS = (5, 10, 20, 35, 50, 75, 100, 150, 250, 500)
+INTER_TOKEN_BUCKETS = (0.005, 0.01, 0.02, 0.035, 0.05, 0.075, 0.1, 0.2, 0.5, 1.0)
+LOCK_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0)
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a trailing .0)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format ``{name="value",...}``"""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """
+    Monotonic counter
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    kind = "counter"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str]):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """
+        Add to the counter
+
+        Args:
+            *labels: Label values, in ``labelnames`` order
+            amount: Increment (non-negative)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        shard = self.registry._shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket upper bounds
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    kind = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str,
+                 labelnames: Sequence[str], buckets: Sequence[float]):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        """
+        Record an observation
+
+        Args:
+            value: Observed value
+            *labels: Label values, in ``labelnames`` order
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        shard = self.registry._shard()
+        key = (self.name, labels)
+        # Per-bucket (non-cumulative) counts, then sum and count
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+
+def _merge(into: Dict, key, value):
+    """Add a counter value or histogram state into a merged snapshot"""
+    if isinstance(value, list):
+        current = into.get(key)
+        if current is None:
+            into[key] = list(value)
+        else:
+            for i, v in enumerate(value):
+                current[i] += v
+    else:
+        into[key] = into.get(key, 0) + value
+
+
+class MetricsRegistry:
+    """
+    Sharded metric storage with optional multi-process aggregation
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        """
+        Create a registry
+
+        Args:
+            directory: Directory shared by all worker processes (None for this process only)
+            flush_interval: Seconds between writes of this process's totals to ``directory``
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics: Dict[str, object] = {}
+        self._start_process()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._start_process)
+        if directory:
+            atexit.register(self.flush)
+
+    def _start_process(self):
+        """Reset per-process state (at start and in a forked child)"""
+        self._pid = os.getpid()
+        self._file = None
+        if self.directory:
+            self._file = os.path.join(self.directory, f"metrics_{self._pid}_{uuid.uuid4().hex[:8]}.json")
+        # A child must not report the parent's totals a second time
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str]) -> Counter:
+        """
+        Register a counter
+
+        Args:
+            name: Metric name (``_total`` suffix by convention)
+            documentation: HELP text
+            labelnames: Label names
+
+        Returns:
+            Counter
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        metric = Counter(self, name, documentation, labelnames)
+        self.metrics[name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str],
+                  buckets: Sequence[float]) -> Histogram:
+        """
+        Register a histogram
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names
+            buckets: Bucket upper bounds (+Inf is added)
+
+        Returns:
+            Histogram
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        metric = Histogram(self, name, documentation, labelnames, buckets)
+        self.metrics[name] = metric
+        return metric
+
+    def _shard(self) -> Dict:
+        """Get the calling thread's shard, creating it on first use"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            if self.directory and self._flusher is None:
+                self._start_flusher()
+        return shard
+
+    def _start_flusher(self):
+        """Start the background thread writing this process's totals"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        """Write this process's totals every flush_interval seconds"""
+        pid = self._pid
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass  # Directory unavailable; try again next interval
+
+    def snapshot(self) -> Dict:
+        """
+        Sum this process's shards
+
+        Shards of threads that have exited are folded into one retired
+        shard so short-lived worker threads do not accumulate.
+
+        Returns:
+            Dictionary mapping (name, labels) to a value or histogram state
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    for key, value in list(shard.items()):
+                        _merge(self._retired, key, value)
+            self._shards = live
+            merged: Dict = {}
+            for key, value in self._retired.items():
+                _merge(merged, key, value)
+            for _, shard in live:
+                # Copy first: the owning thread may add keys concurrently
+                for key, value in list(shard.items()):
+                    _merge(merged, key, value)
+        return merged
+
+    def flush(self):
+        """
+        Write this process's totals to the shared directory (atomically)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._file:
+            return
+        records = [[name, list(labels), value] for (name, labels), value in self.snapshot().items()]
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(records, f, separators=(",", ":"))
+        os.replace(tmp, self._file)
+
+    def collect(self) -> Dict:
+        """
+        Get totals across every worker process
+
+        Returns:
+            Merged snapshot (this process only when no directory is configured)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        merged: Dict = {}
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), "r", encoding="utf-8") as f:
+                    records = json.load(f)
+            except (OSError, ValueError):
+                continue  # Replaced or removed while listing
+            for name, labels, value in records:
+                _merge(merged, (name, tuple(labels)), value)
+        return merged
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            Text for a ``/metrics`` response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        samples: Dict[str, List] = {}
+        for (name, labels), value in self.collect().items():
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in sorted(samples.get(name, ())):
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), value):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    bucket_labels = _format_labels(metric.labelnames, labels, f'le="{le}"')
+                    lines.append(f"{name}_bucket{bucket_labels} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(metric.labelnames, labels)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(metric.labelnames, labels)} {_format_value(value[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+class ChatbotMetrics:
+    """
+    The chatbot's metrics, labelled by model and persona
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.registry = registry
+        labels = ("model", "persona")
+        self.requests = registry.counter(
+            "chatbot_requests_total", "Chat requests by outcome (upstream, cached, coalesced, cancelled, error)",
+            labels + ("outcome",))
+        self.retries = registry.counter(
+            "chatbot_retries_total", "Upstream calls retried after a transient error", labels)
+        self.errors = registry.counter(
+            "chatbot_errors_total", "Failed chat requests by error class", labels + ("error",))
+        self.prompt_tokens = registry.counter(
+            "chatbot_prompt_tokens_total", "Prompt tokens sent upstream", labels)
+        self.completion_tokens = registry.counter(
+            "chatbot_completion_tokens_total", "Completion tokens received", labels)
+        self.cost = registry.counter(
+            "chatbot_cost_usd_total", "Spend in US dollars at list prices (see pricing.py)", labels)
+        self.latency = registry.histogram(
+            "chatbot_upstream_latency_seconds", "Duration of successful upstream calls (whole stream when streaming)",
+            labels, LATENCY_BUCKETS)
+        self.ttft = registry.histogram(
+            "chatbot_time_to_first_token_seconds", "Time from sending a streaming request to its first token",
+            labels, TTFT_BUCKETS)
+        self.tokens_per_second = registry.histogram(
+            "chatbot_tokens_per_second", "Completion tokens per second of generation",
+            labels, TOKENS_PER_SECOND_BUCKETS)
+        self.inter_token_latency = registry.histogram(
+            "chatbot_inter_token_latency_seconds", "Mean gap between streamed tokens, one sample per stream",
+            labels, INTER_TOKEN_BUCKETS)
+        self.session_lock_wait = registry.histogram(
+            "chatbot_session_lock_wait_seconds", "Time requests waited for their session's earlier requests",
+            (), LOCK_WAIT_BUCKETS)
+        self.session_lock_rejections = registry.counter(
+            "chatbot_session_lock_rejections_total", "Requests refused while waiting for their session (queue_full, timeout)",
+            ("reason",))
+        self.stage_duration = registry.histogram(
+            "chatbot_stage_duration_seconds", "Duration of traced request stages by span name (see tracing.py)",
+            ("stage",), STAGE_BUCKETS)
+
+    def observe_completion(self, model: str, persona: str, started: float, finished: float,
+                           completion_tokens: int, first_token: Optional[float] = None,
+                           prompt_tokens: Optional[int] = None,
+                           inter_token_latency: Optional[float] = None):
+        """
+        Record a successful upstream call
+
+        Args:
+            model: Model name
+            persona: Persona key
+            started: ``time.perf_counter()`` when the request was sent
+            finished: ``time.perf_counter()`` when the reply was complete
+            completion_tokens: Completion tokens (counted or estimated)
+            first_token: ``time.perf_counter()`` of the first streamed token
+            prompt_tokens: Prompt tokens, when the API reported them
+            inter_token_latency: Mean seconds between streamed tokens
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.requests.inc(model, persona, "upstream")
+        self.latency.observe(finished - started, model, persona)
+        if first_token is not None:
+            self.ttft.observe(first_token - started, model, persona)
+        generating = finished - (first_token if first_token is not None else started)
+        if completion_tokens and generating > 0:
+            self.tokens_per_second.observe(completion_tokens / generating, model, persona)
+        if inter_token_latency is not None:
+            self.inter_token_latency.observe(inter_token_latency, model, persona)
+        if prompt_tokens:
+            self.prompt_tokens.inc(model, persona, amount=prompt_tokens)
+        if completion_tokens:
+            self.completion_tokens.inc(model, persona, amount=completion_tokens)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format
+
+        Returns:
+            Exposition text
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.registry.render()
+
+
+_metrics: Optional[ChatbotMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Optional[ChatbotMetrics]:
+    """
+    Get the process-wide chatbot metrics
+
+    Returns:
+        Shared ChatbotMetrics, or None if metrics are disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _metrics
+    if not Config.METRICS_ENABLED:
+        return None
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = ChatbotMetrics(MetricsRegistry(Config.METRICS_MULTIPROC_DIR,
+                                                          Config.METRICS_FLUSH_INTERVAL))
+    return _metrics
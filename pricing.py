@@ -0,0 +1,312 @@
+"""
+Pricing, Cost Accounting and Budgets for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Turns token usage into money. A per-model price table (USD per million
+input and output tokens, overridable with ``MODEL_PRICES``) prices every
+request, and costs are added up per session, per API key and per process.
+Budgets are checked before a request is sent: past the soft budget the
+request is downgraded to ``BUDGET_DOWNGRADE_MODEL``, and a request whose
+estimated cost would cross the hard budget is refused with BudgetExceeded.
+A model missing from the table is priced at ``UNKNOWN_MODEL_PRICE``; with
+no fallback price it is refused while any hard budget is set, since its
+spend could not be counted.
+API keys are identified by a short hash, never stored in the clear.
+"""
+
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from exceptions import BudgetExceeded
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# USD per 1M tokens: (input, output). Dated snapshots match by prefix.
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4": (30.00, 60.00),
+    "gpt-4-32k": (60.00, 120.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4-turbo-preview": (10.00, 30.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+TOKENS_PER_UNIT = 1_000_000
+
+
+def _load_prices() -> Dict[str, Tuple[float, float]]:
+    """Merge the default table with Config.MODEL_PRICES (a dict or a JSON string)"""
+    prices = dict(DEFAULT_PRICES)
+    overrides = Config.MODEL_PRICES
+    if isinstance(overrides, str):
+        overrides = json.loads(overrides) if overrides.strip() else {}
+    for model, (input_price, output_price) in (overrides or {}).items():
+        prices[model] = (float(input_price), float(output_price))
+    return prices
+
+
+def _load_fallback_price() -> Optional[Tuple[float, float]]:
+    """Parse Config.UNKNOWN_MODEL_PRICE (a pair or a JSON string), or None when unset"""
+    fallback = Config.UNKNOWN_MODEL_PRICE
+    if isinstance(fallback, str):
+        fallback = json.loads(fallback) if fallback.strip() else None
+    if not fallback:
+        return None
+    input_price, output_price = fallback
+    return float(input_price), float(output_price)
+
+
+_prices = _load_prices()
+_fallback_price = _load_fallback_price()
+
+
+def get_price(model: str) -> Optional[Tuple[float, float]]:
+    """
+    Look up a model's prices
+
+    Exact names win; otherwise the longest table entry that prefixes the
+    model (``gpt-4o-2024-08-06`` is priced as ``gpt-4o``).
+
+    Args:
+        model: Model name
+
+    Returns:
+        (input, output) USD per million tokens, or None for an unknown model
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    price = _prices.get(model)
+    if price is not None:
+        return price
+    matches = [name for name in _prices if model.startswith(name + "-")]
+    return _prices[max(matches, key=len)] if matches else None
+
+
+def compute_cost(model: str, prompt_tokens: int, completion_tokens: int, discount: float = 1.0) -> float:
+    """
+    Price a request
+
+    Args:
+        model: Model name
+        prompt_tokens: Input tokens
+        completion_tokens: Output tokens
+        discount: Multiplier applied to the list price (e.g. 0.5 for the Batch API)
+
+    Returns:
+        Cost in USD (a model missing from the price table is priced at
+        UNKNOWN_MODEL_PRICE, or 0.0 when that is unset)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    price = get_price(model) or _fallback_price
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) * discount / TOKENS_PER_UNIT
+
+
+def key_id(api_key: Optional[str]) -> str:
+    """
+    Get a stable, non-secret identifier for an API key
+
+    Args:
+        api_key: API key
+
+    Returns:
+        ``key-`` followed by 12 hex characters of its SHA-256
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return "key-" + hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+
+def _empty_totals() -> Dict:
+    """Zeroed usage totals"""
+    return {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0}
+
+
+def _add(totals: Dict, prompt_tokens: int, completion_tokens: int, cost: float, requests: int):
+    """Add requests to usage totals"""
+    totals["requests"] += requests
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["cost"] += cost
+
+
+class CostLedger:
+    """
+    Process-wide usage and cost totals by API key and model
+
+    Per-key spend is also kept for the current budget window
+    (``BUDGET_WINDOW`` seconds, aligned to the epoch) so key budgets reset
+    on their own.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        """
+        Create an empty ledger
+
+        Args:
+            window: Budget window in seconds (defaults to Config.BUDGET_WINDOW)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.window = Config.BUDGET_WINDOW if window is None else window
+        self.total = _empty_totals()
+        self.unpriced_requests = 0
+        self._keys: Dict[str, Dict] = {}
+        self._models: Dict[str, Dict] = {}
+        self._window_start = 0.0
+        self._window_spend: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _roll_window(self, now: float):
+        """Start a new budget window if the current one has ended (lock held)"""
+        start = now - now % self.window if self.window else 0.0
+        if start != self._window_start:
+            self._window_start = start
+            self._window_spend = {}
+
+    def record(self, key: str, model: str, prompt_tokens: int, completion_tokens: int, cost: float,
+               requests: int = 1):
+        """
+        Add usage
+
+        Args:
+            key: API key identifier (see key_id)
+            model: Model that served the requests
+            prompt_tokens: Input tokens
+            completion_tokens: Output tokens
+            cost: Cost in USD
+            requests: Number of requests the usage covers
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._roll_window(time.time())
+            _add(self.total, prompt_tokens, completion_tokens, cost, requests)
+            _add(self._keys.setdefault(key, _empty_totals()), prompt_tokens, completion_tokens, cost, requests)
+            _add(self._models.setdefault(model, _empty_totals()), prompt_tokens, completion_tokens, cost, requests)
+            self._window_spend[key] = self._window_spend.get(key, 0.0) + cost
+            if get_price(model) is None:
+                self.unpriced_requests += requests
+
+    def window_spend(self, key: str) -> float:
+        """
+        Get a key's spend in the current budget window
+
+        Args:
+            key: API key identifier
+
+        Returns:
+            USD spent this window
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._roll_window(time.time())
+            return self._window_spend.get(key, 0.0)
+
+    def stats(self) -> Dict:
+        """
+        Get the ledger's totals
+
+        Returns:
+            Dictionary with process totals and breakdowns by key and model
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._roll_window(time.time())
+            return {
+                "process": dict(self.total, cost=round(self.total["cost"], 6)),
+                "keys": {
+                    key: dict(totals, cost=round(totals["cost"], 6),
+                              window_cost=round(self._window_spend.get(key, 0.0), 6))
+                    for key, totals in self._keys.items()
+                },
+                "models": {model: dict(totals, cost=round(totals["cost"], 6))
+                           for model, totals in self._models.items()},
+                "unpriced_requests": self.unpriced_requests,
+                "budget_window": self.window,
+                "window_start": self._window_start
+            }
+
+
+def budgets_enabled() -> bool:
+    """Whether any soft or hard budget is configured"""
+    return bool(Config.BUDGET_SESSION_SOFT or Config.BUDGET_SESSION_HARD
+                or Config.BUDGET_KEY_SOFT or Config.BUDGET_KEY_HARD)
+
+
+def check_budget(model: str, prompt_tokens: int, max_tokens: int,
+                 session_spent: float, key_spent: float, discount: float = 1.0) -> str:
+    """
+    Decide which model a request may use under the configured budgets
+
+    The request is priced at its worst case (the prompt plus ``max_tokens``
+    of output), so a request that passes cannot overshoot a hard budget.
+
+    Args:
+        model: Requested model
+        prompt_tokens: Estimated prompt tokens
+        max_tokens: Completion token limit
+        session_spent: USD the session has spent so far
+        key_spent: USD the API key has spent this budget window
+        discount: Multiplier applied to the list price (e.g. 0.5 for the Batch API)
+
+    Returns:
+        The model to send the request with (``model`` or the downgrade model)
+
+    Raises:
+        BudgetExceeded: If the request would cross a hard budget, or a hard
+            budget is set and the model has no price to count against it
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    downgrade = Config.BUDGET_DOWNGRADE_MODEL
+    over_soft = ((Config.BUDGET_SESSION_SOFT and session_spent >= Config.BUDGET_SESSION_SOFT)
+                 or (Config.BUDGET_KEY_SOFT and key_spent >= Config.BUDGET_KEY_SOFT))
+    if over_soft and downgrade:
+        model = downgrade
+    hard = Config.BUDGET_SESSION_HARD or Config.BUDGET_KEY_HARD
+    if hard and get_price(model) is None and _fallback_price is None:
+        raise BudgetExceeded(
+            f"Model '{model}' has no price, so a hard budget cannot be enforced for it "
+            f"(add it to MODEL_PRICES or set UNKNOWN_MODEL_PRICE)"
+        )
+    estimated_cost = compute_cost(model, prompt_tokens, max_tokens, discount)
+
+    for scope, spent, limit in (("session", session_spent, Config.BUDGET_SESSION_HARD),
+                                ("API key", key_spent, Config.BUDGET_KEY_HARD)):
+        if limit and spent + estimated_cost > limit:
+            raise BudgetExceeded(
+                f"The {scope} budget of ${limit:.2f} would be exceeded "
+                f"(spent ${spent:.4f}, this request up to ${estimated_cost:.4f})"
+            )
+    return model
+
+
+_ledger: Optional[CostLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_cost_ledger() -> CostLedger:
+    """
+    Get the process-wide cost ledger
+
+    Returns:
+        Shared CostLedger
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = CostLedger()
+    return _ledger
@@ -0,0 +1,184 @@
+"""
+On-Demand Sampling Profiler for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Profiles a running worker without restarting it or installing anything.
+For the requested number of seconds the thread serving the request
+samples the Python stack of every other thread every ``PROFILER_INTERVAL`` seconds and
+counts identical stacks. The result is in the folded ("collapsed") format,
+one ``root;caller;callee count`` line per distinct stack, which
+flamegraph.pl, speedscope and most flame graph viewers read directly.
+Only the worker that receives the ``/api/debug/profile`` request is
+profiled. Stacks of idle threads (waiting on a lock, a queue or a socket)
+are left out unless asked for; threads blocked on the upstream API are
+kept, so the graph shows wall-clock time rather than CPU time.
+"""
+
+import os
+import sys
+import hmac
+import time
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from config import Config
+from exceptions import ProfilerBusy
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# (file name, function) of innermost frames that mean the thread is waiting
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("selectors.py", "poll"),
+    ("socket.py", "accept"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack and aggregates the samples as folded stacks
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 60.0):
+        """
+        Initialize the profiler
+
+        Args:
+            interval: Seconds between samples
+            max_seconds: Longest profile that may be requested
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self._running = threading.Lock()
+        self._labels: Dict = {}
+        self._prefixes = sorted({os.path.join(os.path.abspath(path), "") for path in sys.path if path},
+                                key=len, reverse=True)
+
+    def _label(self, code) -> str:
+        """``function (file:line)`` label of a code object, cached"""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self._prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix):]
+                    break
+            label = self._labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+        return label
+
+    def _stack(self, frame) -> tuple:
+        """Stack of a frame, outermost call first"""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        return tuple(codes)
+
+    def profile(self, seconds: float, interval: Optional[float] = None, idle: bool = False) -> Dict:
+        """
+        Sample the process for a while
+
+        Blocks the calling thread for ``seconds``; run it off the event loop
+        in async servers.
+
+        Args:
+            seconds: How long to sample (capped at max_seconds)
+            interval: Seconds between samples (defaults to the configured interval)
+            idle: Whether to keep stacks of threads that are only waiting
+
+        Returns:
+            Dictionary with the folded stacks ("folded"), samples taken and
+            the actual duration and interval
+
+        Raises:
+            ProfilerBusy: If another profile is running in this process
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running in this worker")
+        try:
+            seconds = max(0.0, min(seconds, self.max_seconds))
+            interval = max(0.001, interval or self.interval)
+            counts: Counter = Counter()
+            samples = 0
+            me = threading.get_ident()
+            started = time.perf_counter()
+            deadline = started + seconds
+            while True:
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    code = frame.f_code
+                    if not idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                        continue
+                    counts[self._stack(frame)] += 1
+                samples += 1
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                time.sleep(min(interval, deadline - now))
+            elapsed = time.perf_counter() - started
+        finally:
+            self._running.release()
+
+        lines = [";".join(self._label(code) for code in stack) + f" {count}"
+                 for stack, count in counts.most_common()]
+        return {
+            "folded": "\n".join(lines) + ("\n" if lines else ""),
+            "samples": samples,
+            "stacks": len(counts),
+            "seconds": round(elapsed, 3),
+            "interval": interval
+        }
+
+
+def token_valid(token: Optional[str]) -> bool:
+    """
+    Check the ``X-Profiler-Token`` header of a profile request
+
+    Args:
+        token: Header value, if sent
+
+    Returns:
+        True if no PROFILER_TOKEN is configured or the token matches it
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not Config.PROFILER_TOKEN:
+        return True
+    return hmac.compare_digest((token or "").encode("utf-8"), Config.PROFILER_TOKEN.encode("utf-8"))
+
+
+_profiler: Optional[SamplingProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """
+    Get the process-wide sampling profiler
+
+    Returns:
+        Shared SamplingProfiler, or None if the profiler endpoint is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _profiler
+    if not Config.PROFILER_ENABLED:
+        return None
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler(Config.PROFILER_INTERVAL, Config.PROFILER_MAX_SECONDS)
+    return _profiler
@@ -0,0 +1,212 @@
+"""
+Incremental Prompt Builder for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Builds the serialized JSON request body for a chat completion without
+rebuilding the ``messages`` list or re-encoding the whole conversation on
+every call. Each message in the current context window is encoded once and
+kept as bytes; when the window only grew since the last call, the previous
+``messages`` array is reused as a prefix and just the new turns are
+appended. The body is posted as raw bytes, which also skips the SDK's
+per-message parameter transformation.
+"""
+
+import json
+from json.encoder import encode_basestring
+from typing import Dict, List, Optional, Sequence
+
+from openai import AsyncStream, Stream
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+CHAT_COMPLETIONS_PATH = "/chat/completions"
+
+
+def encode_message(role: str, content: Optional[str]) -> bytes:
+    """
+    Encode one chat message as JSON
+
+    Args:
+        role: Message role
+        content: Message content
+
+    Returns:
+        ``{"role":...,"content":...}`` as UTF-8 bytes
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    encoded = "null" if content is None else encode_basestring(content)
+    return ('{"role":' + encode_basestring(role) + ',"content":' + encoded + '}').encode("utf-8")
+
+
+def build_body(api_params: Dict, messages_json: bytes) -> bytes:
+    """
+    Splice a pre-serialized messages array into the request body
+
+    Args:
+        api_params: API parameters without ``messages``
+        messages_json: Serialized messages array
+
+    Returns:
+        Request body as UTF-8 JSON bytes
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    params = json.dumps(api_params, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    separator = b"," if len(params) > 2 else b""
+    return b'{"messages":' + messages_json + separator + params[1:]
+
+
+def post_chat_completion(client, api_params: Dict, messages_json: bytes):
+    """
+    Create a chat completion from a pre-serialized prompt
+
+    Args:
+        client: OpenAI client
+        api_params: API parameters without ``messages``
+        messages_json: Serialized messages array
+
+    Returns:
+        Chat completion, or a stream of chunks when api_params has stream=True
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return client.post(
+        CHAT_COMPLETIONS_PATH,
+        body=build_body(api_params, messages_json),
+        cast_to=ChatCompletion,
+        stream=bool(api_params.get("stream")),
+        stream_cls=Stream[ChatCompletionChunk]
+    )
+
+
+async def post_chat_completion_async(client, api_params: Dict, messages_json: bytes):
+    """
+    Create a chat completion from a pre-serialized prompt with an async client
+
+    Args:
+        client: AsyncOpenAI client
+        api_params: API parameters without ``messages``
+        messages_json: Serialized messages array
+
+    Returns:
+        Chat completion, or an async stream of chunks when api_params has stream=True
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return await client.post(
+        CHAT_COMPLETIONS_PATH,
+        body=build_body(api_params, messages_json),
+        cast_to=ChatCompletion,
+        stream=bool(api_params.get("stream")),
+        stream_cls=AsyncStream[ChatCompletionChunk]
+    )
+
+
+class PromptBuilder:
+    """
+    Per-session cache of the serialized prompt
+
+    Encoded messages are cached only for the current context window, so the
+    cache never holds more than one prompt's worth of bytes. The owner must
+    call ``invalidate`` when history changes other than by appending.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._system_prompt: Optional[str] = None
+        self._system_json = b""
+        self._fragments: Dict[int, bytes] = {}
+        self._indices: List[int] = []
+        self._prefix = b""
+        self.appends = 0
+        self.rebuilds = 0
+        self.encoded_messages = 0
+
+    def invalidate(self):
+        """
+        Forget everything cached (history was popped, cleared or replaced)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._system_prompt = None
+        self._system_json = b""
+        self._fragments = {}
+        self._indices = []
+        self._prefix = b""
+
+    def _fragment(self, history, i: int) -> bytes:
+        """Get the encoded form of history message ``i``"""
+        fragment = self._fragments.get(i)
+        if fragment is None:
+            fragment = encode_message(history.role(i), history.content(i))
+            self.encoded_messages += 1
+        return fragment
+
+    def messages_json(self, system_prompt: str, history, indices: Sequence[int]) -> bytes:
+        """
+        Get the serialized messages array for a prompt
+
+        Args:
+            system_prompt: System prompt
+            history: ConversationHistory
+            indices: Selected history indices, ascending
+
+        Returns:
+            JSON array of the system message followed by the selected messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if system_prompt != self._system_prompt:
+            self.invalidate()
+            self._system_prompt = system_prompt
+            self._system_json = encode_message("system", system_prompt)
+
+        previous = len(self._indices)
+        if previous and len(indices) >= previous and indices[previous - 1] == self._indices[-1] \
+                and list(indices[:previous]) == self._indices:
+            # The window only grew: keep the previous array and append the new turns
+            fragments = self._fragments
+            parts = [self._prefix]
+            for i in indices[previous:]:
+                fragment = self._fragment(history, i)
+                fragments[i] = fragment
+                parts.append(fragment)
+            self._prefix = b",".join(parts)
+            self.appends += 1
+        else:
+            # Trimmed or first build: reassemble from cached fragments where possible
+            fragments = {i: self._fragment(history, i) for i in indices}
+            self._prefix = b",".join([self._system_json] + [fragments[i] for i in indices])
+            self.rebuilds += 1
+        self._fragments = fragments
+        self._indices = list(indices)
+        return b"[" + self._prefix + b"]"
+
+    def memory_footprint(self) -> int:
+        """
+        Estimate the memory held by the cache
+
+        Returns:
+            Estimated size in bytes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Fragments and the joined prefix hold the prompt roughly twice
+        return 2 * len(self._prefix)
+
+    def stats(self) -> Dict:
+        """
+        Get builder statistics
+
+        Returns:
+            Dictionary with append/rebuild counts and messages encoded
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return {
+            "appends": self.appends,
+            "rebuilds": self.rebuilds,
+            "encoded_messages": self.encoded_messages,
+            "cached_bytes": len(self._prefix)
+        }
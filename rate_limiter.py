@@ -0,0 +1,402 @@
+"""
+Client-Side Rate Limiter for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Shared requests-per-minute and tokens-per-minute limiter that sits in front
+of every chat completion call. Each model gets two token buckets (requests
+and estimated tokens). When a call would exceed a limit it is queued until
+capacity frees up, or shed with RateLimitExceeded once the wait would be too
+long. The bucket state can live in process memory or in a lock-protected
+file so every gunicorn worker on a host respects the same limits.
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from exceptions import RateLimitExceeded
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class MemoryRateLimitBackend:
+    """
+    Bucket state held in this process only
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    # Calls only take an in-process lock, so async callers run them inline
+    blocking = False
+
+    def __init__(self):
+        # model -> [request_level, token_level, updated]
+        self._state: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, model: str, tokens: int, rpm: float, tpm: float) -> float:
+        """
+        Reserve one request and ``tokens`` tokens if both buckets allow it
+
+        Args:
+            model: Model name
+            tokens: Estimated tokens for the request
+            rpm: Requests-per-minute limit
+            tpm: Tokens-per-minute limit
+
+        Returns:
+            0.0 if reserved, otherwise seconds until the reservation could succeed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return _take(self._state, model, tokens, rpm, tpm, time.monotonic())
+
+    def adjust(self, model: str, tokens: int):
+        """
+        Return (positive) or charge (negative) tokens once actual usage is known
+
+        Args:
+            model: Model name
+            tokens: Token delta to add back to the bucket
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            entry = self._state.get(model)
+            if entry is not None:
+                entry[1] += tokens
+
+
+class FileRateLimitBackend:
+    """
+    Bucket state shared between processes through a small lock-protected file
+
+    Every worker on the host reads and updates the same JSON state under an
+    exclusive ``flock``, so all of them draw from one set of buckets.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    # Calls wait on flock and rewrite the file, so async callers run them in a thread
+    blocking = True
+
+    def __init__(self, path: str):
+        """
+        Initialize the backend
+
+        Args:
+            path: State file path (created if missing)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if fcntl is None:
+            raise RuntimeError("FileRateLimitBackend requires fcntl (POSIX only)")
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread_lock = threading.Lock()
+
+    def _update(self, fn):
+        """Run ``fn(state)`` on the shared state under an exclusive file lock"""
+        with self._thread_lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                result = fn(state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_acquire(self, model: str, tokens: int, rpm: float, tpm: float) -> float:
+        """
+        Reserve one request and ``tokens`` tokens if both buckets allow it
+
+        Args:
+            model: Model name
+            tokens: Estimated tokens for the request
+            rpm: Requests-per-minute limit
+            tpm: Tokens-per-minute limit
+
+        Returns:
+            0.0 if reserved, otherwise seconds until the reservation could succeed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Wall-clock time so every process agrees on refill
+        return self._update(lambda state: _take(state, model, tokens, rpm, tpm, time.time()))
+
+    def adjust(self, model: str, tokens: int):
+        """
+        Return (positive) or charge (negative) tokens once actual usage is known
+
+        Args:
+            model: Model name
+            tokens: Token delta to add back to the bucket
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def apply(state):
+            entry = state.get(model)
+            if entry is not None:
+                entry[1] += tokens
+        self._update(apply)
+
+
+def _take(state: Dict[str, list], model: str, tokens: int, rpm: float, tpm: float, now: float) -> float:
+    """
+    Refill and draw from a model's request and token buckets
+
+    Buckets hold up to one minute of capacity and refill continuously.
+
+    Returns:
+        0.0 if reserved, otherwise seconds until the reservation could succeed
+    """
+    entry = state.get(model)
+    if entry is None:
+        entry = state[model] = [rpm, tpm, now]
+    elapsed = max(0.0, now - entry[2])
+    entry[0] = min(rpm, entry[0] + elapsed * rpm / 60)
+    entry[1] = min(tpm, entry[1] + elapsed * tpm / 60)
+    entry[2] = now
+
+    # A request larger than the whole bucket can only ever run on a full bucket
+    tokens = min(tokens, tpm)
+    if entry[0] >= 1 and entry[1] >= tokens:
+        entry[0] -= 1
+        entry[1] -= tokens
+        return 0.0
+
+    request_wait = (1 - entry[0]) * 60 / rpm if entry[0] < 1 else 0.0
+    token_wait = (tokens - entry[1]) * 60 / tpm if entry[1] < tokens else 0.0
+    return max(request_wait, token_wait, 0.001)
+
+
+class RateLimiter:
+    """
+    RPM/TPM limiter shared by every session in a process (or host)
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, backend=None, mode: Optional[str] = None, max_wait: Optional[float] = None,
+                 model_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_rpm: Optional[float] = None, default_tpm: Optional[float] = None):
+        """
+        Initialize the rate limiter
+
+        Args:
+            backend: Bucket state backend (defaults to in-process memory)
+            mode: "queue" to wait for capacity, "shed" to reject immediately
+            max_wait: Longest a queued request may wait before it is shed
+            model_limits: Per-model (rpm, tpm) overrides
+            default_rpm: Requests-per-minute limit for models without an override
+            default_tpm: Tokens-per-minute limit for models without an override
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.backend = backend or MemoryRateLimitBackend()
+        self.mode = mode or Config.RATE_LIMIT_MODE
+        if self.mode not in ("queue", "shed"):
+            raise ValueError(f"Unknown rate limit mode '{self.mode}'. Choose from: queue, shed")
+        self.max_wait = Config.RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+        self.model_limits = dict(Config.MODEL_RATE_LIMITS if model_limits is None else model_limits)
+        self.default_rpm = default_rpm or Config.RATE_LIMIT_RPM
+        self.default_tpm = default_tpm or Config.RATE_LIMIT_TPM
+
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict] = {}
+
+    @property
+    def blocking(self) -> bool:
+        """Whether backend calls may block (async callers then run them in a thread)"""
+        return getattr(self.backend, "blocking", True)
+
+    def get_limits(self, model: str) -> Tuple[float, float]:
+        """
+        Get the (rpm, tpm) limits for a model
+
+        Args:
+            model: Model name
+
+        Returns:
+            Tuple of (requests per minute, tokens per minute)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.model_limits.get(model, (self.default_rpm, self.default_tpm))
+
+    def _record(self, model: str, waited: float, shed: bool = False):
+        """Update wait-time metrics for a model"""
+        with self._lock:
+            metrics = self._metrics.get(model)
+            if metrics is None:
+                metrics = self._metrics[model] = {
+                    "admitted": 0,
+                    "queued": 0,
+                    "shed": 0,
+                    "total_wait": 0.0,
+                    "max_wait": 0.0
+                }
+            if shed:
+                metrics["shed"] += 1
+            else:
+                metrics["admitted"] += 1
+            if waited > 0:
+                metrics["queued"] += 1
+                metrics["total_wait"] += waited
+                metrics["max_wait"] = max(metrics["max_wait"], waited)
+
+    def _check(self, model: str, tokens: int, waited: float) -> float:
+        """
+        Try to reserve capacity
+
+        Returns:
+            0.0 when admitted, otherwise seconds to sleep before trying again
+
+        Raises:
+            RateLimitExceeded: If the request should be shed
+        """
+        rpm, tpm = self.get_limits(model)
+        wait = self.backend.try_acquire(model, tokens, rpm, tpm)
+        if wait == 0.0:
+            self._record(model, waited)
+            return 0.0
+        if self.mode == "shed" or waited + wait > self.max_wait:
+            self._record(model, waited, shed=True)
+            raise RateLimitExceeded(
+                f"Rate limit for {model} reached ({rpm:g} RPM / {tpm:g} TPM); retry in {wait:.1f}s",
+                retry_after=wait
+            )
+        return wait
+
+    def acquire(self, model: str, tokens: int):
+        """
+        Block until a request of ``tokens`` estimated tokens may be sent
+
+        Args:
+            model: Model name
+            tokens: Estimated prompt plus completion tokens
+
+        Raises:
+            RateLimitExceeded: If the request is shed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        waited = 0.0
+        while True:
+            wait = self._check(model, tokens, waited)
+            if not wait:
+                return
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, model: str, tokens: int):
+        """
+        Wait without blocking the event loop until a request may be sent
+
+        Args:
+            model: Model name
+            tokens: Estimated prompt plus completion tokens
+
+        Raises:
+            RateLimitExceeded: If the request is shed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        blocking = self.blocking
+        waited = 0.0
+        while True:
+            if blocking:
+                wait = await asyncio.to_thread(self._check, model, tokens, waited)
+            else:
+                wait = self._check(model, tokens, waited)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def reconcile(self, model: str, estimated: int, actual: int):
+        """
+        Correct the token bucket once the real usage of a request is known
+
+        Args:
+            model: Model name
+            estimated: Tokens reserved before the call
+            actual: Tokens actually used
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if actual and actual != estimated:
+            self.backend.adjust(model, estimated - actual)
+
+    async def reconcile_async(self, model: str, estimated: int, actual: int):
+        """
+        Correct the token bucket without blocking the event loop
+
+        Args:
+            model: Model name
+            estimated: Tokens reserved before the call
+            actual: Tokens actually used
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.blocking:
+            await asyncio.to_thread(self.reconcile, model, estimated, actual)
+        else:
+            self.reconcile(model, estimated, actual)
+
+    def stats(self) -> Dict:
+        """
+        Get limiter metrics per model
+
+        Returns:
+            Dictionary of admitted/queued/shed counts and wait times
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            stats = {}
+            for model, metrics in self._metrics.items():
+                model_stats = metrics.copy()
+                model_stats["avg_wait"] = (metrics["total_wait"] / metrics["queued"]
+                                           if metrics["queued"] else 0.0)
+                model_stats["rpm"], model_stats["tpm"] = self.get_limits(model)
+                stats[model] = model_stats
+            return stats
+
+
+_default_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get the process-wide rate limiter
+
+    Returns:
+        Shared RateLimiter, or None if rate limiting is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _default_limiter
+    if not Config.RATE_LIMIT_ENABLED:
+        return None
+    if _default_limiter is None:
+        with _limiter_lock:
+            if _default_limiter is None:
+                if Config.RATE_LIMIT_BACKEND == "file":
+                    backend = FileRateLimitBackend(Config.RATE_LIMIT_FILE)
+                else:
+                    backend = MemoryRateLimitBackend()
+                _default_limiter = RateLimiter(backend=backend)
+    return _default_limiter
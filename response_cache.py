@@ -0,0 +1,362 @@
+"""
+Response Cache for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Opt-in cache for deterministic (temperature 0) completions. Entries are
+keyed on a canonical hash of the request (model, messages, temperature,
+max_tokens, functions) and kept in an in-memory LRU tier backed by an
+optional sqlite tier that survives restarts and is shared by every worker
+on the host. Both tiers expire entries after a TTL and are size limited.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import Config
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+CACHE_KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "functions")
+
+_REPLAY_CHUNK_PATTERN = re.compile(r"\s*\S+|\s+")
+
+
+def make_cache_key(api_params: dict) -> str:
+    """
+    Build a canonical hash of the parts of a request that determine its reply
+
+    Args:
+        api_params: API parameters dictionary
+
+    Returns:
+        Hex digest identifying the request
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    canonical = {field: api_params.get(field) for field in CACHE_KEY_FIELDS}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def replay_chunks(content: str) -> List[str]:
+    """
+    Split a cached reply into word-sized chunks for streaming replay
+
+    Args:
+        content: Cached reply
+
+    Returns:
+        Chunks that join back into ``content``
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return _REPLAY_CHUNK_PATTERN.findall(content)
+
+
+class MemoryCacheTier:
+    """
+    In-process LRU tier with a TTL
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        """
+        Initialize the tier
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (content, created)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached reply, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, content: str, created: Optional[float] = None):
+        """Store a reply, evicting the least recently used entries over the limit"""
+        with self._lock:
+            self._entries[key] = (content, created or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCacheTier:
+    """
+    On-disk tier stored in a sqlite database
+
+    Several processes can share one database file; WAL mode keeps readers
+    from blocking the writer.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    PRUNE_EVERY = 100  # Puts between size checks
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        """
+        Initialize the tier
+
+        Args:
+            path: Database file path (created if missing)
+            max_entries: Entries kept before the least recently used are evicted
+            ttl: Seconds an entry stays valid
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+        self._conn.commit()
+        self._puts = 0
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Get a cached reply
+
+        Returns:
+            Tuple of (content, created), or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row
+
+    def put(self, key: str, content: str):
+        """Store a reply, pruning expired and least recently used entries periodically"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, content, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, content, now, now)
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float):
+        """Drop expired entries, then the least recently used ones over the limit"""
+        self._conn.execute("DELETE FROM completions WHERE created < ?", (now - self.ttl,))
+        count = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM completions WHERE key IN "
+                "(SELECT key FROM completions ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-tier completion cache (memory LRU in front of optional sqlite)
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, memory_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 disk_path: Optional[str] = None, disk_entries: Optional[int] = None,
+                 max_temperature: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            memory_entries: Entries kept in the in-memory tier
+            ttl: Seconds an entry stays valid in either tier
+            disk_path: sqlite database path for the disk tier (None disables it)
+            disk_entries: Entries kept in the disk tier
+            max_temperature: Highest temperature whose replies are cached
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        ttl = Config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.max_temperature = (Config.RESPONSE_CACHE_MAX_TEMPERATURE
+                                if max_temperature is None else max_temperature)
+        self.memory = MemoryCacheTier(memory_entries or Config.RESPONSE_CACHE_MEMORY_ENTRIES, ttl)
+        self.disk = None
+        if disk_path:
+            self.disk = SqliteCacheTier(disk_path, disk_entries or Config.RESPONSE_CACHE_DISK_ENTRIES, ttl)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def is_cacheable(self, api_params: dict) -> bool:
+        """
+        Check whether a request is deterministic enough to cache
+
+        Args:
+            api_params: API parameters dictionary
+
+        Returns:
+            True if the request's temperature is at or below the cache threshold
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return api_params.get("temperature", 1.0) <= self.max_temperature
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a reply, promoting disk hits into memory
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached reply, or None on a miss
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        content = self.memory.get(key)
+        tier = "memory"
+        if content is None and self.disk is not None:
+            row = self.disk.get(key)
+            if row is not None:
+                content = row[0]
+                tier = "disk"
+                self.memory.put(key, content, created=row[1])
+
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if tier == "memory":
+                    self.memory_hits += 1
+                else:
+                    self.disk_hits += 1
+        return content
+
+    def put(self, key: str, content: str):
+        """
+        Store a reply in every tier
+
+        Args:
+            key: Cache key from make_cache_key
+            content: Assistant reply
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.memory.put(key, content)
+        if self.disk is not None:
+            self.disk.put(key, content)
+        with self._lock:
+            self.stores += 1
+
+    def clear(self):
+        """Remove all entries from every tier"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary of hit/miss counts and tier sizes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "disk_entries": len(self.disk) if self.disk is not None else 0
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache
+
+    Returns:
+        Shared ResponseCache, or None if caching is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _default_cache
+    if not Config.RESPONSE_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _cache_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache(disk_path=Config.RESPONSE_CACHE_DISK_PATH)
+    return _default_cache
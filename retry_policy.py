@@ -0,0 +1,354 @@
+"""
+Retry Policy for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Retries upstream calls with full-jitter exponential backoff. Only transient
+failures (connection errors, timeouts, 408/409/429/5xx) are retried,
+``Retry-After`` headers are honored, and a process-wide retry budget keeps an
+upstream brownout from multiplying our request volume.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+import openai
+from config import Config
+from exceptions import RetryBudgetExhausted, UpstreamError
+from tracing import span
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Parse ``retry-after-ms`` / ``Retry-After`` response headers
+
+    Args:
+        headers: Response headers mapping
+
+    Returns:
+        Seconds to wait, or None if no usable header is present
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_upstream_error(error: BaseException) -> bool:
+    """
+    Check whether an exception came from the API call rather than our own code
+
+    Args:
+        error: Exception to check
+
+    Returns:
+        True for OpenAI client errors and network errors
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return isinstance(error, (openai.OpenAIError, ConnectionError, TimeoutError))
+
+
+def classify_error(error: BaseException) -> Tuple[bool, Optional[int], Optional[float]]:
+    """
+    Classify an exception raised by the OpenAI client
+
+    Args:
+        error: Exception to classify
+
+    Returns:
+        Tuple of (retryable, status_code, retry_after_seconds)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True, None, None
+    if isinstance(error, openai.APIStatusError):
+        status = error.status_code
+        retry_after = parse_retry_after(getattr(error.response, "headers", None))
+        return status in RETRYABLE_STATUS_CODES, status, retry_after
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True, None, None
+    return False, None, None
+
+
+def to_upstream_error(error: BaseException, attempts: int = 1) -> UpstreamError:
+    """
+    Wrap an API exception in a typed UpstreamError
+
+    Args:
+        error: Original exception
+        attempts: Number of attempts made
+
+    Returns:
+        UpstreamError describing the failure
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    retryable, status, retry_after = classify_error(error)
+    return UpstreamError(
+        f"Error getting response after {attempts} attempt(s): {error}",
+        status_code=status, retryable=retryable, retry_after=retry_after,
+        attempts=attempts, cause=error
+    )
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget shared by every caller in the process
+
+    Each first attempt deposits ``ratio`` tokens and each retry withdraws one,
+    so retries can never exceed roughly ``ratio`` of the request volume. A
+    small per-second allowance keeps low-traffic processes able to retry.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 100.0):
+        """
+        Initialize the retry budget
+
+        Args:
+            ratio: Retry tokens earned per first attempt
+            min_per_second: Retry tokens granted per second regardless of traffic
+            max_tokens: Maximum tokens the bucket can hold
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.denied = 0
+
+    def _refill(self):
+        """Add the time-based allowance"""
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self):
+        """Deposit tokens for a first attempt"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """
+        Withdraw one token for a retry
+
+        Returns:
+            True if the retry may proceed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.granted += 1
+                return True
+            self.denied += 1
+            return False
+
+    def stats(self) -> dict:
+        """Get budget statistics"""
+        with self._lock:
+            self._refill()
+            return {
+                "tokens": round(self._tokens, 2),
+                "retries_granted": self.granted,
+                "retries_denied": self.denied
+            }
+
+
+_default_budget: Optional[RetryBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_retry_budget() -> RetryBudget:
+    """
+    Get the process-wide retry budget
+
+    Returns:
+        Shared RetryBudget
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _default_budget
+    if _default_budget is None:
+        with _budget_lock:
+            if _default_budget is None:
+                _default_budget = RetryBudget(
+                    ratio=Config.RETRY_BUDGET_RATIO,
+                    min_per_second=Config.RETRY_BUDGET_MIN_PER_SECOND
+                )
+    return _default_budget
+
+
+class RetryPolicy:
+    """
+    Retry policy with full-jitter backoff, error classification and a retry budget
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, max_elapsed: Optional[float] = None,
+                 budget: Optional[RetryBudget] = None):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Backoff base in seconds
+            max_delay: Cap on a single backoff in seconds
+            max_elapsed: Give up rather than wait past this many seconds in total
+            budget: Retry budget (defaults to the process-wide budget)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_attempts = Config.RETRY_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.base_delay = Config.RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.max_elapsed = Config.RETRY_MAX_ELAPSED if max_elapsed is None else max_elapsed
+        self.budget = budget or get_retry_budget()
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the wait before the next attempt
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Server-requested wait, if any
+
+        Returns:
+            Seconds to wait
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _next_delay(self, error: BaseException, attempt: int, started: float) -> float:
+        """
+        Decide whether to retry after a failure
+
+        Returns:
+            Seconds to wait before retrying
+
+        Raises:
+            UpstreamError: If the failure should not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not is_upstream_error(error):
+            raise error
+        retryable, status, retry_after = classify_error(error)
+        attempts = attempt + 1
+
+        if not retryable or attempts >= self.max_attempts:
+            raise to_upstream_error(error, attempts) from error
+
+        delay = self.compute_delay(attempt, retry_after)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            raise UpstreamError(
+                f"Error getting response: retry would exceed {self.max_elapsed}s: {error}",
+                status_code=status, retryable=True, retry_after=retry_after or delay,
+                attempts=attempts, cause=error
+            ) from error
+
+        if not self.budget.try_acquire():
+            raise RetryBudgetExhausted(
+                f"Error getting response (retry budget exhausted): {error}",
+                status_code=status, retryable=True, retry_after=retry_after,
+                attempts=attempts, cause=error
+            ) from error
+
+        return delay
+
+    def call(self, fn: Callable[[], T], on_retry: Optional[Callable[[int, float, BaseException], None]] = None) -> T:
+        """
+        Call ``fn`` with retries
+
+        Args:
+            fn: Function performing one attempt
+            on_retry: Optional callback ``on_retry(attempt, delay, error)`` before each retry
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            UpstreamError: When the call fails and will not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.budget.record_request()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started)
+                if on_retry:
+                    on_retry(attempt + 1, delay, e)
+                with span("retry.sleep", {"retry.attempt": attempt + 1, "retry.delay": delay}):
+                    time.sleep(delay)
+                attempt += 1
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]],
+                         on_retry: Optional[Callable[[int, float, BaseException], None]] = None) -> T:
+        """
+        Await ``fn`` with retries, sleeping without blocking the event loop
+
+        Args:
+            fn: Coroutine function performing one attempt
+            on_retry: Optional callback ``on_retry(attempt, delay, error)`` before each retry
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            UpstreamError: When the call fails and will not be retried
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.budget.record_request()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started)
+                if on_retry:
+                    on_retry(attempt + 1, delay, e)
+                with span("retry.sleep", {"retry.attempt": attempt + 1, "retry.delay": delay}):
+                    await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,536 @@
+"""
+Search Index for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Incremental inverted index over conversation messages with BM25 ranking,
+phrase ("reset password") and prefix (pass*) queries, and highlighting.
+Terms are case-folded and optionally reduced with a light plural stemmer.
+A query only touches the postings of its own terms, so search time does
+not grow with the length of the rest of the history.
+"""
+
+import os
+import re
+import json
+import math
+import heapq
+import bisect
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import Config
+from conversation_log import read_conversation
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+_TOKEN_PATTERN = re.compile(r"\w+")
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSIONS = 50
+SNIPPET_CHARS = 200
+
+
+def stem(term: str) -> str:
+    """
+    Reduce plural forms with the S-stemmer (Harman, 1991)
+
+    Args:
+        term: Case-folded term
+
+    Returns:
+        Stemmed term
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if len(term) <= 3 or not term.endswith("s"):
+        return term
+    if term.endswith("ies") and not term.endswith(("eies", "aies")):
+        return term[:-3] + "y"
+    if term.endswith("es") and not term.endswith(("aes", "ees", "oes")):
+        return term[:-1]
+    if not term.endswith(("us", "ss")):
+        return term[:-1]
+    return term
+
+
+def normalize(token: str, stemming: bool = True) -> str:
+    """
+    Normalize a token into an index term
+
+    Args:
+        token: Raw token
+        stemming: Whether to apply the stemmer
+
+    Returns:
+        Index term
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    term = token.casefold()
+    return stem(term) if stemming else term
+
+
+def tokenize(text: str, stemming: bool = True) -> List[Tuple[str, int, int]]:
+    """
+    Split text into index terms with their character offsets
+
+    Args:
+        text: Text to tokenize
+        stemming: Whether to apply the stemmer
+
+    Returns:
+        List of (term, start, end)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return [(normalize(m.group(), stemming), m.start(), m.end())
+            for m in _TOKEN_PATTERN.finditer(text or "")]
+
+
+class Query:
+    """
+    Parsed search query: every clause must match
+
+    Clauses are plain terms, prefix terms (``pass*``) and quoted phrases.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, text: str, stemming: bool = True):
+        """
+        Parse a query
+
+        Args:
+            text: Query text
+            stemming: Whether terms are stemmed
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.terms: List[str] = []
+        self.prefixes: List[str] = []
+        self.phrases: List[List[str]] = []
+        for phrase, word in _QUERY_PATTERN.findall(text):
+            if phrase:
+                terms = [term for term, _, _ in tokenize(phrase, stemming)]
+                if len(terms) > 1:
+                    self.phrases.append(terms)
+                else:
+                    self.terms.extend(terms)
+            elif word.endswith("*") and _TOKEN_PATTERN.fullmatch(word[:-1]):
+                # Prefixes are not stemmed: "boxe*" should still match "boxes"
+                self.prefixes.append(word[:-1].casefold())
+            else:
+                self.terms.extend(term for term, _, _ in tokenize(word, stemming))
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.prefixes or self.phrases)
+
+
+class InvertedIndex:
+    """
+    Positional inverted index with BM25 scoring
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, stemming: Optional[bool] = None):
+        """
+        Initialize an empty index
+
+        Args:
+            stemming: Whether to stem terms (defaults to Config.SEARCH_STEMMING)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stemming = Config.SEARCH_STEMMING if stemming is None else stemming
+        # term -> {doc_id: [positions]}
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        # Sorted vocabulary for prefix expansion
+        self._vocabulary: List[str] = []
+
+    def add(self, doc_id: int, text: str):
+        """
+        Index a document, replacing any previous version
+
+        Args:
+            doc_id: Document identifier
+            text: Document text
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        positions: Dict[str, List[int]] = {}
+        tokens = tokenize(text, self.stemming)
+        for position, (term, _, _) in enumerate(tokens):
+            positions.setdefault(term, []).append(position)
+        for term, term_positions in positions.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            postings[doc_id] = term_positions
+        self._doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: int, text: Optional[str] = None):
+        """
+        Remove a document
+
+        Args:
+            doc_id: Document identifier
+            text: Document text, if known (avoids scanning the vocabulary)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        length = self._doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        terms = ({term for term, _, _ in tokenize(text, self.stemming)} if text is not None
+                 else list(self._postings))
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None and postings.pop(doc_id, None) is not None and not postings:
+                del self._postings[term]
+                i = bisect.bisect_left(self._vocabulary, term)
+                if i < len(self._vocabulary) and self._vocabulary[i] == term:
+                    del self._vocabulary[i]
+
+    def clear(self):
+        """Remove every document"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._postings.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+        self._vocabulary = []
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """
+        Get indexed terms starting with ``prefix``
+
+        Args:
+            prefix: Case-folded prefix
+
+        Returns:
+            Up to MAX_PREFIX_EXPANSIONS terms
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        terms = []
+        i = bisect.bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and len(terms) < MAX_PREFIX_EXPANSIONS:
+            term = self._vocabulary[i]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            i += 1
+        return terms
+
+    def _bm25(self, term: str, doc_id: int) -> float:
+        """BM25 contribution of one term to one document"""
+        postings = self._postings[term]
+        n = len(self._doc_lengths)
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        tf = len(postings[doc_id])
+        avg_length = self._total_length / n if n else 1
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / avg_length)
+        return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def _phrase_match(self, terms: List[str], doc_id: int) -> bool:
+        """Check that ``terms`` occur consecutively in a document"""
+        starts = set(self._postings[terms[0]][doc_id])
+        for offset, term in enumerate(terms[1:], 1):
+            starts &= {p - offset for p in self._postings[term][doc_id]}
+            if not starts:
+                return False
+        return True
+
+    def search(self, query: Query) -> Tuple[List[Tuple[float, int]], Set[str]]:
+        """
+        Find documents matching every clause of a query
+
+        Args:
+            query: Parsed query
+
+        Returns:
+            Tuple of (list of (score, doc_id) in no particular order, matched terms)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # Each clause is a set of alternative terms (several for a prefix)
+        clauses: List[List[str]] = [[term] for term in query.terms]
+        clauses.extend(self.expand_prefix(prefix) for prefix in query.prefixes)
+        clauses.extend([term] for phrase in query.phrases for term in phrase)
+        if not clauses or any(not any(t in self._postings for t in clause) for clause in clauses):
+            return [], set()
+
+        def clause_docs(clause):
+            docs = set()
+            for term in clause:
+                docs.update(self._postings.get(term, ()))
+            return docs
+
+        # Intersect starting from the rarest clause so the work tracks the smallest postings
+        clause_sets = sorted((clause_docs(clause) for clause in clauses), key=len)
+        candidates = clause_sets[0]
+        for docs in clause_sets[1:]:
+            candidates = candidates & docs
+            if not candidates:
+                return [], set()
+
+        if query.phrases:
+            candidates = {doc_id for doc_id in candidates
+                          if all(self._phrase_match(phrase, doc_id) for phrase in query.phrases)}
+
+        matched_terms = {term for clause in clauses for term in clause}
+        scored = []
+        for doc_id in candidates:
+            score = sum(self._bm25(term, doc_id) for clause in clauses for term in clause
+                        if doc_id in self._postings.get(term, ()))
+            scored.append((score, doc_id))
+        return scored, matched_terms
+
+    def memory_footprint(self) -> int:
+        """
+        Estimate memory held by the index
+
+        Returns:
+            Estimated size in bytes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # O(1): vocabulary entries plus roughly one posting slot per indexed token
+        return len(self._postings) * 200 + self._total_length * 40
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+
+def highlight(text: str, terms: Set[str], stemming: bool = True) -> List[List[int]]:
+    """
+    Find the spans of matched terms in a document
+
+    Args:
+        text: Document text
+        terms: Matched index terms
+        stemming: Whether terms are stemmed
+
+    Returns:
+        List of [start, end] character offsets
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return [[start, end] for term, start, end in tokenize(text, stemming) if term in terms]
+
+
+def make_snippet(text: str, spans: List[List[int]], width: int = SNIPPET_CHARS) -> Tuple[str, List[List[int]]]:
+    """
+    Cut a window of text around the first highlight
+
+    Args:
+        text: Document text
+        spans: Highlight offsets into ``text``
+        width: Snippet length in characters
+
+    Returns:
+        Tuple of (snippet, highlight offsets into the snippet)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    text = text or ""
+    start = 0
+    if spans and len(text) > width:
+        start = max(0, min(spans[0][0] - width // 4, len(text) - width))
+    end = start + width
+    snippet = text[start:end]
+    shifted = [[s - start, e - start] for s, e in spans if s >= start and e <= end]
+    if start > 0:
+        snippet = "…" + snippet
+        shifted = [[s + 1, e + 1] for s, e in shifted]
+    if end < len(text):
+        snippet += "…"
+    return snippet, shifted
+
+
+def paginate(scored: List[Tuple[float, int]], page: int, page_size: int) -> List[Tuple[float, int]]:
+    """
+    Select one page of hits by descending score
+
+    Only the top ``page * page_size`` hits are ordered, not the whole list.
+
+    Args:
+        scored: List of (score, doc_id)
+        page: 1-based page number
+        page_size: Hits per page
+
+    Returns:
+        Hits on the requested page
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    top = heapq.nlargest(page * page_size, scored, key=lambda hit: (hit[0], -hit[1]))
+    return top[(page - 1) * page_size:]
+
+
+def clamp_page(page, page_size) -> Tuple[int, int]:
+    """
+    Validate pagination parameters
+
+    Args:
+        page: Requested page (1-based)
+        page_size: Requested page size
+
+    Returns:
+        Tuple of (page, page_size) within limits
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    page = max(1, int(page or 1))
+    page_size = max(1, min(int(page_size or Config.SEARCH_PAGE_SIZE), Config.SEARCH_MAX_PAGE_SIZE))
+    return page, page_size
+
+
+def build_hit(message: Dict, score: float, terms: Set[str], stemming: bool, **extra) -> Dict:
+    """
+    Build one search result
+
+    Args:
+        message: Matching message
+        score: BM25 score
+        terms: Matched index terms
+        stemming: Whether terms are stemmed
+        **extra: Extra fields such as the message index
+
+    Returns:
+        Result dictionary
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    spans = highlight(message['content'], terms, stemming)
+    snippet, snippet_spans = make_snippet(message['content'], spans)
+    hit = {
+        "role": message['role'],
+        "content": message['content'],
+        "score": round(score, 4),
+        "highlights": spans,
+        "snippet": snippet,
+        "snippet_highlights": snippet_spans
+    }
+    hit.update(extra)
+    return hit
+
+
+class ArchiveSearchIndex:
+    """
+    Search across conversations persisted in a directory
+
+    The directory is rescanned on each search and only new or modified
+    conversation files are (re)indexed.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, directory: str, stemming: Optional[bool] = None):
+        """
+        Initialize the archive index
+
+        Args:
+            directory: Directory of conversation logs
+            stemming: Whether to stem terms
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.directory = directory
+        self.index = InvertedIndex(stemming)
+        self._lock = threading.Lock()
+        # conversation id -> (mtime, [doc ids])
+        self._files: Dict[str, Tuple[float, List[int]]] = {}
+        # doc id -> (conversation id, message index, message)
+        self._docs: Dict[int, Tuple[str, int, Dict]] = {}
+        self._next_doc = 0
+
+    def _drop(self, conversation_id: str):
+        """Remove a conversation from the index (lock held)"""
+        _, doc_ids = self._files.pop(conversation_id)
+        for doc_id in doc_ids:
+            _, _, message = self._docs.pop(doc_id)
+            self.index.remove(doc_id, message['content'])
+
+    def _messages(self, path: str) -> List[Dict]:
+        """Read the messages of a conversation log (or a legacy JSON file)"""
+        if path.endswith(".jsonl"):
+            return read_conversation(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def refresh(self):
+        """
+        Index new and modified conversations and drop deleted ones
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            seen = set()
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if not entry.name.endswith((".jsonl", ".json")) or not entry.is_file():
+                        continue
+                    conversation_id = entry.name.rsplit(".", 1)[0]
+                    seen.add(conversation_id)
+                    mtime = entry.stat().st_mtime
+                    known = self._files.get(conversation_id)
+                    if known is not None and known[0] == mtime:
+                        continue
+                    if known is not None:
+                        self._drop(conversation_id)
+                    try:
+                        messages = self._messages(entry.path)
+                    except (OSError, ValueError):
+                        continue
+                    doc_ids = []
+                    for i, message in enumerate(messages):
+                        doc_id = self._next_doc
+                        self._next_doc += 1
+                        self._docs[doc_id] = (conversation_id, i, message)
+                        self.index.add(doc_id, message.get('content') or "")
+                        doc_ids.append(doc_id)
+                    self._files[conversation_id] = (mtime, doc_ids)
+            for conversation_id in set(self._files) - seen:
+                self._drop(conversation_id)
+
+    def search(self, query: str, page: int = 1, page_size: Optional[int] = None) -> Dict:
+        """
+        Search every persisted conversation
+
+        Args:
+            query: Query text
+            page: 1-based page number
+            page_size: Hits per page
+
+        Returns:
+            Dictionary with ranked hits and the total number of matches
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        page, page_size = clamp_page(page, page_size)
+        self.refresh()
+        with self._lock:
+            scored, terms = self.index.search(Query(query, self.index.stemming))
+            results = []
+            for score, doc_id in paginate(scored, page, page_size):
+                conversation_id, position, message = self._docs[doc_id]
+                results.append(build_hit(message, score, terms, self.index.stemming,
+                                         conversation_id=conversation_id, index=position))
+        return {"results": results, "total": len(scored), "page": page, "page_size": page_size}
+
+
+_archive_index: Optional[ArchiveSearchIndex] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive_index() -> ArchiveSearchIndex:
+    """
+    Get the process-wide index over persisted conversations
+
+    Returns:
+        Shared ArchiveSearchIndex for Config.CONVERSATION_DIR
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _archive_index
+    if _archive_index is None:
+        with _archive_lock:
+            if _archive_index is None:
+                _archive_index = ArchiveSearchIndex(Config.CONVERSATION_DIR)
+    return _archive_index
@@ -0,0 +1,577 @@
+"""
+Semantic Cache for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Near-duplicate cache for paraphrased questions. User messages are embedded
+with a pluggable local embedding function and looked up in an in-process
+vector index; a stored answer is returned when the cosine similarity clears
+a threshold. The index is vectorized NumPy brute force for small sizes and
+switches to an IVF (inverted file, k-means partitioned) index beyond a
+threshold. Without NumPy a pure-Python brute-force index is used.
+
+Entries are scoped by model and system prompt, evicted by LRU and age, and
+persisted as a JSON metadata file plus a raw float32 vector file.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import array
+import atexit
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+EmbeddingFunction = Callable[[str], Sequence[float]]
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Function words carry little meaning, so they are down-weighted (negations are kept)
+STOP_WORDS = frozenset(
+    "a an the is are was were be been do does did can could would should will shall may might "
+    "i me my we our you your he she it its they them their what which who how to of in on for "
+    "with at by from and or this that these those there here am have has had please".split()
+)
+STOP_WORD_WEIGHT = 0.15
+TRIGRAM_WEIGHT = 0.3
+
+
+def hashing_embedding(text: str, dim: int = 512) -> List[float]:
+    """
+    Embed text with the hashing trick (no model download needed)
+
+    Words and their character trigrams are hashed into ``dim`` signed
+    buckets, so paraphrases sharing content words or word stems land close
+    together. Stop words are down-weighted. The result is L2-normalized.
+
+    Args:
+        text: Text to embed
+        dim: Vector dimension
+
+    Returns:
+        Unit-length embedding
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    vector = [0.0] * dim
+    for word in _WORD_PATTERN.findall(text.lower()):
+        weight = STOP_WORD_WEIGHT if word in STOP_WORDS else 1.0
+        features = [(word, weight)]
+        padded = f"#{word}#"
+        features.extend((padded[i:i + 3], TRIGRAM_WEIGHT * weight) for i in range(len(padded) - 2))
+        for feature, feature_weight in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % dim] += feature_weight if h & 0x80000000 else -feature_weight
+    norm = sum(v * v for v in vector) ** 0.5
+    if norm:
+        vector = [v / norm for v in vector]
+    return vector
+
+
+def load_embedding_function(path: str) -> EmbeddingFunction:
+    """
+    Import an embedding function from a ``module:function`` path
+
+    Args:
+        path: Import path, e.g. ``my_models:embed``
+
+    Returns:
+        Embedding function
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"Embedding function '{path}' must look like 'module:function'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def make_namespace(model: str, system_prompt: str) -> str:
+    """
+    Build the scope key for cached answers
+
+    Args:
+        model: Model name
+        system_prompt: System prompt in effect
+
+    Returns:
+        Short hex digest; answers are only shared within one namespace
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return hashlib.sha1(f"{model}\0{system_prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+class PythonVectorIndex:
+    """
+    Pure-Python brute-force index, used when NumPy is not installed
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    kind = "python_brute_force"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vectors: Dict[int, List[float]] = {}
+
+    def add(self, key: int, vector: Sequence[float]):
+        """Add a unit vector under ``key``"""
+        self._vectors[key] = list(vector)
+
+    def remove(self, key: int):
+        """Remove the vector stored under ``key``"""
+        self._vectors.pop(key, None)
+
+    def search(self, vector: Sequence[float]) -> Optional[Tuple[int, float]]:
+        """
+        Find the most similar stored vector
+
+        Returns:
+            Tuple of (key, cosine similarity), or None if the index is empty
+        """
+        best = None
+        for key, stored in self._vectors.items():
+            score = sum(a * b for a, b in zip(stored, vector))
+            if best is None or score > best[1]:
+                best = (key, score)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+
+class NumpyVectorIndex:
+    """
+    NumPy index: brute force while small, IVF once it grows
+
+    Vectors live in one contiguous float32 matrix. Past ``ivf_threshold``
+    entries the matrix is partitioned with spherical k-means into about
+    sqrt(n) lists and a query only scans the ``nprobe`` closest lists. The
+    partitioning is retrained whenever the index doubles in size; removed
+    entries leave their list at once, so the lists stay the size of the
+    index under LRU churn.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    KMEANS_ITERATIONS = 8
+
+    def __init__(self, dim: int, ivf_threshold: int = 4096, nprobe: int = 8):
+        """
+        Initialize the index
+
+        Args:
+            dim: Vector dimension
+            ivf_threshold: Entries before switching from brute force to IVF
+            nprobe: Lists scanned per IVF query
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._matrix = np.zeros((64, dim), dtype=np.float32)
+        self._valid = np.zeros(64, dtype=bool)
+        self._keys = np.full(64, -1, dtype=np.int64)
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._high_water = 0
+        # IVF state
+        self._centroids = None
+        self._lists: List[List[int]] = []
+        self._list_of = np.full(64, -1, dtype=np.int64)  # slot -> list holding it
+        self._list_pos = np.zeros(64, dtype=np.int64)  # slot -> position in that list
+        self._trained_size = 0
+
+    @property
+    def kind(self) -> str:
+        return "ivf" if self._centroids is not None else "brute_force"
+
+    def _grow(self):
+        """Double the matrix capacity"""
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self._high_water] = self._matrix[:self._high_water]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:self._high_water] = self._valid[:self._high_water]
+        keys = np.full(capacity, -1, dtype=np.int64)
+        keys[:self._high_water] = self._keys[:self._high_water]
+        list_of = np.full(capacity, -1, dtype=np.int64)
+        list_of[:self._high_water] = self._list_of[:self._high_water]
+        list_pos = np.zeros(capacity, dtype=np.int64)
+        list_pos[:self._high_water] = self._list_pos[:self._high_water]
+        self._matrix, self._valid, self._keys = matrix, valid, keys
+        self._list_of, self._list_pos = list_of, list_pos
+
+    def add(self, key: int, vector: Sequence[float]):
+        """Add a unit vector under ``key``"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if key in self._slots:
+            self.remove(key)
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._high_water == self._matrix.shape[0]:
+                self._grow()
+            slot = self._high_water
+            self._high_water += 1
+        self._matrix[slot] = np.asarray(vector, dtype=np.float32)
+        self._valid[slot] = True
+        self._keys[slot] = key
+        self._slots[key] = slot
+
+        if self._centroids is not None:
+            nearest = int(np.argmax(self._centroids @ self._matrix[slot]))
+            self._list_of[slot] = nearest
+            self._list_pos[slot] = len(self._lists[nearest])
+            self._lists[nearest].append(slot)
+        if len(self._slots) >= self.ivf_threshold and len(self._slots) >= 2 * self._trained_size:
+            self._train()
+
+    def remove(self, key: int):
+        """Remove the vector stored under ``key``"""
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._valid[slot] = False
+            self._keys[slot] = -1
+            self._free.append(slot)
+            list_id = int(self._list_of[slot])
+            if list_id >= 0:
+                # Swap-remove: the list's last slot takes this one's place
+                members = self._lists[list_id]
+                position = int(self._list_pos[slot])
+                last = members.pop()
+                if last != slot:
+                    members[position] = last
+                    self._list_pos[last] = position
+                self._list_of[slot] = -1
+
+    def _train(self):
+        """Partition the stored vectors with spherical k-means"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        slots = np.flatnonzero(self._valid[:self._high_water])
+        data = self._matrix[slots]
+        nlist = max(1, int(len(slots) ** 0.5))
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(len(slots), nlist, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERATIONS):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            nonempty = norms[:, 0] > 0
+            centroids[nonempty] = sums[nonempty] / norms[nonempty]
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        self._lists = [[] for _ in range(nlist)]
+        for slot, list_id in zip(slots.tolist(), assignment.tolist()):
+            self._list_of[slot] = list_id
+            self._list_pos[slot] = len(self._lists[list_id])
+            self._lists[list_id].append(slot)
+        self._centroids = centroids
+        self._trained_size = len(slots)
+
+    def search(self, vector: Sequence[float]) -> Optional[Tuple[int, float]]:
+        """
+        Find the most similar stored vector
+
+        Returns:
+            Tuple of (key, cosine similarity), or None if the index is empty
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._slots:
+            return None
+        query = np.asarray(vector, dtype=np.float32)
+
+        if self._centroids is None:
+            scores = self._matrix[:self._high_water] @ query
+            scores[~self._valid[:self._high_water]] = -np.inf
+            slot = int(np.argmax(scores))
+            return int(self._keys[slot]), float(scores[slot])
+
+        nprobe = min(self.nprobe, len(self._lists))
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.fromiter(
+            (slot for list_id in probes for slot in self._lists[list_id]), dtype=np.int64
+        )
+        candidates = candidates[self._valid[candidates]] if len(candidates) else candidates
+        if not len(candidates):
+            return None
+        scores = self._matrix[candidates] @ query
+        best = int(np.argmax(scores))
+        slot = int(candidates[best])
+        return int(self._keys[slot]), float(scores[best])
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class SemanticCache:
+    """
+    Similarity-threshold answer cache with LRU and age eviction
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, embed_fn: Optional[EmbeddingFunction] = None, dim: Optional[int] = None,
+                 threshold: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_age: Optional[float] = None, path: Optional[str] = None,
+                 ivf_threshold: Optional[int] = None, nprobe: Optional[int] = None):
+        """
+        Initialize the semantic cache
+
+        Args:
+            embed_fn: Function mapping text to a unit vector (defaults to hashing_embedding)
+            dim: Embedding dimension
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Entries kept before the least recently used is evicted
+            max_age: Seconds an entry stays valid
+            path: Directory to persist the index in (None keeps it in memory only)
+            ivf_threshold: Entries before the NumPy index switches to IVF
+            nprobe: Lists scanned per IVF query
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.dim = dim or Config.SEMANTIC_CACHE_DIM
+        self.embed_fn = embed_fn or (lambda text: hashing_embedding(text, self.dim))
+        self.threshold = Config.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or Config.SEMANTIC_CACHE_MAX_ENTRIES
+        self.max_age = Config.SEMANTIC_CACHE_MAX_AGE if max_age is None else max_age
+        self.path = path
+        self.ivf_threshold = ivf_threshold or Config.SEMANTIC_CACHE_IVF_THRESHOLD
+        self.nprobe = nprobe or Config.SEMANTIC_CACHE_NPROBE
+
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, object] = {}
+        # entry id -> [namespace, question, answer, created, vector]
+        self._entries: "OrderedDict[int, list]" = OrderedDict()
+        self._next_id = 0
+        self._dirty = 0
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+        self._max_lookup_seconds = 0.0
+
+        if path:
+            self.load()
+
+    def _new_index(self):
+        """Create an index for a new namespace"""
+        if np is None:
+            return PythonVectorIndex(self.dim)
+        return NumpyVectorIndex(self.dim, self.ivf_threshold, self.nprobe)
+
+    def _remove_entry(self, entry_id: int):
+        """Drop an entry from the LRU map and its index (lock held)"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is not None:
+            self._indexes[entry[0]].remove(entry_id)
+
+    def lookup(self, namespace: str, text: str) -> Tuple[Optional[str], Sequence[float]]:
+        """
+        Find a stored answer for a question similar to ``text``
+
+        Args:
+            namespace: Scope from make_namespace
+            text: User message
+
+        Returns:
+            Tuple of (answer or None, embedding of ``text`` for a later put)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        started = time.perf_counter()
+        vector = self.embed_fn(text)
+        answer = None
+        with self._lock:
+            index = self._indexes.get(namespace)
+            match = index.search(vector) if index is not None else None
+            if match is not None and match[1] >= self.threshold:
+                entry = self._entries[match[0]]
+                if time.time() - entry[3] > self.max_age:
+                    self._remove_entry(match[0])
+                    self.evictions += 1
+                    self._dirty += 1
+                else:
+                    self._entries.move_to_end(match[0])
+                    answer = entry[2]
+
+            elapsed = time.perf_counter() - started
+            self.lookups += 1
+            if answer is not None:
+                self.hits += 1
+            self._lookup_seconds += elapsed
+            self._max_lookup_seconds = max(self._max_lookup_seconds, elapsed)
+        return answer, vector
+
+    def put(self, namespace: str, text: str, answer: str, vector: Optional[Sequence[float]] = None):
+        """
+        Store an answer for a question
+
+        Args:
+            namespace: Scope from make_namespace
+            text: User message
+            answer: Assistant reply
+            vector: Embedding of ``text`` if already computed by lookup
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if vector is None:
+            vector = self.embed_fn(text)
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._indexes[namespace] = self._new_index()
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = [namespace, text, answer, time.time(), list(vector)]
+            index.add(entry_id, vector)
+            self._evict()
+            self._dirty += 1
+            save = self.path and self._dirty >= Config.SEMANTIC_CACHE_SAVE_EVERY
+        if save:
+            self.save()
+
+    def _evict(self):
+        """Drop aged entries from the LRU end, then enforce the entry limit (lock held)"""
+        cutoff = time.time() - self.max_age
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and entry[3] >= cutoff:
+                break
+            self._remove_entry(entry_id)
+            self.evictions += 1
+
+    def save(self):
+        """
+        Persist entries to ``path`` (metadata JSON plus a raw float32 vector file)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock:
+            entries = list(self._entries.values())
+            self._dirty = 0
+        vectors = array.array("f")
+        metadata = []
+        for namespace, question, answer, created, vector in entries:
+            vectors.extend(vector)
+            metadata.append([namespace, question, answer, created])
+
+        meta_path = os.path.join(self.path, "entries.json")
+        vector_path = os.path.join(self.path, "vectors.f32")
+        with open(vector_path + ".tmp", "wb") as f:
+            vectors.tofile(f)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "entries": metadata}, f, ensure_ascii=False)
+        os.replace(vector_path + ".tmp", vector_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def load(self):
+        """
+        Load entries persisted by save(), skipping expired ones
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        meta_path = os.path.join(self.path, "entries.json")
+        vector_path = os.path.join(self.path, "vectors.f32")
+        if not (os.path.exists(meta_path) and os.path.exists(vector_path)):
+            return
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            vectors = array.array("f")
+            with open(vector_path, "rb") as f:
+                vectors.frombytes(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable semantic cache at {self.path}: {e}")
+            return
+        if data.get("dim") != self.dim or len(vectors) != self.dim * len(data["entries"]):
+            print(f"Ignoring semantic cache at {self.path}: dimension mismatch")
+            return
+
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for i, (namespace, question, answer, created) in enumerate(data["entries"]):
+                if created < cutoff:
+                    continue
+                vector = vectors[i * self.dim:(i + 1) * self.dim].tolist()
+                index = self._indexes.get(namespace)
+                if index is None:
+                    index = self._indexes[namespace] = self._new_index()
+                entry_id = self._next_id
+                self._next_id += 1
+                self._entries[entry_id] = [namespace, question, answer, created, vector]
+                index.add(entry_id, vector)
+            self._evict()
+
+    def clear(self):
+        """Remove all entries"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            self._entries.clear()
+            self._indexes.clear()
+            self._dirty += 1
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary of hit rate, lookup latency and index sizes
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.lookups - self.hits,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "avg_lookup_ms": round(self._lookup_seconds / self.lookups * 1000, 3) if self.lookups else 0.0,
+                "max_lookup_ms": round(self._max_lookup_seconds * 1000, 3),
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "namespaces": len(self._indexes),
+                "index": {ns: index.kind for ns, index in self._indexes.items()},
+                "threshold": self.threshold
+            }
+
+
+_default_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Get the process-wide semantic cache
+
+    Returns:
+        Shared SemanticCache, or None if semantic caching is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _default_cache
+    if not Config.SEMANTIC_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _cache_lock:
+            if _default_cache is None:
+                embed_fn = None
+                if Config.SEMANTIC_CACHE_EMBEDDING_FUNCTION:
+                    embed_fn = load_embedding_function(Config.SEMANTIC_CACHE_EMBEDDING_FUNCTION)
+                _default_cache = SemanticCache(embed_fn=embed_fn, path=Config.SEMANTIC_CACHE_PATH)
+                if _default_cache.path:
+                    atexit.register(_default_cache.save)
+    return _default_cache
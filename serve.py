@@ -0,0 +1,350 @@
+"""
+Production Server Launcher for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Runs the web app under gunicorn with several worker processes instead of
+Flask's single-process development server. The worker class picks the
+concurrency model:
+
+- ``gthread``: a pool of threads per worker (default; one thread per open stream)
+- ``sync``: one request at a time per worker
+- ``gevent``: green threads, thousands of idle streams per worker (needs gevent)
+- ``async``: asgi_app.py on uvicorn workers (needs quart and uvicorn)
+
+With preload the app, Config and the persona tables are imported once in
+the master and shared copy-on-write by the forked workers. Workers are
+recycled after ``SERVE_MAX_REQUESTS`` requests (plus jitter) or once their
+RSS passes ``SERVE_MAX_WORKER_MEMORY``. On a reload (SIGHUP) or shutdown
+(SIGTERM) a worker stops accepting requests and its open SSE streams get
+``SERVE_DRAIN_TIMEOUT`` seconds to finish; streams still running then end
+with a retryable error frame (see sse.py) before ``SERVE_GRACEFUL_TIMEOUT``
+expires.
+
+Several workers only share conversations and rate limits through shared
+backends (``SESSION_BACKEND=sqlite`` or ``redis``, ``RATE_LIMIT_BACKEND=file``).
+Otherwise the launcher runs one worker unless ``--workers`` is given, and
+refuses more than one unless ``--allow-per-worker-state`` is set.
+
+Without gunicorn (e.g. on Windows) only ``--worker-class async`` works; it
+falls back to uvicorn's own multi-process mode.
+
+Usage:
+    chatbot-serve --workers 4 --threads 16
+    python serve.py --worker-class async --workers 2 --bind 127.0.0.1:8000
+"""
+
+import os
+import signal
+import argparse
+import multiprocessing
+from typing import Dict, List
+
+from config import Config
+from sse import begin_drain
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from gunicorn.util import import_app
+except ImportError:  # Windows, or the serve extra is not installed
+    BaseApplication = None
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+WORKER_CLASSES = {
+    "gthread": "gthread",
+    "sync": "sync",
+    "gevent": "gevent",
+    "async": "uvicorn.workers.UvicornWorker",
+}
+
+
+def app_uri(worker_class: str) -> str:
+    """
+    Get the application a worker class serves
+
+    Args:
+        worker_class: Key of WORKER_CLASSES
+
+    Returns:
+        ``module:attribute`` of the WSGI or ASGI app
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return "asgi_app:app" if worker_class == "async" else "app:app"
+
+
+def default_workers() -> int:
+    """Gunicorn's rule of thumb: two workers per CPU plus one"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def per_worker_state() -> List[str]:
+    """
+    List the state the current settings keep in each worker's own memory
+
+    Returns:
+        One explanation per setting that breaks with several workers
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    problems = []
+    if Config.SESSION_BACKEND == "file":
+        problems.append("SESSION_BACKEND=file: each worker restores its own copy of a conversation "
+                        "and misses or removes the others' turns (use sqlite or redis)")
+    if Config.RATE_LIMIT_ENABLED and Config.RATE_LIMIT_BACKEND == "memory":
+        problems.append("RATE_LIMIT_BACKEND=memory: every worker allows the full RPM and TPM (use file)")
+    return problems
+
+
+def resolve_workers(args: argparse.Namespace) -> int:
+    """
+    Pick the number of workers, checking that several can share the app's state
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        Worker count, or 0 if the settings cannot run the requested workers
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    problems = [] if args.allow_per_worker_state else per_worker_state()
+    workers = args.workers
+    if not workers:
+        workers = 1 if problems else default_workers()
+        if problems:
+            print("Running one worker; several would not share state:")
+            for problem in problems:
+                print(f"  - {problem}")
+    elif workers > 1 and problems:
+        print(f"Refusing to start {workers} workers; they would not share state:")
+        for problem in problems:
+            print(f"  - {problem}")
+        print("Configure shared backends, use --workers 1, or pass --allow-per-worker-state.")
+        return 0
+    if workers > 1:
+        print(f"Warning: /api/batch jobs live in the worker that started them; with {workers} workers "
+              "a poll that reaches another worker gets 404.")
+    return workers
+
+
+def warm_up():
+    """
+    Load what every worker needs before requests arrive
+
+    With preload this runs once in the master, so the persona and template
+    tables are shared by all workers instead of built in each.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+    from personas import get_all_personas, get_all_templates
+
+    get_all_personas()
+    get_all_templates()
+    if not Config.validate():
+        print("Warning: OPENAI_API_KEY not set. Please set it in .env file.")
+
+
+def rss_mb() -> float:
+    """Resident set size of this process in MiB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def post_worker_init(worker):
+    """
+    Gunicorn hook: start draining open streams when the worker is told to stop
+
+    SIGTERM is what the arbiter sends old workers on a reload or a graceful
+    shutdown. The worker's own handler still runs, so it stops accepting
+    requests and waits up to the graceful timeout as usual.
+
+    Args:
+        worker: Gunicorn worker
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    previous = signal.getsignal(signal.SIGTERM)
+    drain_timeout = max(0.0, min(Config.SERVE_DRAIN_TIMEOUT, worker.cfg.graceful_timeout - 1))
+
+    def on_sigterm(signum, frame):
+        begin_drain(drain_timeout)
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+
+def post_request(worker, req, environ, resp):
+    """
+    Gunicorn hook: recycle a worker that has grown past SERVE_MAX_WORKER_MEMORY
+
+    The worker finishes its in-flight requests and exits; the arbiter starts
+    a fresh one in its place.
+
+    Args:
+        worker: Gunicorn worker
+        req: Parsed request
+        environ: WSGI environ
+        resp: Response
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    limit = Config.SERVE_MAX_WORKER_MEMORY
+    if limit and worker.alive:
+        used = rss_mb()
+        if used > limit:
+            worker.log.info("Recycling worker %s: %.0f MiB RSS exceeds %d MiB", worker.pid, used, limit)
+            worker.alive = False
+
+
+def build_options(args: argparse.Namespace) -> Dict:
+    """
+    Translate command-line arguments into gunicorn settings
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        Gunicorn settings
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": WORKER_CLASSES[args.worker_class],
+        # Module-level locks created before gevent patches the worker would block it
+        "preload_app": args.preload and args.worker_class != "gevent",
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "keepalive": args.keepalive,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "post_worker_init": post_worker_init,
+        "post_request": post_request,
+    }
+    if args.worker_class == "gthread":
+        options["threads"] = args.threads
+    if args.worker_class == "gevent":
+        options["worker_connections"] = args.worker_connections
+    return options
+
+
+def run_gunicorn(uri: str, options: Dict):
+    """
+    Run gunicorn with the given settings
+
+    Args:
+        uri: ``module:attribute`` of the app
+        options: Gunicorn settings
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    class ChatbotApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            warm_up()
+            return import_app(uri)
+
+    ChatbotApplication().run()
+
+
+def run_uvicorn(uri: str, args: argparse.Namespace):
+    """
+    Run the ASGI app with uvicorn's own process manager (no gunicorn)
+
+    Args:
+        uri: ``module:attribute`` of the app
+        args: Parsed arguments
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    import uvicorn
+
+    host, _, port = args.bind.rpartition(":")
+    warm_up()
+    uvicorn.run(
+        uri,
+        host=host or "0.0.0.0",
+        port=int(port),
+        workers=args.workers,
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_max_requests=args.max_requests or None
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line arguments (defaults come from Config)
+
+    Args:
+        argv: Arguments (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    parser = argparse.ArgumentParser(description="Run the chatbot web app with multiple workers")
+    parser.add_argument("--bind", default=Config.SERVE_BIND, help="host:port to listen on")
+    parser.add_argument("--worker-class", choices=sorted(WORKER_CLASSES), default=Config.SERVE_WORKER_CLASS)
+    parser.add_argument("--workers", type=int, default=Config.SERVE_WORKERS,
+                        help="0 for 2 x CPUs + 1 (1 while state is per worker)")
+    parser.add_argument("--allow-per-worker-state", action="store_true",
+                        default=Config.SERVE_ALLOW_PER_WORKER_STATE,
+                        help="Run several workers even with file sessions or in-memory rate limits")
+    parser.add_argument("--threads", type=int, default=Config.SERVE_THREADS, help="Threads per gthread worker")
+    parser.add_argument("--worker-connections", type=int, default=Config.SERVE_WORKER_CONNECTIONS,
+                        help="Concurrent clients per gevent worker")
+    parser.add_argument("--preload", dest="preload", action="store_true", default=Config.SERVE_PRELOAD)
+    parser.add_argument("--no-preload", dest="preload", action="store_false")
+    parser.add_argument("--timeout", type=int, default=Config.SERVE_TIMEOUT)
+    parser.add_argument("--graceful-timeout", type=int, default=Config.SERVE_GRACEFUL_TIMEOUT)
+    parser.add_argument("--drain-timeout", type=float, default=Config.SERVE_DRAIN_TIMEOUT)
+    parser.add_argument("--keepalive", type=int, default=Config.SERVE_KEEPALIVE)
+    parser.add_argument("--max-requests", type=int, default=Config.SERVE_MAX_REQUESTS)
+    parser.add_argument("--max-requests-jitter", type=int, default=Config.SERVE_MAX_REQUESTS_JITTER)
+    parser.add_argument("--max-worker-memory", type=int, default=Config.SERVE_MAX_WORKER_MEMORY,
+                        help="MiB of RSS after which a worker is recycled (0 never)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the ``chatbot-serve`` console script
+
+    Args:
+        argv: Arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    args = parse_args(argv)
+    # Workers are forked from this process, so the hooks see these values
+    Config.SERVE_DRAIN_TIMEOUT = args.drain_timeout
+    Config.SERVE_MAX_WORKER_MEMORY = args.max_worker_memory
+    uri = app_uri(args.worker_class)
+    args.workers = resolve_workers(args)
+    if not args.workers:
+        return 2
+
+    if BaseApplication is not None:
+        run_gunicorn(uri, build_options(args))
+    elif args.worker_class == "async":
+        run_uvicorn(uri, args)
+    else:
+        print("gunicorn is required for the WSGI worker classes: pip install .[serve]")
+        print("Without gunicorn (e.g. on Windows), use --worker-class async.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
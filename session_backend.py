@@ -0,0 +1,758 @@
+"""
+Shared Session Backends for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Conversation state kept outside the worker process, so any worker on any
+node can serve any request of a session and nothing is lost on restart.
+Two backends share one interface: SQLite (a local file, shared by the
+workers of one machine) and Redis (any server speaking the Redis protocol,
+shared by every node). Both store one row or list element per turn, so a
+turn costs a single small write instead of rewriting the history.
+
+Every write carries the version the writer last saw and fails with
+SessionConflict if the session changed since, so two tabs writing at once
+cannot interleave turns. Sessions also count their rewrites (pop, clear,
+replace): while that count is unchanged a worker only has to read the turns
+appended since it last looked.
+
+SessionLog binds a backend to one session and has the same interface as
+ConversationLog, so it attaches to a chatbot the same way.
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from config import Config
+from exceptions import SessionConflict
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# (version, rewrites, length) of a session; (0, 0, 0) if it was never written
+SessionState = Tuple[int, int, int]
+
+
+def _encode(message: Dict) -> str:
+    """Serialize a message for storage"""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+class SessionBackend:
+    """
+    Base interface for shared session backends
+
+    Write methods take the version the caller last saw and return the new
+    version; they raise SessionConflict if the session has moved on.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    name = "base"
+
+    def __init__(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.conflicts = 0
+        self._stats_lock = threading.Lock()
+
+    def state(self, session_id: str) -> SessionState:
+        """Return the session's (version, rewrites, length)"""
+        raise NotImplementedError
+
+    def read(self, session_id: str, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """Return turns ``start`` up to ``stop`` (defaults to the end)"""
+        raise NotImplementedError
+
+    def get_meta(self, session_id: str) -> Dict:
+        """Return the session's settings (e.g. system_prompt), empty if none were saved"""
+        raise NotImplementedError
+
+    def append(self, session_id: str, message: Dict, expected: int) -> int:
+        """Append one turn"""
+        raise NotImplementedError
+
+    def pop(self, session_id: str, expected: int) -> int:
+        """Remove the last turn"""
+        raise NotImplementedError
+
+    def clear(self, session_id: str, expected: int) -> int:
+        """Remove every turn"""
+        raise NotImplementedError
+
+    def replace(self, session_id: str, messages: List[Dict], expected: int) -> int:
+        """Replace every turn"""
+        raise NotImplementedError
+
+    def set_meta(self, session_id: str, meta: Dict, expected: int) -> int:
+        """Replace the session's settings (counts as a rewrite)"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections"""
+
+    def open(self, session_id: str) -> "SessionLog":
+        """
+        Bind the backend to one session
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            SessionLog for the session
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return SessionLog(self, session_id)
+
+    def _conflict(self, session_id: str, expected: int, actual: Optional[int] = None) -> SessionConflict:
+        """Count a conflict and build its error"""
+        with self._stats_lock:
+            self.conflicts += 1
+        found = f" (now at version {actual})" if actual is not None else ""
+        return SessionConflict(
+            f"Conversation {session_id} was changed by another request{found}; reload and try again"
+        )
+
+    def stats(self) -> Dict:
+        """
+        Get backend statistics
+
+        Returns:
+            Dictionary with the backend name and write conflicts seen
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return {"backend": self.name, "conflicts": self.conflicts}
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Sessions in a local SQLite database
+
+    The database runs in WAL mode, so the workers of one machine read
+    without blocking each other; writes take the write lock for one short
+    transaction. Each thread uses its own connection.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    name = "sqlite"
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " session_id TEXT PRIMARY KEY, version INTEGER NOT NULL, rewrites INTEGER NOT NULL,"
+        " length INTEGER NOT NULL, meta TEXT, updated REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS messages ("
+        " session_id TEXT NOT NULL, idx INTEGER NOT NULL, body TEXT NOT NULL,"
+        " PRIMARY KEY (session_id, idx)) WITHOUT ROWID",
+    )
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Open (or create) the database
+
+        Args:
+            path: Database file (defaults to Config.SESSION_SQLITE_PATH)
+            ttl: Seconds after its last write a session is deleted (0 keeps sessions;
+                defaults to Config.SESSION_BACKEND_TTL); expired sessions are purged on open
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__()
+        self.path = path or Config.SESSION_SQLITE_PATH
+        self.ttl = Config.SESSION_BACKEND_TTL if ttl is None else ttl
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        for statement in self.SCHEMA:
+            db.execute(statement)
+        if self.ttl:
+            self.purge(time.time() - self.ttl)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # Autocommit; transactions are opened explicitly
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction holding the database write lock"""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def state(self, session_id: str) -> SessionState:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        row = self._connection().execute(
+            "SELECT version, rewrites, length FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return tuple(row) if row else (0, 0, 0)
+
+    def read(self, session_id: str, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        rows = self._connection().execute(
+            "SELECT body FROM messages WHERE session_id = ? AND idx >= ? AND idx < ? ORDER BY idx",
+            (session_id, start, stop if stop is not None else 2 ** 62)
+        ).fetchall()
+        return [json.loads(body) for body, in rows]
+
+    def get_meta(self, session_id: str) -> Dict:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        row = self._connection().execute(
+            "SELECT meta FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def _write(self, session_id: str, expected: int, rewrite: bool, change) -> int:
+        """
+        Apply ``change(db, length) -> new length`` if the session is still at ``expected``
+        """
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT version, rewrites, length FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            version, rewrites, length = row or (0, 0, 0)
+            if version != expected:
+                raise self._conflict(session_id, expected, version)
+            length = change(db, length)
+            db.execute(
+                "INSERT INTO sessions (session_id, version, rewrites, length, updated) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (session_id) DO UPDATE SET version = excluded.version,"
+                " rewrites = excluded.rewrites, length = excluded.length, updated = excluded.updated",
+                (session_id, version + 1, rewrites + rewrite, length, time.time())
+            )
+        return version + 1
+
+    def append(self, session_id: str, message: Dict, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def insert(db, length):
+            db.execute("INSERT INTO messages (session_id, idx, body) VALUES (?, ?, ?)",
+                       (session_id, length, _encode(message)))
+            return length + 1
+
+        return self._write(session_id, expected, False, insert)
+
+    def pop(self, session_id: str, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def delete_last(db, length):
+            db.execute("DELETE FROM messages WHERE session_id = ? AND idx = ?", (session_id, length - 1))
+            return max(0, length - 1)
+
+        return self._write(session_id, expected, True, delete_last)
+
+    def clear(self, session_id: str, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.replace(session_id, [], expected)
+
+    def replace(self, session_id: str, messages: List[Dict], expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def rewrite(db, length):
+            db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            db.executemany("INSERT INTO messages (session_id, idx, body) VALUES (?, ?, ?)",
+                           [(session_id, i, _encode(message)) for i, message in enumerate(messages)])
+            return len(messages)
+
+        return self._write(session_id, expected, True, rewrite)
+
+    def set_meta(self, session_id: str, meta: Dict, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def store(db, length):
+            db.execute(
+                "INSERT INTO sessions (session_id, version, rewrites, length, meta, updated)"
+                " VALUES (?, 0, 0, 0, ?, ?) ON CONFLICT (session_id) DO UPDATE SET meta = excluded.meta",
+                (session_id, _encode(meta), time.time())
+            )
+            return length
+
+        return self._write(session_id, expected, True, store)
+
+    def purge(self, before: float) -> int:
+        """
+        Delete sessions last written before a point in time
+
+        Args:
+            before: Unix time
+
+        Returns:
+            Number of sessions deleted
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._transaction() as db:
+            db.execute("DELETE FROM messages WHERE session_id IN"
+                       " (SELECT session_id FROM sessions WHERE updated < ?)", (before,))
+            return db.execute("DELETE FROM sessions WHERE updated < ?", (before,)).rowcount
+
+    def close(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RespConnection:
+    """
+    Minimal client for the Redis serialization protocol (RESP2)
+
+    Enough for the commands the session backend uses, with pipelining;
+    works against Redis and protocol-compatible servers (Valkey, KeyDB,
+    Dragonfly) without a client library.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 username: Optional[str] = None, timeout: float = 5.0):
+        """
+        Connect, authenticate and select the database
+
+        Args:
+            host: Server host
+            port: Server port
+            db: Database number
+            password: Password for AUTH
+            username: ACL user for AUTH
+            timeout: Socket timeout in seconds
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if password:
+            self.execute("AUTH", *([username] if username else []), password)
+        if db:
+            self.execute("SELECT", db)
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        """Encode one command as an array of bulk strings"""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read(self):
+        """Read one reply; error replies are returned as RespError instances"""
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the session server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            return RespError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self._reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        raise ConnectionError(f"Unexpected reply from the session server: {line[:40]!r}")
+
+    def pipeline(self, *commands) -> list:
+        """
+        Send several commands in one write and read their replies
+
+        Args:
+            *commands: Commands, each a tuple of arguments
+
+        Returns:
+            Replies in order
+
+        Raises:
+            RespError: If a command returned an error reply
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *args):
+        """
+        Run one command
+
+        Returns:
+            The reply
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.pipeline(args)[0]
+
+    def close(self):
+        """Close the connection"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions in a Redis-protocol server, shared by every node
+
+    A session is a hash ``<prefix><id>`` (version, rewrites, meta) and a
+    list ``<prefix><id>:m`` of turns. Writes use WATCH/MULTI/EXEC on the
+    hash, so a concurrent writer makes EXEC fail instead of interleaving.
+    Each thread uses its own connection (WATCH is per connection).
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        """
+        Configure the backend (connections are opened on first use)
+
+        Args:
+            url: ``redis://[user:password@]host:port/db`` (defaults to Config.SESSION_REDIS_URL)
+            prefix: Key prefix (defaults to Config.SESSION_REDIS_PREFIX)
+            ttl: Seconds after its last write a session expires (0 keeps sessions;
+                defaults to Config.SESSION_BACKEND_TTL)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        super().__init__()
+        parsed = urlparse(url or Config.SESSION_REDIS_URL)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported session backend URL scheme: {parsed.scheme!r}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.prefix = Config.SESSION_REDIS_PREFIX if prefix is None else prefix
+        self.ttl = int(Config.SESSION_BACKEND_TTL if ttl is None else ttl)
+        self._local = threading.local()
+
+    def _connection(self) -> RespConnection:
+        """This thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = RespConnection(self.host, self.port, self.db, self.password, self.username)
+            self._local.conn = conn
+        return conn
+
+    def _call(self, action):
+        """Run ``action(conn)``, dropping the connection if it fails mid-conversation"""
+        conn = self._connection()
+        try:
+            return action(conn)
+        except (OSError, ConnectionError):
+            self._local.conn = None
+            conn.close()
+            raise
+
+    def _keys(self, session_id: str) -> Tuple[str, str]:
+        """Hash and list keys of a session"""
+        key = self.prefix + session_id
+        return key, key + ":m"
+
+    def state(self, session_id: str) -> SessionState:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        key, messages = self._keys(session_id)
+        (version, rewrites), length = self._call(lambda conn: conn.pipeline(
+            ("HMGET", key, "version", "rewrites"), ("LLEN", messages)))
+        return int(version or 0), int(rewrites or 0), length
+
+    def read(self, session_id: str, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if stop is not None and stop <= start:
+            return []
+        _, messages = self._keys(session_id)
+        items = self._call(lambda conn: conn.execute(
+            "LRANGE", messages, start, -1 if stop is None else stop - 1))
+        return [json.loads(item) for item in items]
+
+    def get_meta(self, session_id: str) -> Dict:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        key, _ = self._keys(session_id)
+        meta = self._call(lambda conn: conn.execute("HGET", key, "meta"))
+        return json.loads(meta) if meta else {}
+
+    def _write(self, session_id: str, expected: int, rewrite: bool, commands) -> int:
+        """
+        Queue ``commands`` in a transaction that only runs if the session is still at ``expected``
+        """
+        key, messages = self._keys(session_id)
+
+        def transaction(conn):
+            _, version = conn.pipeline(("WATCH", key), ("HGET", key, "version"))
+            version = int(version or 0)
+            if version != expected:
+                conn.execute("UNWATCH")
+                raise self._conflict(session_id, expected, version)
+            queued = [("MULTI",), *commands(key, messages),
+                      ("HINCRBY", key, "version", 1), ("HINCRBY", key, "rewrites", int(rewrite))]
+            if self.ttl:
+                queued += [("EXPIRE", key, self.ttl), ("EXPIRE", messages, self.ttl)]
+            queued.append(("EXEC",))
+            if conn.pipeline(*queued)[-1] is None:
+                # Another client wrote between WATCH and EXEC
+                raise self._conflict(session_id, expected)
+            return version + 1
+
+        return self._call(transaction)
+
+    def append(self, session_id: str, message: Dict, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self._write(session_id, expected, False,
+                           lambda key, messages: [("RPUSH", messages, _encode(message))])
+
+    def pop(self, session_id: str, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self._write(session_id, expected, True, lambda key, messages: [("RPOP", messages)])
+
+    def clear(self, session_id: str, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self._write(session_id, expected, True, lambda key, messages: [("DEL", messages)])
+
+    def replace(self, session_id: str, messages: List[Dict], expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        def rewrite(key, list_key):
+            commands = [("DEL", list_key)]
+            if messages:
+                commands.append(("RPUSH", list_key, *[_encode(message) for message in messages]))
+            return commands
+
+        return self._write(session_id, expected, True, rewrite)
+
+    def set_meta(self, session_id: str, meta: Dict, expected: int) -> int:
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self._write(session_id, expected, True,
+                           lambda key, messages: [("HSET", key, "meta", _encode(meta))])
+
+    def close(self):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class SessionLog:
+    """
+    One session in a shared backend, with the ConversationLog interface
+
+    Tracks the version it last saw; every write is conditional on it.
+    ``changes`` brings the view up to date with writes made elsewhere.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, backend: SessionBackend, session_id: str):
+        """
+        Open a session
+
+        Args:
+            backend: Shared backend
+            session_id: Session identifier
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.backend = backend
+        self.session_id = session_id
+        self.version, self.rewrites, self._length = backend.state(session_id)
+        self.meta = backend.get_meta(session_id) if self.version else {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def messages(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """
+        Read a range of turns
+
+        Args:
+            start: First turn
+            stop: Turn to stop before (defaults to the end this log has seen)
+
+        Returns:
+            Conversation messages
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return self.backend.read(self.session_id, start, self._length if stop is None else stop)
+
+    def read(self, index: int) -> Dict:
+        """
+        Read one turn
+
+        Args:
+            index: Turn index (negative indexes count from the end)
+
+        Returns:
+            Conversation message
+
+        Raises:
+            IndexError: If there is no such turn
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        index = range(self._length)[index]
+        return self.backend.read(self.session_id, index, index + 1)[0]
+
+    def append(self, message: Dict):
+        """
+        Append a turn
+
+        Raises:
+            SessionConflict: If the session changed since this log last saw it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.version = self.backend.append(self.session_id, message, self.version)
+        self._length += 1
+
+    def pop(self):
+        """
+        Remove the last turn
+
+        Raises:
+            SessionConflict: If the session changed since this log last saw it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._length:
+            return
+        self.version = self.backend.pop(self.session_id, self.version)
+        self.rewrites += 1
+        self._length -= 1
+
+    def clear(self):
+        """
+        Remove every turn
+
+        Raises:
+            SessionConflict: If the session changed since this log last saw it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self.version:
+            return
+        self.version = self.backend.clear(self.session_id, self.version)
+        self.rewrites += 1
+        self._length = 0
+
+    def replace(self, messages: List[Dict]):
+        """
+        Replace every turn
+
+        Raises:
+            SessionConflict: If the session changed since this log last saw it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        messages = list(messages)
+        self.version = self.backend.replace(self.session_id, messages, self.version)
+        self.rewrites += 1
+        self._length = len(messages)
+
+    def set_meta(self, meta: Dict):
+        """
+        Save session settings shared by every worker (e.g. the system prompt)
+
+        Raises:
+            SessionConflict: If the session changed since this log last saw it
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.version = self.backend.set_meta(self.session_id, meta, self.version)
+        self.rewrites += 1
+        self.meta = dict(meta)
+
+    def changes(self) -> Optional[Tuple[bool, List[Dict]]]:
+        """
+        Catch up with writes made by other workers
+
+        Returns:
+            None if nothing changed; otherwise (rewritten, appended) where
+            ``appended`` holds the new turns when only appends happened, and
+            ``rewritten`` is True when the caller must reload instead
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        version, rewrites, length = self.backend.state(self.session_id)
+        if version == self.version:
+            return None
+        appended = []
+        rewritten = rewrites != self.rewrites or length < self._length
+        if not rewritten:
+            appended = self.backend.read(self.session_id, self._length, length)
+            # A pop between the two reads shows up as missing turns
+            rewritten = len(appended) != length - self._length
+        if rewritten:
+            self.meta = self.backend.get_meta(self.session_id)
+            appended = []
+        self.version, self.rewrites, self._length = version, rewrites, length
+        return rewritten, appended
+
+    def sync(self):
+        """Writes are durable once they return; nothing to flush"""
+
+    def close(self):
+        """Nothing is held per session; the backend keeps the connections"""
+
+    def stats(self) -> Dict:
+        """
+        Get log statistics
+
+        Returns:
+            Dictionary with message count, version and backend name
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return {"messages": self._length, "version": self.version, "rewrites": self.rewrites,
+                "backend": self.backend.name}
+
+
+_backend: Optional[SessionBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_session_backend() -> Optional[SessionBackend]:
+    """
+    Get the process-wide shared session backend
+
+    Returns:
+        Backend selected by Config.SESSION_BACKEND, or None for "file"
+        (per-worker conversation logs in CONVERSATION_DIR)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _backend
+    kind = Config.SESSION_BACKEND
+    if kind == "file":
+        return None
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if kind == "sqlite":
+                    _backend = SQLiteSessionBackend()
+                elif kind == "redis":
+                    _backend = RedisSessionBackend()
+                else:
+                    raise ValueError(f"Unknown SESSION_BACKEND: {kind!r} (use file, sqlite or redis)")
+    return _backend
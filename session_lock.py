@@ -0,0 +1,323 @@
+"""
+Per-Session Request Serialization for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+A session's chatbot is not safe to use from two requests at once: two chats
+from the same browser (a double click, a second tab) would interleave their
+user and assistant messages and lose counter updates. The web layer
+therefore takes a per-session lease before touching the chatbot. Requests
+for the same session run one at a time, in arrival order (the lease is
+handed directly to the oldest waiter), while requests for different
+sessions never wait on each other. At most ``SESSION_QUEUE_DEPTH`` requests
+may queue behind the running one and none waits longer than
+``SESSION_LOCK_TIMEOUT``; beyond that the request is refused with
+SessionBusy (HTTP 429). A streaming response keeps its lease until the
+stream is closed.
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from config import Config
+from exceptions import SessionBusy
+from metrics import get_metrics
+
+
+class _Waiter:
+    """A request queued for a session, woken by the request ahead of it"""
+
+    __slots__ = ("granted", "event", "future", "loop")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self):
+        """Tell the waiter it now holds the lease (lock held)"""
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class _SessionQueue:
+    """Lease state of one session"""
+
+    __slots__ = ("held", "waiters")
+
+    def __init__(self):
+        self.held = False
+        self.waiters: Deque[_Waiter] = deque()
+
+
+class SessionLease:
+    """
+    Exclusive use of a session, held until released
+
+    Releasing is idempotent, so it can be wired to several cleanup paths
+    (a ``finally`` block and a response close callback).
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, locks: "SessionLocks", session_id: str, waited: float):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.locks = locks
+        self.session_id = session_id
+        self.waited = waited
+        self.released = False
+
+    def release(self):
+        """Hand the session to the next queued request, if any"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self.released:
+            self.released = True
+            self.locks._release(self.session_id)
+
+    def __enter__(self) -> "SessionLease":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class LeasedStream:
+    """
+    Async iterator that releases a session lease once it is exhausted or closed
+
+    ASGI servers close a response body even when it was never iterated (the
+    client left before the first byte), which a plain async generator's
+    ``finally`` would miss.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, stream, lease: SessionLease):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stream = stream
+        self.lease = lease
+
+    def __aiter__(self) -> "LeasedStream":
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.stream.__anext__()
+        except BaseException:
+            self.lease.release()
+            raise
+
+    async def aclose(self):
+        """Close the wrapped stream and release the lease"""
+        try:
+            if hasattr(self.stream, "aclose"):
+                await self.stream.aclose()
+        finally:
+            self.lease.release()
+
+
+class SessionLocks:
+    """
+    FIFO leases keyed by session id, for threads and event loops
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, queue_depth: int = 4, timeout: float = 120.0):
+        """
+        Initialize the lease table
+
+        Args:
+            queue_depth: Requests that may wait behind a session's running request
+            timeout: Seconds a request may wait (0 waits forever)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._sessions: Dict[str, _SessionQueue] = {}
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.contended = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+    def _enter(self, session_id: str, waiter_factory) -> Optional[_Waiter]:
+        """Take the lease if it is free, otherwise queue a waiter (lock held)"""
+        queue = self._sessions.get(session_id)
+        if queue is None:
+            queue = self._sessions[session_id] = _SessionQueue()
+        if not queue.held:
+            queue.held = True
+            return None
+        if len(queue.waiters) >= self.queue_depth:
+            self.rejected_queue_full += 1
+            self._reject("queue_full")
+            raise SessionBusy(f"Too many requests queued for this session ({self.queue_depth} waiting)")
+        waiter = waiter_factory()
+        queue.waiters.append(waiter)
+        self.contended += 1
+        return waiter
+
+    def _abandon(self, session_id: str, waiter: _Waiter) -> bool:
+        """
+        Give up waiting (lock held)
+
+        Returns:
+            True if the lease was handed over meanwhile and is now held
+        """
+        if waiter.granted:
+            return True
+        self._sessions[session_id].waiters.remove(waiter)
+        self.rejected_timeout += 1
+        self._reject("timeout")
+        return False
+
+    def _release(self, session_id: str):
+        """Pass the lease to the oldest waiter, or free it"""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            if queue is None:
+                return
+            if queue.waiters:
+                queue.waiters.popleft().wake()
+            else:
+                del self._sessions[session_id]
+
+    def _granted(self, session_id: str, started: float) -> SessionLease:
+        """Record a successful acquisition"""
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.acquired += 1
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.session_lock_wait.observe(waited)
+        return SessionLease(self, session_id, waited)
+
+    def _reject(self, reason: str):
+        """Count a refused request in the metrics"""
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.session_lock_rejections.inc(reason)
+
+    def _timeout_error(self) -> SessionBusy:
+        return SessionBusy(f"Timed out after {self.timeout:g}s waiting for this session's earlier requests")
+
+    def acquire(self, session_id: str) -> SessionLease:
+        """
+        Wait for exclusive use of a session
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Lease to release when the request is done with the session
+
+        Raises:
+            SessionBusy: If the session's queue is full or the wait timed out
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        started = time.perf_counter()
+        with self._lock:
+            waiter = self._enter(session_id, _Waiter)
+        if waiter is not None and not waiter.event.wait(self.timeout or None):
+            with self._lock:
+                if not self._abandon(session_id, waiter):
+                    raise self._timeout_error()
+        return self._granted(session_id, started)
+
+    async def acquire_async(self, session_id: str) -> SessionLease:
+        """
+        Async variant of acquire; waits without blocking the event loop
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Lease to release when the request is done with the session
+
+        Raises:
+            SessionBusy: If the session's queue is full or the wait timed out
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._enter(session_id, lambda: _Waiter(loop))
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.timeout or None)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if not self._abandon(session_id, waiter):
+                        raise self._timeout_error()
+            except asyncio.CancelledError:
+                # The client went away: leave the queue, or pass on a lease granted meanwhile
+                with self._lock:
+                    granted = waiter.granted or self._abandon(session_id, waiter)
+                if granted:
+                    self._release(session_id)
+                raise
+        return self._granted(session_id, started)
+
+    def stats(self) -> Dict:
+        """
+        Get lease statistics
+
+        Returns:
+            Dictionary with acquisition, contention and rejection counts and wait times
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "timeout": self.timeout,
+                "active_sessions": len(self._sessions),
+                "queued": sum(len(queue.waiters) for queue in self._sessions.values()),
+                "acquired": self.acquired,
+                "contended": self.contended,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "mean_wait": round(self.wait_seconds / self.acquired, 6) if self.acquired else 0.0,
+                "max_wait": round(self.max_wait, 6)
+            }
+
+
+_session_locks: Optional[SessionLocks] = None
+_session_locks_lock = threading.Lock()
+
+
+def get_session_locks() -> Optional[SessionLocks]:
+    """
+    Get the process-wide session lease table
+
+    Returns:
+        Shared SessionLocks, or None if session serialization is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _session_locks
+    if not Config.SESSION_LOCK_ENABLED:
+        return None
+    if _session_locks is None:
+        with _session_locks_lock:
+            if _session_locks is None:
+                _session_locks = SessionLocks(Config.SESSION_QUEUE_DEPTH, Config.SESSION_LOCK_TIMEOUT)
+    return _session_locks
@@ -0,0 +1,442 @@
+"""
+Session Store for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Bounded, evicting storage for per-session chatbot instances.
+Sessions are evicted in least-recently-used order when the store exceeds its
+session limit or memory budget, and whenever they sit idle past the TTL.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from conversation_log import ConversationLog
+from session_backend import get_session_backend
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+EvictionHook = Callable[[str, Any, str], None]
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimate the memory held by a stored object
+
+    Uses the object's own ``memory_footprint()`` when available so the
+    estimate stays O(1); falls back to ``sys.getsizeof`` otherwise.
+
+    Args:
+        obj: Stored object
+
+    Returns:
+        Estimated size in bytes
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    footprint = getattr(obj, "memory_footprint", None)
+    if callable(footprint):
+        return int(footprint())
+    return sys.getsizeof(obj)
+
+
+def conversation_path(directory: str, session_id: str) -> str:
+    """
+    Get the file path of a session's conversation log
+
+    Args:
+        directory: Conversation directory
+        session_id: Session identifier
+
+    Returns:
+        Path to the conversation log
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return os.path.join(directory, f"{session_id}.jsonl")
+
+
+def make_persist_hook(directory: str) -> EvictionHook:
+    """
+    Build an eviction hook that makes a conversation durable before it is dropped
+
+    Chatbots with an attached log have already written every message, so
+    the log is just synced and closed; others are saved as a compacted log.
+
+    Args:
+        directory: Directory to save conversations in
+
+    Returns:
+        Eviction hook
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    def persist_evicted_session(session_id: str, chatbot: Any, reason: str):
+        log = getattr(chatbot, "log", None)
+        if log is not None:
+            log.close()
+            return
+        if not chatbot.conversation_history:
+            return
+        os.makedirs(directory, exist_ok=True)
+        chatbot.save_conversation(conversation_path(directory, session_id))
+
+    return persist_evicted_session
+
+
+def restore_conversation(chatbot: Any, directory: str, session_id: str) -> bool:
+    """
+    Attach a session's conversation log to a new chatbot, restoring its history
+
+    With a shared SESSION_BACKEND the session is opened there instead. A
+    conversation saved by older versions as ``<session_id>.json`` is
+    migrated into the log and the JSON file removed.
+
+    Args:
+        chatbot: Freshly created chatbot
+        directory: Conversation directory
+        session_id: Session identifier
+
+    Returns:
+        True if a conversation was restored
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    backend = get_session_backend()
+    if backend is not None:
+        # Shared with every worker; the per-worker directory is not used
+        chatbot.attach_log(backend.open(session_id))
+        return bool(len(chatbot.log))
+    path = conversation_path(directory, session_id)
+    legacy_path = os.path.join(directory, f"{session_id}.json")
+    migrate = os.path.exists(legacy_path) and not os.path.exists(path)
+    if migrate:
+        chatbot.load_conversation(legacy_path)
+    chatbot.attach_log(ConversationLog(path))
+    if migrate:
+        os.remove(legacy_path)
+    return bool(chatbot.conversation_history)
+
+
+class SessionStore:
+    """
+    Base interface for session stores
+
+    Subclasses decide where sessions live and when they are dropped.
+    Every store reports the same statistics so the web layer does not care
+    which implementation is plugged in.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Return the session object or None if it is not stored"""
+        raise NotImplementedError
+
+    def put(self, session_id: str, obj: Any):
+        """Store a session object"""
+        raise NotImplementedError
+
+    def remove(self, session_id: str) -> Optional[Any]:
+        """Remove a session object without running eviction hooks"""
+        raise NotImplementedError
+
+    def refresh(self, session_id: str):
+        """Re-measure a session after it has been mutated"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        """Return store statistics"""
+        raise NotImplementedError
+
+    def get_or_create(self, session_id: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a session object, creating it with ``factory`` on a miss
+
+        Args:
+            session_id: Session identifier
+            factory: Callable returning a new session object
+
+        Returns:
+            Stored session object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        obj = self.get(session_id)
+        if obj is None:
+            obj = factory()
+            self.put(session_id, obj)
+        return obj
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process LRU session store with idle TTL and memory budget
+
+    Lookups, inserts and evictions are O(1): entries live in an OrderedDict
+    kept in access order, so the least recently used (and therefore the
+    longest idle) session is always at the front.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_ttl: Optional[float] = None,
+                 memory_budget: Optional[int] = None,
+                 size_fn: Callable[[Any], int] = estimate_size):
+        """
+        Initialize the session store
+
+        Args:
+            max_sessions: Maximum number of live sessions (None for no limit)
+            idle_ttl: Seconds a session may stay idle before eviction (None for no limit)
+            memory_budget: Maximum estimated bytes held by all sessions (None for no limit)
+            size_fn: Function returning the estimated size of a stored object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget
+        self.size_fn = size_fn
+
+        # session_id -> [obj, size, last_access]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._hooks: List[EvictionHook] = []
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "evictions_lru": 0,
+            "evictions_ttl": 0,
+            "evictions_memory": 0
+        }
+
+    def get_or_create(self, session_id: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a session object, creating it with ``factory`` on a miss
+
+        The factory runs outside the store lock (restoring a conversation
+        may read from disk). If two requests create the same session at the
+        same time, the first object stored wins and both get it.
+
+        Args:
+            session_id: Session identifier
+            factory: Callable returning a new session object
+
+        Returns:
+            Stored session object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        obj = self.get(session_id)
+        if obj is not None:
+            return obj
+        created = factory()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                return entry[0]
+            evicted = self._insert(session_id, created, time.monotonic())
+        self._run_hooks(evicted)
+        return created
+
+    def add_eviction_hook(self, hook: EvictionHook):
+        """
+        Register a hook called as ``hook(session_id, obj, reason)`` before a
+        session is dropped
+
+        Hooks run outside the store lock, so they may do slow work such as
+        persisting the conversation to disk.
+
+        Args:
+            hook: Eviction hook
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._hooks.append(hook)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """
+        Get a session object and mark it as recently used
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Stored object or None
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._expire(now)
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self._counters["misses"] += 1
+                obj = None
+            else:
+                self._counters["hits"] += 1
+                self._entries.move_to_end(session_id)
+                entry[2] = now
+                self._resize(entry)
+                obj = entry[0]
+                evicted.extend(self._enforce_limits())
+        self._run_hooks(evicted)
+        return obj
+
+    def put(self, session_id: str, obj: Any):
+        """
+        Store a session object, evicting older sessions if needed
+
+        Args:
+            session_id: Session identifier
+            obj: Session object
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            evicted = self._insert(session_id, obj, time.monotonic())
+        self._run_hooks(evicted)
+
+    def remove(self, session_id: str) -> Optional[Any]:
+        """
+        Remove a session object without running eviction hooks
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Removed object or None
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return None
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def refresh(self, session_id: str):
+        """
+        Re-measure a session after it has been mutated and enforce the budget
+
+        Args:
+            session_id: Session identifier
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return
+            self._resize(entry)
+            evicted = self._enforce_limits()
+        self._run_hooks(evicted)
+
+    def evict_expired(self) -> int:
+        """
+        Evict all sessions idle for longer than the TTL
+
+        Returns:
+            Number of sessions evicted
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            evicted = self._expire(time.monotonic())
+        self._run_hooks(evicted)
+        return len(evicted)
+
+    def clear(self):
+        """Evict every session, running eviction hooks"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            evicted = []
+            while self._entries:
+                evicted.append(self._pop_oldest("clear"))
+        self._run_hooks(evicted)
+
+    def stats(self) -> Dict:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with live counts, evictions and bytes held
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            stats = self._counters.copy()
+            stats["live_sessions"] = len(self._entries)
+            stats["bytes_held"] = self._bytes
+            stats["max_sessions"] = self.max_sessions
+            stats["idle_ttl"] = self.idle_ttl
+            stats["memory_budget"] = self.memory_budget
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def _insert(self, session_id: str, obj: Any, now: float) -> List[Tuple[str, Any, str]]:
+        """Store an object and return the sessions evicted to make room (lock held)"""
+        evicted = self._expire(now)
+        old = self._entries.pop(session_id, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = self.size_fn(obj)
+        self._entries[session_id] = [obj, size, now]
+        self._bytes += size
+        evicted.extend(self._enforce_limits())
+        return evicted
+
+    def _resize(self, entry: list):
+        """Update the cached size of an entry"""
+        size = self.size_fn(entry[0])
+        self._bytes += size - entry[1]
+        entry[1] = size
+
+    def _pop_oldest(self, reason: str) -> Tuple[str, Any, str]:
+        """Drop the least recently used entry"""
+        session_id, entry = self._entries.popitem(last=False)
+        self._bytes -= entry[1]
+        self._counters["evictions"] += 1
+        counter = f"evictions_{reason}"
+        if counter in self._counters:
+            self._counters[counter] += 1
+        return session_id, entry[0], reason
+
+    def _expire(self, now: float) -> List[Tuple[str, Any, str]]:
+        """Drop sessions idle for longer than the TTL (oldest first)"""
+        evicted = []
+        if self.idle_ttl is None:
+            return evicted
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if now - entry[2] < self.idle_ttl:
+                break
+            evicted.append(self._pop_oldest("ttl"))
+        return evicted
+
+    def _enforce_limits(self) -> List[Tuple[str, Any, str]]:
+        """
+        Drop least recently used sessions until within count and memory limits
+
+        The most recently used session is never dropped for memory reasons,
+        so a single oversized conversation can still be served.
+        """
+        evicted = []
+        while self.max_sessions is not None and len(self._entries) > self.max_sessions:
+            evicted.append(self._pop_oldest("lru"))
+        while (self.memory_budget is not None and self._bytes > self.memory_budget
+               and len(self._entries) > 1):
+            evicted.append(self._pop_oldest("memory"))
+        return evicted
+
+    def _run_hooks(self, evicted: List[Tuple[str, Any, str]]):
+        """Run eviction hooks for dropped sessions"""
+        for session_id, obj, reason in evicted:
+            for hook in self._hooks:
+                try:
+                    hook(session_id, obj, reason)
+                except Exception as e:
+                    print(f"Session eviction hook failed for {session_id}: {e}")
@@ -19,11 +19,28 @@ setup(
     author_email="help@rskworld.in",
     url="https://rskworld.in",
     packages=find_packages(),
+    py_modules=[
+        "app", "asgi_app", "async_chatbot", "batch", "batch_api", "chatbot", "client_pool", "config",
+        "context_window", "conversation_log", "exceptions", "history", "metrics", "personas", "pricing",
+        "profiler", "prompt_builder", "rate_limiter", "response_cache", "retry_policy", "search_index",
+        "semantic_cache", "serve", "session_backend", "session_lock", "session_store", "singleflight",
+        "sse", "stream_relay", "tracing",
+    ],
+    entry_points={
+        "console_scripts": ["chatbot-serve=serve:main"],
+    },
     install_requires=[
         "openai>=1.0.0",
         "python-dotenv>=1.0.0",
         "flask>=2.3.0",
     ],
+    extras_require={
+        "http2": ["h2>=4.0.0"],
+        "async": ["quart>=0.19.0", "uvicorn>=0.23.0"],
+        "semantic": ["numpy>=1.21.0"],
+        "serve": ["gunicorn>=21.2.0"],
+        "gevent": ["gunicorn>=21.2.0", "gevent>=23.9.0"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,573 @@
+"""
+Request Coalescing (Single-Flight) for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+When many sessions send the same deterministic request at the same moment
+(a popular template or persona greeting), only the first one goes upstream;
+the others wait for its result. Streams are shared through a ring buffer:
+one reader pulls the upstream stream and every subscriber keeps its own
+cursor, so a subscriber that joins late first replays the chunks already
+received. Joining is only possible while the buffer still holds the first
+chunk. The slowest subscriber holds the reader back (as STREAM_BUFFER_SIZE
+does for a single stream), and upstream is closed once every subscriber has
+gone away.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from config import Config
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+_END = object()
+
+
+class _Call:
+    """A non-streaming call in flight"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class ChunkBroadcast:
+    """
+    Ring buffer fanning one stream of chunks out to several subscribers
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Create an empty broadcast
+
+        Args:
+            capacity: Chunks kept for replay and read-ahead
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.capacity = max(1, capacity)
+        self._ring: list = [None] * self.capacity
+        self._count = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cursors: Dict[int, int] = {}
+        self._next_id = 0
+        self._cond = threading.Condition()
+
+    def subscribe(self) -> Optional["BroadcastSubscriber"]:
+        """
+        Add a subscriber that starts from the first chunk
+
+        Returns:
+            Subscriber, or None if the first chunk has already been overwritten
+            or every earlier subscriber has left
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._cond:
+            if self._count > self.capacity or (self._next_id and not self._cursors):
+                return None
+            subscriber_id = self._next_id
+            self._next_id += 1
+            self._cursors[subscriber_id] = 0
+            return BroadcastSubscriber(self, subscriber_id, self._count)
+
+    def publish(self, chunk) -> bool:
+        """
+        Append a chunk, waiting while the slowest subscriber is a full ring behind
+
+        Args:
+            chunk: Chunk to broadcast
+
+        Returns:
+            False once every subscriber has left (the reader should stop)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._cond:
+            while self._cursors and self._count - min(self._cursors.values()) >= self.capacity:
+                self._cond.wait()
+            if not self._cursors:
+                return False
+            self._ring[self._count % self.capacity] = chunk
+            self._count += 1
+            self._cond.notify_all()
+            return True
+
+    def finish(self, error: Optional[BaseException] = None):
+        """
+        Mark the stream finished
+
+        Args:
+            error: Exception to raise in every subscriber after its last chunk
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def _next(self, subscriber_id: int):
+        """Get a subscriber's next chunk, _END, or raise the stream's error"""
+        with self._cond:
+            while True:
+                cursor = self._cursors[subscriber_id]
+                if cursor < self._count:
+                    chunk = self._ring[cursor % self.capacity]
+                    self._cursors[subscriber_id] = cursor + 1
+                    self._cond.notify_all()
+                    return chunk
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return _END
+                self._cond.wait()
+
+    def _leave(self, subscriber_id: int):
+        """Remove a subscriber"""
+        with self._cond:
+            self._cursors.pop(subscriber_id, None)
+            self._cond.notify_all()
+
+
+class BroadcastSubscriber:
+    """
+    One reader of a ChunkBroadcast
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, broadcast: ChunkBroadcast, subscriber_id: int, replayed: int):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._broadcast = broadcast
+        self._id = subscriber_id
+        self.replayed = replayed
+        self._closed = False
+
+    def __iter__(self) -> Iterator:
+        """
+        Yield every chunk of the stream from the start
+
+        Raises:
+            Exception: Whatever the upstream stream raised
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        try:
+            while not self._closed:
+                chunk = self._broadcast._next(self._id)
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """
+        Stop reading; upstream is closed when the last subscriber leaves
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._closed:
+            self._closed = True
+            self._broadcast._leave(self._id)
+
+
+class AsyncChunkBroadcast:
+    """
+    Ring buffer fanning one async stream out to several subscribers on one event loop
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Create an empty broadcast
+
+        Args:
+            capacity: Chunks kept for replay and read-ahead
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.capacity = max(1, capacity)
+        self._ring: list = [None] * self.capacity
+        self._count = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cursors: Dict[int, int] = {}
+        self._next_id = 0
+        self._cond = asyncio.Condition()
+
+    def subscribe(self) -> Optional["AsyncBroadcastSubscriber"]:
+        """
+        Add a subscriber that starts from the first chunk
+
+        Returns:
+            Subscriber, or None if the first chunk has already been overwritten
+            or every earlier subscriber has left
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        # No await between the check and the update, so no lock is needed
+        if self._count > self.capacity or (self._next_id and not self._cursors):
+            return None
+        subscriber_id = self._next_id
+        self._next_id += 1
+        self._cursors[subscriber_id] = 0
+        return AsyncBroadcastSubscriber(self, subscriber_id, self._count)
+
+    async def publish(self, chunk) -> bool:
+        """
+        Append a chunk, waiting while the slowest subscriber is a full ring behind
+
+        Args:
+            chunk: Chunk to broadcast
+
+        Returns:
+            False once every subscriber has left (the reader should stop)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        async with self._cond:
+            while self._cursors and self._count - min(self._cursors.values()) >= self.capacity:
+                await self._cond.wait()
+            if not self._cursors:
+                return False
+            self._ring[self._count % self.capacity] = chunk
+            self._count += 1
+            self._cond.notify_all()
+            return True
+
+    async def finish(self, error: Optional[BaseException] = None):
+        """
+        Mark the stream finished
+
+        Args:
+            error: Exception to raise in every subscriber after its last chunk
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        async with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    async def _next(self, subscriber_id: int):
+        """Get a subscriber's next chunk, _END, or raise the stream's error"""
+        async with self._cond:
+            while True:
+                cursor = self._cursors[subscriber_id]
+                if cursor < self._count:
+                    chunk = self._ring[cursor % self.capacity]
+                    self._cursors[subscriber_id] = cursor + 1
+                    self._cond.notify_all()
+                    return chunk
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return _END
+                await self._cond.wait()
+
+    async def _leave(self, subscriber_id: int):
+        """Remove a subscriber"""
+        async with self._cond:
+            self._cursors.pop(subscriber_id, None)
+            self._cond.notify_all()
+
+
+class AsyncBroadcastSubscriber:
+    """
+    One reader of an AsyncChunkBroadcast
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, broadcast: AsyncChunkBroadcast, subscriber_id: int, replayed: int):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._broadcast = broadcast
+        self._id = subscriber_id
+        self.replayed = replayed
+        self._closed = False
+
+    async def __aiter__(self):
+        """
+        Yield every chunk of the stream from the start
+
+        Raises:
+            Exception: Whatever the upstream stream raised
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        while not self._closed:
+            chunk = await self._broadcast._next(self._id)
+            if chunk is _END:
+                return
+            yield chunk
+
+    async def cancel(self):
+        """
+        Stop reading; upstream is closed when the last subscriber leaves
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._closed:
+            self._closed = True
+            await self._broadcast._leave(self._id)
+
+
+class SingleFlight:
+    """
+    Process-wide registry of identical requests in flight
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_temperature: float = 0.0, stream_buffer: int = 1024):
+        """
+        Create the registry
+
+        Args:
+            max_temperature: Requests at or below this temperature may be shared
+            stream_buffer: Ring buffer size (chunks) for shared streams
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_temperature = max_temperature
+        self.stream_buffer = stream_buffer
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Tuple[Any, str], asyncio.Future] = {}
+        self._streams: Dict[str, ChunkBroadcast] = {}
+        self._async_streams: Dict[Tuple[Any, str], AsyncChunkBroadcast] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+        self.stream_leaders = 0
+        self.stream_followers = 0
+        self.replayed_chunks = 0
+
+    def is_shareable(self, api_params: dict) -> bool:
+        """
+        Check whether a request is deterministic enough to share its reply
+
+        Args:
+            api_params: API parameters dictionary
+
+        Returns:
+            True if the request's temperature is at or below the threshold
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        return api_params.get("temperature", 1.0) <= self.max_temperature
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` unless an identical call is in flight, then share its result
+
+        Args:
+            key: Request key (see response_cache.make_cache_key)
+            fn: Makes the upstream call
+
+        Returns:
+            (result, shared) where shared is True if another caller's result was reused
+
+        Raises:
+            Exception: Whatever ``fn`` raised, in the leader and every follower
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """
+        Await ``fn`` unless an identical call is in flight on this event loop
+
+        The call runs as its own task, so a caller that is cancelled does not
+        cancel the call for the others.
+
+        Args:
+            key: Request key
+            fn: Returns a coroutine making the upstream call
+
+        Returns:
+            (result, shared) where shared is True if another caller's result was reused
+
+        Raises:
+            Exception: Whatever ``fn`` raised, in the leader and every follower
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._async_calls.get(flight_key)
+            leader = task is None
+            if leader:
+                task = self._async_calls[flight_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._async_calls.pop(flight_key, None))
+                self.leaders += 1
+            else:
+                self.followers += 1
+        return await asyncio.shield(task), not leader
+
+    def stream(self, key: str, open_stream: Callable[[], Any]) -> Tuple[BroadcastSubscriber, bool]:
+        """
+        Subscribe to an identical stream in flight, or start one
+
+        The leader's upstream stream is opened and read on a reader thread.
+
+        Args:
+            key: Request key
+            open_stream: Opens the upstream stream
+
+        Returns:
+            (subscriber, shared) where shared is True if an existing stream was joined
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            broadcast = self._streams.get(key)
+            subscriber = broadcast.subscribe() if broadcast is not None else None
+            if subscriber is not None:
+                self.stream_followers += 1
+                self.replayed_chunks += subscriber.replayed
+                return subscriber, True
+            broadcast = self._streams[key] = ChunkBroadcast(self.stream_buffer)
+            subscriber = broadcast.subscribe()
+            self.stream_leaders += 1
+
+        threading.Thread(target=self._pump, args=(key, broadcast, open_stream),
+                         name="singleflight-stream", daemon=True).start()
+        return subscriber, False
+
+    def _pump(self, key: str, broadcast: ChunkBroadcast, open_stream: Callable[[], Any]):
+        """Reader thread: open upstream and publish its chunks"""
+        stream = None
+        try:
+            stream = open_stream()
+            for chunk in stream:
+                if not broadcast.publish(chunk):
+                    break
+            broadcast.finish()
+        except BaseException as e:
+            broadcast.finish(e)
+        finally:
+            with self._lock:
+                if self._streams.get(key) is broadcast:
+                    del self._streams[key]
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+    async def stream_async(self, key: str,
+                           open_stream: Callable[[], Awaitable]) -> Tuple[AsyncBroadcastSubscriber, bool]:
+        """
+        Subscribe to an identical stream in flight on this event loop, or start one
+
+        Args:
+            key: Request key
+            open_stream: Returns a coroutine opening the upstream async stream
+
+        Returns:
+            (subscriber, shared) where shared is True if an existing stream was joined
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            broadcast = self._async_streams.get(flight_key)
+            subscriber = broadcast.subscribe() if broadcast is not None else None
+            if subscriber is not None:
+                self.stream_followers += 1
+                self.replayed_chunks += subscriber.replayed
+                return subscriber, True
+            broadcast = self._async_streams[flight_key] = AsyncChunkBroadcast(self.stream_buffer)
+            subscriber = broadcast.subscribe()
+            self.stream_leaders += 1
+
+        asyncio.ensure_future(self._pump_async(flight_key, broadcast, open_stream))
+        return subscriber, False
+
+    async def _pump_async(self, flight_key: Tuple[Any, str], broadcast: AsyncChunkBroadcast,
+                          open_stream: Callable[[], Awaitable]):
+        """Reader task: open upstream and publish its chunks"""
+        stream = None
+        try:
+            stream = await open_stream()
+            async for chunk in stream:
+                if not await broadcast.publish(chunk):
+                    break
+            await broadcast.finish()
+        except BaseException as e:
+            await broadcast.finish(e)
+        finally:
+            with self._lock:
+                if self._async_streams.get(flight_key) is broadcast:
+                    del self._async_streams[flight_key]
+            close = getattr(stream, "close", None)
+            if close:
+                await close()
+
+    def stats(self) -> Dict:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with upstream calls, shared callers and the collapse ratio
+            (callers per upstream call)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        with self._lock:
+            upstream = self.leaders + self.stream_leaders
+            shared = self.followers + self.stream_followers
+            return {
+                "upstream_calls": upstream,
+                "shared_calls": shared,
+                "collapse_ratio": round((upstream + shared) / upstream, 3) if upstream else 1.0,
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "stream_leaders": self.stream_leaders,
+                "stream_followers": self.stream_followers,
+                "replayed_chunks": self.replayed_chunks,
+                "in_flight": len(self._calls) + len(self._async_calls)
+                             + len(self._streams) + len(self._async_streams)
+            }
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Get the process-wide single-flight registry
+
+    Returns:
+        Shared SingleFlight, or None if coalescing is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _single_flight
+    if not Config.SINGLEFLIGHT_ENABLED:
+        return None
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight(Config.SINGLEFLIGHT_MAX_TEMPERATURE,
+                                              Config.SINGLEFLIGHT_STREAM_BUFFER)
+    return _single_flight
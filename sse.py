@@ -0,0 +1,294 @@
+"""
+Server-Sent Events Encoding for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Turns a stream of reply chunks into SSE frames without re-encoding a dict
+per token. Chunk frames are built from a precomputed prefix and the C JSON
+string escaper, and tiny deltas are coalesced into one frame by size or
+time window to cut per-frame overhead and write syscalls. The first chunk
+is always sent immediately so time-to-first-token is unaffected.
+
+When a worker is shutting down (see serve.py), open streams get until the
+drain deadline to finish; a stream still running then ends with a
+retryable error frame instead of being cut off mid-reply.
+
+When the request is traced (see tracing.py), the stream's frame count and
+the time spent building frames are added to its span.
+"""
+
+import time
+import json
+import asyncio
+from json.encoder import encode_basestring_ascii
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional
+
+from config import Config
+from tracing import NOOP_SPAN
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# Frames are byte-for-byte what json.dumps({'chunk': ...}) produced before (non-ASCII escaped to \uXXXX)
+SSE_CHUNK_PREFIX = 'data: {"chunk": '
+SSE_FRAME_SUFFIX = '}\n\n'
+SSE_DONE_FRAME = 'data: {"done": true}\n\n'
+SSE_RESTART_FRAME = 'data: {"error": "Server is restarting, please retry", "retry": true}\n\n'
+
+_drain_deadline: Optional[float] = None
+
+
+def begin_drain(timeout: float):
+    """
+    Ask open streams to finish within ``timeout`` seconds
+
+    Called once when the worker starts a graceful shutdown.
+
+    Args:
+        timeout: Seconds before remaining streams are ended with a retry frame
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _drain_deadline
+    _drain_deadline = time.monotonic() + timeout
+
+
+def _drain_due() -> bool:
+    """Whether open streams must end now"""
+    return _drain_deadline is not None and time.monotonic() >= _drain_deadline
+
+
+def encode_chunk(text: str) -> str:
+    """
+    Encode one reply chunk as an SSE frame
+
+    Args:
+        text: Reply text
+
+    Returns:
+        ``data: {"chunk": "..."}`` frame
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return SSE_CHUNK_PREFIX + encode_basestring_ascii(text) + SSE_FRAME_SUFFIX
+
+
+def encode_event(payload: dict) -> str:
+    """
+    Encode a control event (error, metadata) as an SSE frame
+
+    Args:
+        payload: JSON-serializable event
+
+    Returns:
+        SSE frame
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+class FrameCoalescer:
+    """
+    Buffer reply chunks and release them as one frame per size or time window
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, window_ms: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, timed: bool = False):
+        """
+        Initialize the coalescer
+
+        Args:
+            max_chars: Buffered characters that force a frame out
+            window_ms: Longest a chunk is held waiting for more (0 disables coalescing)
+            clock: Monotonic clock in seconds
+            timed: Whether to add the time spent building frames to encode_seconds
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.max_chars = Config.SSE_COALESCE_CHARS if max_chars is None else max_chars
+        self.window = (Config.SSE_COALESCE_MS if window_ms is None else window_ms) / 1000
+        self.clock = clock
+        self._parts: List[str] = []
+        self._chars = 0
+        self._first_at = 0.0
+        self._sent_first = False
+        self.frames = 0
+        self.chunks = 0
+        self.timed = timed
+        self.encode_seconds = 0.0
+
+    def add(self, text: str) -> Optional[str]:
+        """
+        Buffer a chunk
+
+        Args:
+            text: Reply chunk
+
+        Returns:
+            A frame to send now, or None while still coalescing
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.chunks += 1
+        if not self._parts:
+            self._first_at = self.clock()
+        self._parts.append(text)
+        self._chars += len(text)
+        if (not self._sent_first or self._chars >= self.max_chars
+                or self.clock() - self._first_at >= self.window):
+            return self.flush()
+        return None
+
+    def time_left(self) -> Optional[float]:
+        """
+        Get seconds until the buffered chunks are due
+
+        Returns:
+            Seconds left in the window, or None when nothing is buffered
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._parts:
+            return None
+        return max(0.0, self.window - (self.clock() - self._first_at))
+
+    def flush(self) -> Optional[str]:
+        """
+        Release everything buffered
+
+        Returns:
+            A frame, or None if nothing is buffered
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._parts:
+            return None
+        started = time.perf_counter() if self.timed else 0.0
+        text = self._parts[0] if len(self._parts) == 1 else "".join(self._parts)
+        self._parts = []
+        self._chars = 0
+        self._sent_first = True
+        self.frames += 1
+        frame = encode_chunk(text)
+        if self.timed:
+            self.encode_seconds += time.perf_counter() - started
+        return frame
+
+
+def _record_framing(span, coalescer: FrameCoalescer, drained: bool):
+    """Add a finished stream's framing counts and time to its span"""
+    if span.recording:
+        span.set_attributes({
+            "sse.frames": coalescer.frames,
+            "sse.chunks": coalescer.chunks,
+            "sse.encode_seconds": coalescer.encode_seconds,
+            "sse.drained": drained
+        })
+
+
+def sse_stream(chunks: Iterable[str], coalescer: Optional[FrameCoalescer] = None,
+               span=NOOP_SPAN) -> Iterator[str]:
+    """
+    Encode a reply stream as SSE frames, ending with a done or error frame
+
+    A held chunk is released when the next chunk arrives after the window,
+    so with a blocking iterator the extra delay is bounded by the gap
+    between upstream chunks.
+
+    Args:
+        chunks: Reply chunks
+        coalescer: Frame coalescer (defaults to the configured window)
+        span: Span that gets the frame count and framing time when the stream ends
+
+    Yields:
+        SSE frames
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    coalescer = coalescer or FrameCoalescer(timed=span.recording)
+    drained = False
+    try:
+        for chunk in chunks:
+            frame = coalescer.add(chunk)
+            if frame:
+                yield frame
+            if _drain_due():
+                drained = True
+                break
+        frame = coalescer.flush()
+        if frame:
+            yield frame
+        yield SSE_RESTART_FRAME if drained else SSE_DONE_FRAME
+    except Exception as e:
+        frame = coalescer.flush()
+        if frame:
+            yield frame
+        yield encode_event({'error': str(e)})
+    finally:
+        _record_framing(span, coalescer, drained)
+        # On client disconnect the server closes us; pass that on so upstream is cancelled
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+
+async def sse_stream_async(chunks: AsyncIterable[str], coalescer: Optional[FrameCoalescer] = None,
+                           span=NOOP_SPAN) -> AsyncIterator[str]:
+    """
+    Encode an async reply stream as SSE frames, ending with a done or error frame
+
+    Held chunks are released as soon as their window expires, even while
+    the next upstream chunk is still pending.
+
+    Args:
+        chunks: Reply chunks
+        coalescer: Frame coalescer (defaults to the configured window)
+        span: Span that gets the frame count and framing time when the stream ends
+
+    Yields:
+        SSE frames
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    coalescer = coalescer or FrameCoalescer(timed=span.recording)
+    iterator = chunks.__aiter__()
+    pending = None
+    drained = False
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = coalescer.time_left()
+            if timeout is not None:
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    yield coalescer.flush()
+                    continue
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                break
+            finally:
+                if pending.done():
+                    pending = None
+            frame = coalescer.add(chunk)
+            if frame:
+                yield frame
+            if _drain_due():
+                drained = True
+                break
+        frame = coalescer.flush()
+        if frame:
+            yield frame
+        yield SSE_RESTART_FRAME if drained else SSE_DONE_FRAME
+    except Exception as e:
+        frame = coalescer.flush()
+        if frame:
+            yield frame
+        yield encode_event({'error': str(e)})
+    finally:
+        _record_framing(span, coalescer, drained)
+        # On client disconnect the server cancels us; pass that on so upstream is cancelled
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.wait({pending})
+        aclose = getattr(chunks, "aclose", None)
+        if aclose:
+            await aclose()
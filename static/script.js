@@ -90,7 +90,7 @@ function setupEventListeners() {
     document.getElementById('closeSearchBtn').addEventListener('click', closeSearchModal);
     document.getElementById('exportJSON').addEventListener('click', exportAsJSON);
     document.getElementById('exportTXT').addEventListener('click', exportAsTXT);
-    document.getElementById('performSearch').addEventListener('click', performSearch);
+    document.getElementById('performSearch').addEventListener('click', () => performSearch());
     document.getElementById('resetStats').addEventListener('click', resetStats);
     
     // Close modal when clicking outside
@@ -212,13 +212,16 @@ async function sendStreamingMessage(message) {
         const reader = response.body.getReader();
         const decoder = new TextDecoder();
         let fullResponse = '';
+        let buffer = '';
         
         while (true) {
             const { done, value } = await reader.read();
             if (done) break;
             
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
+            // Frames can span reads; keep the trailing partial line for the next one
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
             
             for (const line of lines) {
                 if (line.startsWith('data: ')) {
@@ -537,7 +540,25 @@ function closeSearchModal() {
     document.getElementById('searchResults').innerHTML = '';
 }
 
-async function performSearch() {
+function escapeSearchText(text) {
+    // Author: RSK World (https://rskworld.in) - Year: 2026
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+}
+
+function renderHighlighted(text, spans) {
+    // Author: RSK World (https://rskworld.in) - Year: 2026
+    let html = '';
+    let last = 0;
+    (spans || []).forEach(([start, end]) => {
+        html += escapeSearchText(text.substring(last, start));
+        html += '<mark>' + escapeSearchText(text.substring(start, end)) + '</mark>';
+        last = end;
+    });
+    return html + escapeSearchText(text.substring(last));
+}
+
+async function performSearch(page = 1) {
     const query = document.getElementById('searchInput').value.trim();
     if (!query) {
         alert('Please enter a search query');
@@ -553,21 +574,33 @@ async function performSearch() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ query: query })
+            body: JSON.stringify({ query: query, page: page })
         });
         
         const data = await response.json();
         
-        if (data.results && data.results.length > 0) {
-            let html = `<h3>Found ${data.count} result(s):</h3>`;
-            data.results.forEach((msg, index) => {
+        if (data.error) {
+            resultsDiv.innerHTML = '<p>Error searching: ' + escapeSearchText(data.error) + '</p>';
+        } else if (data.results && data.results.length > 0) {
+            const first = (data.page - 1) * data.page_size + 1;
+            const last = first + data.results.length - 1;
+            let html = `<h3>Found ${data.total} result(s), showing ${first}-${last}:</h3>`;
+            data.results.forEach((msg) => {
                 html += `
                     <div class="search-result-item">
-                        <strong>${msg.role.toUpperCase()}:</strong>
-                        <p>${msg.content.substring(0, 200)}${msg.content.length > 200 ? '...' : ''}</p>
+                        <strong>${escapeSearchText(msg.role.toUpperCase())}:</strong>
+                        <p>${renderHighlighted(msg.snippet, msg.snippet_highlights)}</p>
                     </div>
                 `;
             });
+            html += '<div class="search-pagination">';
+            if (data.page > 1) {
+                html += `<button class="btn btn-secondary" onclick="performSearch(${data.page - 1})">Previous</button>`;
+            }
+            if (last < data.total) {
+                html += `<button class="btn btn-secondary" onclick="performSearch(${data.page + 1})">Next</button>`;
+            }
+            html += '</div>';
             resultsDiv.innerHTML = html;
         } else {
             resultsDiv.innerHTML = '<p>No results found.</p>';
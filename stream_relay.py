@@ -0,0 +1,273 @@
+"""
+Stream Relay for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Bounded buffer between the upstream OpenAI stream and the HTTP writer. A
+reader (thread or task) pulls chunks from upstream into a queue of at most
+``STREAM_BUFFER_SIZE`` chunks, so reading overlaps with writing but a slow
+client stalls the reader instead of letting chunks pile up in memory. When
+the client goes away the relay is cancelled and the upstream response is
+closed, so the model stops generating tokens nobody will read.
+
+StreamMeter does the per-stream accounting: time to first token, the gaps
+between tokens, the usage from the final chunk and, for streams that end
+without one, a token estimate kept up to date as chunks arrive.
+"""
+
+import time
+import queue
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from context_window import count_tokens
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+_END = object()
+
+_stats_lock = threading.Lock()
+_stream_stats = {
+    "cancelled_streams": 0,
+    "tokens_saved": 0
+}
+
+
+class _Failure:
+    """Carries an upstream exception from the reader to the writer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def record_cancelled_stream(tokens_saved: int):
+    """
+    Count a stream cancelled because the client disconnected
+
+    Args:
+        tokens_saved: Estimated completion tokens that were never generated
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with _stats_lock:
+        _stream_stats["cancelled_streams"] += 1
+        _stream_stats["tokens_saved"] += tokens_saved
+
+
+def get_stream_stats() -> Dict:
+    """
+    Get process-wide stream cancellation counters
+
+    Returns:
+        Dictionary with cancelled_streams and tokens_saved
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    with _stats_lock:
+        return dict(_stream_stats)
+
+
+class StreamMeter:
+    """
+    Token and timing accounting for one streamed reply
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, model: str, started: Optional[float] = None):
+        """
+        Start metering a stream
+
+        Args:
+            model: Model whose tokenizer estimates completion tokens
+            started: ``time.perf_counter()`` when the request was made (defaults to now)
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.model = model
+        self.started = time.perf_counter() if started is None else started
+        self.first_token: Optional[float] = None
+        self.last_token: Optional[float] = None
+        self.chunks = 0
+        self.estimated_tokens = 0
+        self.max_gap = 0.0
+        self.usage = None
+        self._gap_total = 0.0
+
+    def observe(self, chunk) -> Optional[str]:
+        """
+        Account for one chunk
+
+        Args:
+            chunk: Chat completion chunk
+
+        Returns:
+            The chunk's text, or None for a chunk without content
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if chunk.usage:
+            # Final chunk when stream_options.include_usage is set (empty choices)
+            self.usage = chunk.usage
+        if not (chunk.choices and chunk.choices[0].delta.content):
+            return None
+        content = chunk.choices[0].delta.content
+        now = time.perf_counter()
+        if self.first_token is None:
+            self.first_token = now
+        else:
+            gap = now - self.last_token
+            self._gap_total += gap
+            if gap > self.max_gap:
+                self.max_gap = gap
+        self.last_token = now
+        self.chunks += 1
+        self.estimated_tokens += count_tokens(content, self.model)
+        return content
+
+    @property
+    def completion_tokens(self) -> int:
+        """Completion tokens: reported by the API, else the running estimate"""
+        return self.usage.completion_tokens if self.usage is not None else self.estimated_tokens
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from the request to the first token, or None if none arrived"""
+        return self.first_token - self.started if self.first_token is not None else None
+
+    @property
+    def inter_token_latency(self) -> Optional[float]:
+        """Mean seconds between consecutive content chunks, or None with fewer than two"""
+        return self._gap_total / (self.chunks - 1) if self.chunks > 1 else None
+
+
+class ChunkRelay:
+    """
+    Pump a blocking upstream stream through a bounded queue on a reader thread
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, stream, maxsize: int):
+        """
+        Start relaying
+
+        Args:
+            stream: Upstream stream of chunks (closed when the relay stops)
+            maxsize: Chunks buffered before the reader blocks
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stream = stream
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._pump, name="chunk-relay", daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        """Reader thread: copy chunks into the queue until done or cancelled"""
+        try:
+            for chunk in self.stream:
+                self._queue.put(chunk)
+                if self._cancelled.is_set():
+                    break
+            else:
+                self._queue.put(_END)
+        except BaseException as e:
+            if not self._cancelled.is_set():
+                self._queue.put(_Failure(e))
+        finally:
+            # Closed from this thread, which is the one using the connection
+            close = getattr(self.stream, "close", None)
+            if close:
+                close()
+
+    def __iter__(self) -> Iterator:
+        """
+        Yield relayed chunks
+
+        Raises:
+            Exception: Whatever the upstream stream raised
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def cancel(self):
+        """
+        Stop relaying; the reader closes upstream after its current chunk
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._cancelled.set()
+        # Make room so a reader blocked on a full queue wakes up and sees the flag
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+
+class AsyncChunkRelay:
+    """
+    Pump an async upstream stream through a bounded queue on a reader task
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, stream, maxsize: int):
+        """
+        Start relaying
+
+        Args:
+            stream: Upstream async stream of chunks (closed when the relay stops)
+            maxsize: Chunks buffered before the reader waits
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stream = stream
+        self._queue: "asyncio.Queue" = asyncio.Queue(maxsize)
+        self._task = asyncio.ensure_future(self._pump())
+
+    async def _pump(self):
+        """Reader task: copy chunks into the queue until done"""
+        try:
+            async for chunk in self.stream:
+                await self._queue.put(chunk)
+            await self._queue.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            await self._queue.put(_Failure(e))
+
+    async def __aiter__(self) -> AsyncIterator:
+        """
+        Yield relayed chunks
+
+        Raises:
+            Exception: Whatever the upstream stream raised
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        while True:
+            item = await self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    async def cancel(self):
+        """
+        Stop the reader and close the upstream response
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if not self._task.done():
+            self._task.cancel()
+            await asyncio.wait({self._task})
+        close = getattr(self.stream, "close", None)
+        if close:
+            await close()
+
@@ -0,0 +1,808 @@
+"""
+Request Tracing for OpenAI GPT Chatbot
+
+Author: RSK World
+Website: https://rskworld.in
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Year: 2026
+
+Per-request spans around each stage of a chat: prompt assembly and JSON
+encoding, cache lookup, rate limiting, every upstream attempt, retry sleeps,
+recording the reply and SSE framing. Spans follow the OpenTelemetry data
+model (trace and span ids, parent links, kinds, attributes, status) and are
+exported as OTLP/JSON, so any OpenTelemetry collector or tracing backend
+accepts them without the OpenTelemetry SDK installed:
+
+- ``memory``: the last ``TRACING_BUFFER_SIZE`` spans, served at ``/api/traces``
+- ``file``: one OTLP span per line in ``TRACING_FILE``
+- ``otlp``: batched POSTs to an OTLP/HTTP endpoint from a background thread
+
+An incoming W3C ``traceparent`` header continues the caller's trace; new
+traces are sampled at ``TRACING_SAMPLE_RATE``. With tracing disabled,
+``span()`` returns a shared no-op span, so the instrumented code pays one
+function call per stage. Hooks added with ``add_span_hook`` see every
+finished span (the metrics hook turns them into per-stage histograms).
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import contextvars
+import urllib.request
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from config import Config
+from metrics import get_metrics
+
+
+# Author: RSK World (https://rskworld.in) - Year: 2026
+# Span kinds and status codes as numbered by the OTLP protobuf
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Routes that would only trace themselves (reading traces, metrics or profiles)
+UNTRACED_ROUTES = frozenset({"/api/traces", "/metrics", "/api/debug/profile", "/static/<path:filename>"})
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("chatbot_current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    """Random non-zero hex id (16 bytes for traces, 8 for spans)"""
+    return "%0*x" % (nbytes * 2, random.getrandbits(nbytes * 8) or 1)
+
+
+def _attribute(key: str, value) -> Dict:
+    """Encode one attribute as an OTLP KeyValue"""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class SpanContext:
+    """
+    Identity of a span to continue from, e.g. parsed from a ``traceparent`` header
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """
+    Parse a W3C ``traceparent`` header
+
+    Args:
+        header: Header value, e.g. ``00-<32 hex trace id>-<16 hex span id>-01``
+
+    Returns:
+        SpanContext of the remote parent, or None if the header is missing or malformed
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not header:
+        return None
+    parts = header.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff" or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3][:2], 16)
+        if not int(parts[1], 16) or not int(parts[2], 16):
+            return None
+    except ValueError:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+class NoopSpan:
+    """
+    Span returned when tracing is disabled or the trace is not sampled
+
+    Every method does nothing, so instrumented code never checks whether
+    tracing is on. One shared instance is used.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    __slots__ = ()
+    recording = False
+    trace_id = None
+    span_id = None
+    sampled = False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def set_attributes(self, attributes: Dict):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+    def traceparent(self) -> Optional[str]:
+        return None
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    """
+    One timed operation in a trace
+
+    Used as a context manager it becomes the current span, so spans opened
+    inside it are its children, and it ends on exit, recording any exception
+    (a closed generator or cancelled task is not an error). Spans that stay
+    open across a ``yield`` are started with ``activate=False``, since the
+    current span must not leak into whoever resumes the generator; stages
+    under them pass it as ``parent`` or run inside ``use_span``.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    __slots__ = ("tracer", "name", "kind", "trace_id", "span_id", "parent_id", "sampled", "attributes",
+                 "events", "status", "status_message", "start_ns", "end_ns", "_started", "_activate", "_token")
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, parent=None, kind: int = KIND_INTERNAL,
+                 attributes: Optional[Dict] = None, activate: bool = True, sampled: bool = True):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else _new_id(16)
+        self.span_id = _new_id(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.sampled = sampled
+        self.attributes = dict(attributes) if attributes else {}
+        self.events: List[Dict] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        # Wall clock for the start, monotonic clock for the duration
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self.end_ns = None
+        self._activate = activate
+        self._token = None
+
+    def set_attribute(self, key: str, value):
+        """Set one attribute (str, bool, int or float)"""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict):
+        """Set several attributes"""
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException):
+        """
+        Mark the span failed and attach the error as an ``exception`` event
+
+        Args:
+            error: The exception
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.status = STATUS_ERROR
+        self.status_message = str(error)
+        self.events.append({
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": [_attribute("exception.type", type(error).__name__),
+                           _attribute("exception.message", str(error))]
+        })
+
+    def end(self):
+        """Finish the span and hand it to the hooks and exporter (idempotent)"""
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + (time.perf_counter_ns() - self._started)
+            self.tracer._finish(self)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (so far, if still open)"""
+        end = self.end_ns if self.end_ns is not None else self.start_ns + (time.perf_counter_ns() - self._started)
+        return (end - self.start_ns) / 1e9
+
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` header value identifying this span"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_otlp(self) -> Dict:
+        """
+        Encode the span as OTLP/JSON
+
+        Returns:
+            Span object of an OTLP ``ExportTraceServiceRequest``
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        encoded = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status}
+        }
+        if self.parent_id:
+            encoded["parentSpanId"] = self.parent_id
+        if self.events:
+            encoded["events"] = self.events
+        if self.status_message:
+            encoded["status"]["message"] = self.status_message
+        return encoded
+
+    def __enter__(self) -> "Span":
+        if self._activate:
+            self._token = _current_span.set(self)
+        return self
+
+    def detach(self):
+        """Stop being the current span without ending (e.g. when a streamed body takes it over)"""
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                pass  # Entered in another context (e.g. a hook run by a different task)
+            self._token = None
+
+    def __exit__(self, exc_type, exc, tb):
+        if isinstance(exc, Exception):
+            self.record_error(exc)
+        self.detach()
+        self.end()
+        return False
+
+
+class MemoryExporter:
+    """
+    Ring buffer of recently finished spans, served at ``/api/traces``
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, size: int = 1000):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._spans: Deque[Span] = deque(maxlen=size)
+
+    def export(self, span: Span):
+        self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None, limit: Optional[int] = None) -> List[Span]:
+        """
+        Get buffered spans, oldest first
+
+        Args:
+            trace_id: Only spans of this trace
+            limit: Only the most recent ``limit`` spans
+
+        Returns:
+            Spans
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        spans = list(self._spans)
+        if trace_id:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return spans[-limit:] if limit else spans
+
+    def shutdown(self):
+        pass
+
+
+class FileExporter:
+    """
+    Append each finished span to a file as one OTLP/JSON line
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, path: str):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_otlp(), separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpExporter:
+    """
+    Send spans to an OTLP/HTTP (JSON) endpoint in batches from a background thread
+
+    Finished spans are queued without blocking the request; when the queue
+    is full the oldest spans are dropped and counted.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, endpoint: str, resource: Dict, headers: Optional[Dict] = None,
+                 queue_size: int = 1000, batch_size: int = 256, interval: float = 2.0):
+        """
+        Initialize the exporter and start its sender thread
+
+        Args:
+            endpoint: URL of the collector's traces endpoint (``.../v1/traces``)
+            resource: OTLP resource describing this service
+            headers: Extra HTTP headers (e.g. authentication)
+            queue_size: Spans held while waiting to be sent
+            batch_size: Spans per request
+            interval: Seconds between sends when the batch is not full
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.endpoint = endpoint
+        self.resource = resource
+        self.headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: Deque[Span] = deque()
+        self._queue_size = queue_size
+        self._wake = threading.Event()
+        self._stopped = False
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        if len(self._queue) >= self._queue_size:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(span)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._send_all()
+
+    def _send_all(self):
+        """Send everything queued, one batch per request"""
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            body = json.dumps(otlp_payload(batch, self.resource), separators=(",", ":")).encode("utf-8")
+            request = urllib.request.Request(self.endpoint, data=body, headers=self.headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    response.read()
+                self.sent += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"Warning: could not export {len(batch)} spans to {self.endpoint}: {e}")
+
+    def shutdown(self):
+        """Send what is queued and stop the sender thread"""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._send_all()
+
+
+def otlp_payload(spans: List[Span], resource: Dict) -> Dict:
+    """
+    Wrap spans in an OTLP ``ExportTraceServiceRequest``
+
+    Args:
+        spans: Finished spans
+        resource: OTLP resource describing this service
+
+    Returns:
+        JSON-serializable request body
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return {
+        "resourceSpans": [{
+            "resource": resource,
+            "scopeSpans": [{
+                "scope": {"name": "chatbot.tracing", "version": Config.APP_VERSION},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class Tracer:
+    """
+    Creates spans, samples traces and passes finished spans to hooks and an exporter
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = 1.0, service_name: str = "openai-gpt-chatbot"):
+        """
+        Initialize the tracer
+
+        Args:
+            exporter: Receives finished sampled spans (None keeps them only for the hooks)
+            sample_rate: Fraction of new traces recorded (continued traces follow the caller)
+            service_name: ``service.name`` resource attribute
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.resource = {"attributes": [
+            _attribute("service.name", service_name),
+            _attribute("service.version", Config.APP_VERSION),
+            _attribute("process.pid", os.getpid())
+        ]}
+        self._hooks: List[Callable[[Span], None]] = []
+        self.started = 0
+        self.unsampled = 0
+
+    def add_hook(self, hook: Callable[[Span], None]):
+        """
+        Call ``hook(span)`` for every finished sampled span
+
+        Hooks run on the request path, so they should be quick.
+
+        Args:
+            hook: Callable taking the finished span
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self._hooks.append(hook)
+
+    def start_span(self, name: str, attributes: Optional[Dict] = None, parent=None,
+                   kind: int = KIND_INTERNAL, activate: bool = True):
+        """
+        Start a span
+
+        Args:
+            name: Operation name, e.g. ``chat.upstream``
+            attributes: Initial attributes
+            parent: Parent Span or SpanContext (defaults to the current span)
+            kind: KIND_INTERNAL, KIND_SERVER or KIND_CLIENT
+            activate: Whether entering the span makes it the current span
+
+        Returns:
+            Span, or NOOP_SPAN inside a trace that is not sampled
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        if parent is None:
+            parent = _current_span.get()
+        if parent is None:
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        else:
+            sampled = parent.sampled
+            if not sampled and not isinstance(parent, SpanContext):
+                return NOOP_SPAN
+        self.started += 1
+        if not sampled:
+            # Kept (unexported) only so its children know to stay unsampled
+            self.unsampled += 1
+        return Span(self, name, parent, kind, attributes, activate, sampled)
+
+    def _finish(self, span: Span):
+        """Run the hooks and export a finished span"""
+        if not span.sampled:
+            return
+        for hook in self._hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                print(f"Warning: span hook failed: {e}")
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def payload(self, spans: List[Span]) -> Dict:
+        """OTLP request body for spans of this service"""
+        return otlp_payload(spans, self.resource)
+
+    def stats(self) -> Dict:
+        """
+        Get tracer statistics
+
+        Returns:
+            Dictionary with span counts, sampling and exporter state
+        """
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        stats = {
+            "exporter": type(self.exporter).__name__ if self.exporter is not None else None,
+            "sample_rate": self.sample_rate,
+            "spans_started": self.started,
+            "spans_unsampled": self.unsampled
+        }
+        for counter in ("sent", "dropped", "failed"):
+            if hasattr(self.exporter, counter):
+                stats[f"spans_{counter}"] = getattr(self.exporter, counter)
+        return stats
+
+
+class TracedStream:
+    """
+    Response body that makes a span current while each item is produced
+
+    Spans opened while the wrapped iterator runs (chat stages, upstream
+    calls) become children of ``span``. The span ends when the body is
+    exhausted or closed, even if it was never iterated.
+
+    Author: RSK World (https://rskworld.in) - Year: 2026
+    """
+
+    def __init__(self, stream, span: Span):
+        # Author: RSK World (https://rskworld.in) - Year: 2026
+        self.stream = stream
+        self.span = span
+
+    def __iter__(self) -> "TracedStream":
+        return self
+
+    def __next__(self):
+        token = _current_span.set(self.span)
+        try:
+            return next(self.stream)
+        except BaseException as e:
+            if isinstance(e, Exception) and not isinstance(e, StopIteration):
+                self.span.record_error(e)
+            self.span.end()
+            raise
+        finally:
+            _current_span.reset(token)
+
+    def __aiter__(self) -> "TracedStream":
+        return self
+
+    async def __anext__(self):
+        token = _current_span.set(self.span)
+        try:
+            return await self.stream.__anext__()
+        except BaseException as e:
+            if isinstance(e, Exception) and not isinstance(e, StopAsyncIteration):
+                self.span.record_error(e)
+            self.span.end()
+            raise
+        finally:
+            _current_span.reset(token)
+
+    def close(self):
+        """Close the wrapped stream and end the span"""
+        try:
+            close = getattr(self.stream, "close", None)
+            if close:
+                close()
+        finally:
+            self.span.end()
+
+    async def aclose(self):
+        """Close the wrapped async stream and end the span"""
+        try:
+            aclose = getattr(self.stream, "aclose", None)
+            if aclose:
+                await aclose()
+        finally:
+            self.span.end()
+
+
+class _Activation:
+    """Makes a span current for a ``with`` block without ending it"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, *exc_info):
+        _current_span.reset(self._token)
+        return False
+
+
+def use_span(span):
+    """
+    Make a span current for a ``with`` block without ending it
+
+    Used in generators to run a stage under a span that stays open across
+    ``yield``s, without the span leaking to whoever resumes the generator.
+
+    Args:
+        span: Span (or NOOP_SPAN)
+
+    Returns:
+        Context manager yielding the span
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if not span.recording:
+        return NOOP_SPAN
+    return _Activation(span)
+
+
+def observe_stage(span: Span):
+    """
+    Span hook: record the span's duration in the per-stage histogram
+
+    Args:
+        span: Finished span
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.stage_duration.observe(span.duration, span.name)
+
+
+def _parse_headers(value: str) -> Dict:
+    """Parse ``key=value,key2=value2`` (the OTEL_EXPORTER_OTLP_HEADERS format)"""
+    headers = {}
+    for item in value.split(","):
+        key, _, header = item.partition("=")
+        if key.strip() and header.strip():
+            headers[key.strip()] = header.strip()
+    return headers
+
+
+def _create_tracer() -> Tracer:
+    """Build the tracer described by Config"""
+    tracer = Tracer(sample_rate=Config.TRACING_SAMPLE_RATE, service_name=Config.TRACING_SERVICE_NAME)
+    name = Config.TRACING_EXPORTER.lower()
+    if name == "memory":
+        tracer.exporter = MemoryExporter(Config.TRACING_BUFFER_SIZE)
+    elif name == "file":
+        tracer.exporter = FileExporter(Config.TRACING_FILE)
+    elif name == "otlp":
+        tracer.exporter = OtlpExporter(Config.TRACING_OTLP_ENDPOINT, tracer.resource,
+                                       _parse_headers(Config.TRACING_OTLP_HEADERS), Config.TRACING_BUFFER_SIZE)
+    elif name != "none":
+        raise ValueError(f"Unknown TRACING_EXPORTER: {Config.TRACING_EXPORTER}")
+    if Config.METRICS_ENABLED:
+        tracer.add_hook(observe_stage)
+    return tracer
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the process-wide tracer
+
+    Returns:
+        Shared Tracer, or None if tracing is disabled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    global _tracer
+    if not Config.TRACING_ENABLED:
+        return None
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _create_tracer()
+    return _tracer
+
+
+def span(name: str, attributes: Optional[Dict] = None, parent=None, kind: int = KIND_INTERNAL,
+         activate: bool = True):
+    """
+    Start a span with the process-wide tracer
+
+    Args:
+        name: Operation name
+        attributes: Initial attributes
+        parent: Parent Span or SpanContext (defaults to the current span)
+        kind: KIND_INTERNAL, KIND_SERVER or KIND_CLIENT
+        activate: Whether entering the span makes it the current span
+
+    Returns:
+        Span, or NOOP_SPAN when tracing is disabled or the trace is not sampled
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tracer = get_tracer()
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.start_span(name, attributes, parent, kind, activate)
+
+
+def current_span():
+    """
+    Get the span code is running in
+
+    Returns:
+        The current Span, or NOOP_SPAN outside any span
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    return _current_span.get() or NOOP_SPAN
+
+
+def start_server_span(method: str, route: Optional[str], path: str, traceparent: Optional[str] = None):
+    """
+    Start the root span of an HTTP request and make it current
+
+    Args:
+        method: HTTP method
+        route: Matched route pattern (None if no route matched)
+        path: Request path
+        traceparent: Incoming W3C ``traceparent`` header, continued if valid
+
+    Returns:
+        The entered Span (finish it with end_server_span), or NOOP_SPAN
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tracer = get_tracer()
+    if tracer is None or route in UNTRACED_ROUTES:
+        return NOOP_SPAN
+    attributes = {"http.request.method": method, "http.route": route or "", "url.path": path}
+    name = f"{method} {route}" if route else method
+    return tracer.start_span(name, attributes, parse_traceparent(traceparent), KIND_SERVER).__enter__()
+
+
+def end_server_span(request_span, error: Optional[BaseException] = None, held: bool = False):
+    """
+    Stop an HTTP request's root span being current and finish it
+
+    A ``http.response.status_code`` attribute of 500 or more marks the span failed.
+
+    Args:
+        request_span: Span from start_server_span
+        error: Unhandled exception, if the request failed
+        held: Whether a streamed body (TracedStream) ends the span instead
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    if error is not None:
+        request_span.record_error(error)
+    elif request_span.attributes.get("http.response.status_code", 0) >= 500:
+        request_span.status = STATUS_ERROR
+    request_span.detach()
+    if not held:
+        request_span.end()
+
+
+def add_span_hook(hook: Callable[[Span], None]) -> bool:
+    """
+    Call ``hook(span)`` for every finished sampled span
+
+    Args:
+        hook: Callable taking the finished span
+
+    Returns:
+        False if tracing is disabled (the hook is not installed)
+    """
+    # Author: RSK World (https://rskworld.in) - Year: 2026
+    tracer = get_tracer()
+    if tracer is None:
+        return False
+    tracer.add_hook(hook)
+    return True